@@ -0,0 +1,68 @@
+# app/chat/intent_cache.py
+"""
+파싱된 의도의 영구 캐시(SQLite).
+키는 정규화한 메시지(NFKC, 공백 정리, 끝 문장부호 제거) + 네임스페이스라
+표현만 살짝 다른 반복 질문은 모델을 다시 부르지 않는다. 프로세스 재시작 후에도 유지된다.
+네임스페이스(backend 컬럼)는 parse_intent 가 백엔드·모델 + 카탈로그 데이터 버전으로 만든다
+(intent_parser.cache_namespace) — 모델이나 데이터가 바뀌면 예전 항목은 적중하지 않는다.
+"""
+from __future__ import annotations
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_SPACES = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s.!?~…]+$")
+
+
+def normalize_message(msg: str) -> str:
+    msg = unicodedata.normalize("NFKC", msg or "")
+    msg = _SPACES.sub(" ", msg).strip().lower()
+    return _TRAILING.sub("", msg)
+
+
+class IntentCache:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 스레드 간 공유(타임아웃 뒤 늦게 도착한 응답도 백그라운드 스레드에서 저장)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS intents ("
+                " msg TEXT NOT NULL, backend TEXT NOT NULL, intent TEXT NOT NULL, created REAL NOT NULL,"
+                " PRIMARY KEY (msg, backend))"
+            )
+
+    def get(self, msg: str, namespace: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT intent FROM intents WHERE msg = ? AND backend = ?", (normalize_message(msg), namespace)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, msg: str, namespace: str, intent: Dict[str, Any]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO intents (msg, backend, intent, created) VALUES (?, ?, ?, ?)",
+                (normalize_message(msg), namespace, json.dumps(intent, ensure_ascii=False), time.time()),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM intents")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM intents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
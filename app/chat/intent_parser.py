@@ -1,43 +1,217 @@
 # app/chat/intent_parser.py
-import re
-from typing import Dict, Any
-from app.chat.intent_schema import Intent
-
-SEOUL_METRO = {"서울": "서울특별시", "서울시": "서울특별시",
-               "경기": "경기도", "경기도": "경기도",
-               "인천": "인천광역시", "인천시": "인천광역시"}
-
-def rule_parse(user_msg: str) -> Dict[str, Any]:
-    msg = user_msg.strip()
-
-    # area 추정(수도권만)
-    area = None
-    for k, v in SEOUL_METRO.items():
-        if k in msg:
-            area = v
-            break
-
-    # time_of_day
-    tod = None
-    if any(w in msg for w in ["아침","오전","브런치"]): tod = "아침"
-    elif "점심" in msg: tod = "점심"
-    elif any(w in msg for w in ["저녁","노을","해질"]): tod = "저녁"
-    elif any(w in msg for w in ["밤","야간","심야"]): tod = "야간"
-
-    # transport
-    transport = None
-    if any(w in msg for w in ["대중교통","지하철","버스"]): transport = "대중교통"
-    if any(w in msg for w in ["차로","드라이브","자가용","렌트카"]): transport = "자가용"
-
-    # cat_l (대분류 키워드 단순 매핑)
-    cat_l = None
-    if any(w in msg for w in ["전시","박물관","미술관","실내"]): cat_l = "관광지"
-    if any(w in msg for w in ["시장","카페","맛집","먹거리","음식"]): cat_l = "음식"
-    if any(w in msg for w in ["체험","액티비티","테마"]): cat_l = "체험"
-
-    # top_n (숫자 포착)
-    m = re.search(r"(\d+)\s*곳", msg)
-    top_n = int(m.group(1)) if m else 10
-
-    intent = Intent(area=area, time_of_day=tod, transport=transport, cat_l=cat_l, top_n=top_n)
-    return intent.model_dump()
+# 규칙 파싱 경로(rule_parse)는 pydantic/SQLite/설정을 import 하지 않는다 — CLI 시작 시간용.
+# Intent 스키마 검증·의도 캐시·LLM 설정은 parse_intent 가 처음 필요할 때 불러온다.
+from __future__ import annotations
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from app.chat.llm_client import LLMBackend, NullBackend, get_backend
+from app.chat.lexicon import COUNT_SUFFIX, DEFAULT_TOP_N, LEXICON, SEOUL_METRO, signgu_entries  # noqa: F401
+from app.chat.matcher import KeywordMatcher
+
+if TYPE_CHECKING:
+    from app.chat.intent_cache import IntentCache
+
+# Intent 스키마 필드 순서 (model_dump 와 같은 키 순서)
+INTENT_FIELDS = ("area", "signgu", "cat_l", "time_of_day", "transport", "top_n")
+
+# (카탈로그 stamp, 매처, 시군구 → 그 이름이 있는 시도 목록, 카탈로그 데이터 버전)
+_MATCHER: Optional[Tuple[Optional[str], KeywordMatcher, Dict[str, List[str]], Optional[str]]] = None
+_MATCHER_LOCK = threading.Lock()
+_LLM_POOL: Optional[ThreadPoolExecutor] = None
+_INTENT_CACHE: Optional[IntentCache] = None
+_STATE_LOCK = threading.Lock()
+
+
+def _catalog_stamp() -> Optional[str]:
+    """facets.json 사이드카의 (mtime, 크기) — 매 파싱마다 stat 한 번만"""
+    from app.facet_catalog import FACETS_PATH
+    try:
+        st = FACETS_PATH.stat()
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+
+def _catalog_signgus() -> Tuple[Dict[str, List[str]], Optional[str]]:
+    """(카탈로그의 시군구명 → 그 이름이 있는 시도 목록, 데이터 버전). '중구'처럼 여러 시도에 있으면 둘 이상"""
+    from app.facet_catalog import FACETS_PATH, FacetCatalog
+    try:
+        catalog = FacetCatalog.load(FACETS_PATH)
+        out: Dict[str, List[str]] = {}
+        for area in catalog.areas():
+            for name in catalog.signgus(area):
+                out.setdefault(name, []).append(area)
+        return out, catalog.version
+    except (OSError, ValueError, KeyError):
+        return {}, None
+
+
+def build_matcher(signgus: List[str] = ()) -> KeywordMatcher:
+    """LEXICON(+시군구)을 Aho-Corasick 오토마톤 하나로 컴파일. 슬롯 안에서는 앞선 항목이 우선"""
+    lexicon = dict(LEXICON, signgu=signgu_entries(list(signgus)))
+    entries = []
+    for slot, groups in lexicon.items():
+        for priority, (value, keywords) in enumerate(groups):
+            if slot == "signgu":
+                priority = 0            # 시군구는 문장에서 먼저 나온 것
+            entries.extend((kw, slot, value, priority) for kw in keywords)
+    return KeywordMatcher(entries, count_suffix=COUNT_SUFFIX)
+
+
+def _matcher_state() -> Tuple[KeywordMatcher, Dict[str, List[str]], Optional[str]]:
+    """
+    프로세스 공용 (매처, 시군구 시도 목록, 카탈로그 데이터 버전).
+    facet 카탈로그 사이드카가 바뀔 때만 다시 컴파일(없으면 시군구 없이)
+    """
+    global _MATCHER
+    stamp = _catalog_stamp()
+    cached = _MATCHER
+    if cached is None or cached[0] != stamp:
+        with _MATCHER_LOCK:
+            if _MATCHER is None or _MATCHER[0] != stamp:
+                signgu_areas, version = _catalog_signgus() if stamp else ({}, None)
+                _MATCHER = (stamp, build_matcher(list(signgu_areas)), signgu_areas, version)
+            cached = _MATCHER
+    return cached[1], cached[2], cached[3]
+
+
+def get_matcher() -> KeywordMatcher:
+    return _matcher_state()[0]
+
+
+def cache_namespace(backend: LLMBackend) -> str:
+    """
+    의도 캐시 네임스페이스 = 백엔드·모델 + 카탈로그 데이터 버전.
+    모델을 바꾸거나 카탈로그(시군구 사전)가 새 데이터로 바뀌면 예전 파싱 결과를 쓰지 않는다.
+    """
+    name = backend.name
+    model = getattr(backend, "model", None)
+    if model and model not in name:
+        name = f"{name}:{model}"
+    return f"{name}@{_matcher_state()[2] or '-'}"
+
+
+def scope_signgu(intent: Dict[str, Any], signgu_areas: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    시군구를 시도와 맞춘다. 한 시도에만 있는 이름이면 시도를 채우고,
+    '중구'처럼 여러 시도에 있는 이름은 시도가 그중 하나일 때만 남긴다 — 시도가 없으면
+    시군구를 비워 둔다(후속 질문이 시도를 묻는다). 시도가 다른 곳이면 버린다.
+    """
+    areas = signgu_areas.get(intent.get("signgu") or "")
+    if not areas:
+        return intent
+    if intent.get("area") is None and len(areas) == 1:
+        intent["area"] = areas[0]
+    elif intent.get("area") not in areas:
+        intent["signgu"] = None
+    return intent
+
+
+def _to_intent(slots: Dict[str, str], count: Optional[int]) -> Dict[str, Any]:
+    """매처 슬롯 값은 LEXICON 에서만 나오므로 Intent 스키마 검증 없이 같은 모양의 dict 로"""
+    intent = {k: slots.get(k) for k in INTENT_FIELDS[:-1]}
+    intent["top_n"] = count if count is not None else DEFAULT_TOP_N
+    return intent
+
+
+def rule_parse(user_msg: str, matcher: Optional[KeywordMatcher] = None,
+               signgu_areas: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """
+    키워드 규칙으로 의도 추출. 모든 슬롯(area/signgu/time_of_day/transport/cat_l)과
+    'N곳' 개수를 컴파일된 매처로 문장을 한 번 훑어 얻는다.
+    matcher 를 주지 않으면 공용 매처와 카탈로그의 시군구 시도 목록으로 시군구를 시도에 맞춘다(scope_signgu).
+    """
+    if matcher is None:
+        matcher, signgu_areas, _ = _matcher_state()
+    intent = _to_intent(*matcher.scan(user_msg.strip()))
+    return scope_signgu(intent, signgu_areas) if signgu_areas else intent
+
+
+def parse_many(user_msgs: List[str]) -> List[Dict[str, Any]]:
+    """여러 문장을 같은 매처로 일괄 파싱(로그 재생/캐시 워밍업용)"""
+    matcher, signgu_areas, _ = _matcher_state()
+    return [rule_parse(m, matcher, signgu_areas) for m in user_msgs]
+
+
+def _llm_pool() -> ThreadPoolExecutor:
+    global _LLM_POOL
+    with _STATE_LOCK:
+        if _LLM_POOL is None:
+            _LLM_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-intent")
+        return _LLM_POOL
+
+
+def get_intent_cache() -> IntentCache:
+    """설정(INTENT_CACHE_PATH)의 SQLite 의도 캐시 — 프로세스 공용"""
+    global _INTENT_CACHE
+    with _STATE_LOCK:
+        if _INTENT_CACHE is None:
+            from app.chat.intent_cache import IntentCache
+            from app.config import get_settings
+            _INTENT_CACHE = IntentCache(get_settings().INTENT_CACHE_PATH)
+        return _INTENT_CACHE
+
+
+def _valid_slots(raw: Any) -> Dict[str, Any]:
+    """LLM 출력에서 Intent 스키마를 통과하는 슬롯만 (틀린 슬롯 하나 때문에 전체를 버리지 않음)"""
+    from pydantic import ValidationError
+    from app.chat.intent_schema import Intent
+
+    if not isinstance(raw, dict):
+        return {}
+    out = {}
+    for key in Intent.model_fields:
+        value = raw.get(key)
+        if value is None or value == "":
+            continue
+        try:
+            out[key] = getattr(Intent.model_validate({key: value}), key)
+        except ValidationError:
+            continue
+    return out
+
+
+def merge_intent(llm: Dict[str, Any], rule: Dict[str, Any]) -> Dict[str, Any]:
+    """LLM 슬롯 우선, LLM이 비운 슬롯은 규칙 파싱 결과로 보완 후 Intent 로 검증"""
+    from app.chat.intent_schema import Intent
+
+    merged = dict(rule)
+    merged.update(_valid_slots(llm))
+    return Intent(**merged).model_dump()
+
+
+def parse_intent(
+    user_msg: str,
+    backend: Optional[LLMBackend] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[IntentCache] = None,
+) -> Dict[str, Any]:
+    """
+    LLM → 부족분 rule 보완. 정규화 메시지 캐시(cache_namespace 별)에 있으면 모델을 부르지 않는다.
+    LLM 호출은 timeout(기본 LLM_TIMEOUT 초) 안에 끝나지 않거나 실패하면 규칙 결과로 답한다.
+    늦게 도착한 응답도 캐시에는 저장되므로 같은 질문은 다음부터 LLM 결과로 바로 나간다.
+    """
+    backend = backend or get_backend()
+    rule = rule_parse(user_msg)
+    if isinstance(backend, NullBackend):
+        return rule
+    cache = cache if cache is not None else get_intent_cache()
+    namespace = cache_namespace(backend)
+    hit = cache.get(user_msg, namespace)
+    if hit is not None:
+        return hit
+
+    def store(fut):
+        if not fut.cancelled() and fut.exception() is None:
+            cache.put(user_msg, namespace, merge_intent(fut.result(), rule))
+
+    fut = _llm_pool().submit(backend.parse, user_msg)
+    fut.add_done_callback(store)
+    if timeout is None:
+        from app.config import get_settings
+        timeout = get_settings().LLM_TIMEOUT
+    try:
+        return merge_intent(fut.result(timeout=timeout), rule)
+    except Exception:
+        return rule
@@ -0,0 +1,57 @@
+# app/chat/lexicon.py
+"""
+rule_parse 가 쓰는 선언적 어휘 사전.
+슬롯마다 (값, 키워드들) 목록이며 **앞에 있는 항목이 우선**한다.
+(기존 if/elif·덮어쓰기 규칙을 그대로 옮긴 순서이므로 바꿀 때 주의)
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple
+
+Lexicon = Dict[str, List[Tuple[str, List[str]]]]
+
+# area: 수도권만, 기존 SEOUL_METRO 딕셔너리 순서(먼저 나온 키가 이김)
+SEOUL_METRO = {"서울": "서울특별시", "서울시": "서울특별시",
+               "경기": "경기도", "경기도": "경기도",
+               "인천": "인천광역시", "인천시": "인천광역시"}
+
+LEXICON: Lexicon = {
+    "area": [
+        ("서울특별시", ["서울", "서울시"]),
+        ("경기도", ["경기", "경기도"]),
+        ("인천광역시", ["인천", "인천시"]),
+    ],
+    # if/elif 순서: 아침 > 점심 > 저녁 > 야간
+    "time_of_day": [
+        ("아침", ["아침", "오전", "브런치"]),
+        ("점심", ["점심"]),
+        ("저녁", ["저녁", "노을", "해질"]),
+        ("야간", ["밤", "야간", "심야"]),
+    ],
+    # 나중 규칙이 덮어씀: 자가용 > 대중교통
+    "transport": [
+        ("자가용", ["차로", "드라이브", "자가용", "렌트카"]),
+        ("대중교통", ["대중교통", "지하철", "버스"]),
+    ],
+    # 나중 규칙이 덮어씀: 체험 > 음식 > 관광지
+    "cat_l": [
+        ("체험", ["체험", "액티비티", "테마"]),
+        ("음식", ["시장", "카페", "맛집", "먹거리", "음식"]),
+        ("관광지", ["전시", "박물관", "미술관", "실내"]),
+    ],
+}
+
+# "3곳" 처럼 개수를 나타내는 접미사
+COUNT_SUFFIX = "곳"
+DEFAULT_TOP_N = 10
+
+
+def signgu_entries(names: List[str]) -> List[Tuple[str, List[str]]]:
+    """facet 카탈로그의 시군구명 → (값, 키워드). '강남구'는 '강남'으로도 찾는다(두 글자 이상일 때만)."""
+    out = []
+    for name in names:
+        keys = [name]
+        stem = name[:-1] if name[-1:] in ("시", "군", "구") else ""
+        if len(stem) >= 2:
+            keys.append(stem)
+        out.append((name, keys))
+    return out
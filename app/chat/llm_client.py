@@ -1,10 +1,129 @@
 # app/chat/llm_client.py
-# Day2에 실제 LLM SDK(openai 등) 붙임. 지금은 인터페이스만 정의.
-from typing import Dict, Any
+"""
+의도 파싱용 LLM 백엔드.
+백엔드는 parse(user_msg) -> 슬롯 dict(일부만 채워도 됨) 하나만 구현하면 된다.
+- NullBackend: 항상 {} (LLM 미사용, 규칙 파서만)
+- FakeBackend: 오프라인 테스트용. 지연(latency)·실패를 흉내 내고 호출 수를 센다.
+- OpenAICompatBackend: OpenAI 호환 /chat/completions 를 requests 로 호출(JSON 모드)
+LLM_BACKEND 환경변수(none|fake|openai)로 고르고, set_backend()로 바꿔 끼울 수 있다.
+"""
+from __future__ import annotations
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Protocol
 
-def llm_parse_intent(user_msg: str) -> Dict[str, Any]:
+SYSTEM_PROMPT = (
+    "사용자의 수도권 여행 요청에서 의도를 JSON으로만 답하세요. 키: "
+    "area(서울특별시|경기도|인천광역시), signgu, cat_l(관광지|음식|숙박|체험|쇼핑), "
+    "time_of_day(아침|점심|저녁|야간), transport(대중교통|자가용), top_n(정수). 모르면 null."
+)
+
+
+class LLMBackend(Protocol):
+    name: str
+
+    def parse(self, user_msg: str) -> Dict[str, Any]:
+        ...
+
+
+class NullBackend:
+    name = "none"
+
+    def parse(self, user_msg: str) -> Dict[str, Any]:
+        return {}  # 빈 의도 → 후속 룰파서에서 처리
+
+
+class FakeBackend:
     """
-    LLM 호출로 의도 JSON을 파싱하는 자리.
-    Day1은 아직 미사용(더미 반환). Day2에서 실제 호출로 교체.
+    responses: {메시지: 슬롯 dict} 또는 메시지를 받아 dict를 돌려주는 함수. 없으면 {}.
+    latency 초만큼 잠든 뒤 응답하고, fail=True면 RuntimeError.
     """
-    return {}  # 빈 의도 → 후속 룰파서에서 처리
+
+    def __init__(
+        self,
+        responses: Dict[str, Dict[str, Any]] | Callable[[str], Dict[str, Any]] | None = None,
+        latency: float = 0.0,
+        fail: bool = False,
+        name: str = "fake",
+    ):
+        self.responses = responses or {}
+        self.latency = latency
+        self.fail = fail
+        self.name = name
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def parse(self, user_msg: str) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("fake backend failure")
+        if callable(self.responses):
+            return self.responses(user_msg)
+        return dict(self.responses.get(user_msg, {}))
+
+
+class OpenAICompatBackend:
+    """OpenAI 호환 Chat Completions 엔드포인트(response_format=json_object)"""
+
+    def __init__(self, api_key: str, model: str, base_url: str, timeout: float = 10.0):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.name = f"openai:{model}"
+
+    def parse(self, user_msg: str) -> Dict[str, Any]:
+        from app import http_client
+
+        r = http_client.get_session().post(
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": self.model,
+                "temperature": 0,
+                "response_format": {"type": "json_object"},
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_msg},
+                ],
+            },
+            timeout=self.timeout,
+        )
+        r.raise_for_status()
+        content = r.json()["choices"][0]["message"]["content"]
+        data = json.loads(content)
+        return data if isinstance(data, dict) else {}
+
+
+_BACKEND: Optional[LLMBackend] = None
+
+
+def get_backend() -> LLMBackend:
+    """설정(LLM_BACKEND)에 맞는 프로세스 공용 백엔드. 키가 없으면 NullBackend"""
+    global _BACKEND
+    if _BACKEND is None:
+        from app.config import get_settings  # pydantic/.env 로드는 백엔드가 처음 필요할 때만
+        s = get_settings()
+        kind = s.LLM_BACKEND.lower()
+        if kind == "openai" and s.LLM_API_KEY:
+            _BACKEND = OpenAICompatBackend(s.LLM_API_KEY, s.LLM_MODEL, s.LLM_BASE_URL)
+        elif kind == "fake":
+            _BACKEND = FakeBackend()
+        else:
+            _BACKEND = NullBackend()
+    return _BACKEND
+
+
+def set_backend(backend: Optional[LLMBackend]):
+    """백엔드 교체(None이면 다음 get_backend()에서 설정대로 다시 만든다)"""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def llm_parse_intent(user_msg: str) -> Dict[str, Any]:
+    """현재 백엔드로 의도 슬롯 파싱(시간 제한/캐시 없음 — parse_intent 를 쓸 것)"""
+    return get_backend().parse(user_msg)
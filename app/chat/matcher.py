@@ -0,0 +1,89 @@
+# app/chat/matcher.py
+"""
+여러 키워드를 한 번에 찾는 Aho-Corasick 오토마톤.
+문장을 한 글자씩 한 번만 훑으며 겹치는 매치까지 모두 찾으므로
+("서울시장" → 서울/서울시/시장), 어휘가 늘어나도 스캔 비용은 문장 길이에만 비례한다.
+같은 루프에서 "N곳" 형태의 개수도 함께 잡는다.
+"""
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (slot, value, priority, keyword 길이)
+Output = Tuple[str, str, int, int]
+
+
+class KeywordMatcher:
+    def __init__(self, entries: Iterable[Tuple[str, str, str, int]], count_suffix: Optional[str] = None):
+        """entries: (keyword, slot, value, priority) — priority 가 작을수록 우선"""
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Output]] = [[]]
+        self.count_suffix = count_suffix
+        for keyword, slot, value, priority in entries:
+            if keyword:
+                self._insert(keyword, (slot, value, priority, len(keyword)))
+        self._link()
+
+    def _insert(self, keyword: str, output: Output):
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(output)
+
+    def _link(self):
+        """BFS로 실패 링크를 잇고, 실패 경로의 출력을 합쳐 둔다(스캔 중 따라갈 필요 없게)."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                if state:
+                    f = self.fail[state]
+                    while f and ch not in self.goto[f]:
+                        f = self.fail[f]
+                    self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, text: str) -> Tuple[Dict[str, str], Optional[int]]:
+        """
+        한 번의 순회로 슬롯별 값과 개수를 뽑는다.
+        슬롯 충돌은 (priority, 시작 위치, 긴 키워드 우선) 으로 가린다.
+        개수는 첫 번째 '숫자 [공백] 접미사' (정규식 (\\d+)\\s*곳 과 같음).
+        """
+        best: Dict[str, Tuple[tuple, str]] = {}
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        count: Optional[int] = None
+        digits = ""          # 진행 중인 숫자열
+        waiting = ""         # 숫자열 뒤 공백을 지나 접미사를 기다리는 숫자
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for slot, value, priority, length in out[state]:
+                rank = (priority, i - length + 1, -length)
+                cur = best.get(slot)
+                if cur is None or rank < cur[0]:
+                    best[slot] = (rank, value)
+
+            if count is None and self.count_suffix:
+                if ch.isdecimal():
+                    digits += ch
+                    waiting = ""
+                    continue
+                if digits:
+                    waiting, digits = digits, ""
+                if waiting:
+                    if ch == self.count_suffix:
+                        count = int(waiting)
+                    elif not ch.isspace():
+                        waiting = ""
+        return {slot: value for slot, (_, value) in best.items()}, count
@@ -1,27 +1,53 @@
 # app/chat/nlg.py
+"""
+추천 결과 → 채팅 응답 문장.
+summary_lines 는 결과 컬럼 배열을 한 번에 이어 붙여(행 단위 iterrows 없이) 항목 문장을 만들고,
+stream_summary 는 머리말부터 한 줄씩 내보내는 제너레이터라 UI(st.write_stream)가
+나머지 턴(표, 후속 질문 등)을 계산하는 동안 먼저 그릴 수 있다. 항목 문장은 STREAM_CHUNK 행씩
+필요할 때 만든다(전체 목록을 먼저 만들지 않음).
+"".join(stream_summary(...)) == summarize_recos(...)
+"""
 from __future__ import annotations
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-def _fmt_row(row: pd.Series) -> str:
-    area = row.get("areaNm") or ""
-    sig  = row.get("signguNm") or ""
-    cat  = row.get("rlteCtgryLclsNm") or ""
-    name = row.get("rlteTatsNm") or row.get("tAtsNm") or ""
-    return f"**{name}** ({area} {sig}) · {cat}"
+# stream_summary 가 한 번에 문장으로 만드는 행 수
+STREAM_CHUNK = 8
 
-def summarize_recos(intent: Dict, res: pd.DataFrame) -> str:
+def _col(res: pd.DataFrame, name: str) -> pd.Series:
+    """row.get(name) or "" 를 컬럼 단위로 — 빈 값·결측(None/NaN)은 빈 문자열, 나머지는 str()"""
+    if name not in res.columns:
+        return pd.Series([""] * len(res), index=res.index, dtype=object)
+    s = res[name].astype(object)
+    return s.where(s.notna() & s.astype(bool), "").astype(str)
+
+def summary_lines(res: pd.DataFrame, topn: int | None = None) -> List[str]:
+    """상위 topn 행의 '**이름** (시도 시군구) · 대분류' 문장 — 행 단위 iterrows 없이 컬럼을 한 번에 이어 붙인다"""
+    head = res.head(topn) if topn else res
+    if head.empty:
+        return []
+    name = _col(head, "rlteTatsNm")
+    name = name.where(name != "", _col(head, "tAtsNm"))
+    lines = "**" + name + "** (" + _col(head, "areaNm") + " " + _col(head, "signguNm") + ") · " + _col(head, "rlteCtgryLclsNm")
+    return lines.tolist()
+
+def stream_summary(intent: Dict, res: pd.DataFrame) -> Iterator[str]:
+    """머리말 → 항목 한 줄씩 내보내는 제너레이터"""
     area = intent.get("area") or "전체"
     cat  = intent.get("cat_l") or "전체"
     topn = intent.get("top_n") or len(res)
-
     if res.empty:
-        return f"지금 조건(지역: {area}, 대분류: {cat})으로는 추천이 없어요. 범위를 조금 넓혀볼까요?"
+        yield f"지금 조건(지역: {area}, 대분류: {cat})으로는 추천이 없어요. 범위를 조금 넓혀볼까요?"
+        return
+    # 머리말은 항목 문장을 만들기 전에 먼저 내보낸다
+    yield f"다음 추천을 골라봤어요 (지역: **{area}**, 분류: **{cat}**, {topn}곳):"
+    n = min(topn, len(res))
+    for start in range(0, n, STREAM_CHUNK):
+        for line in summary_lines(res.iloc[start:min(start + STREAM_CHUNK, n)]):
+            yield f"\n- {line}"
 
-    lines = [f"다음 추천을 골라봤어요 (지역: **{area}**, 분류: **{cat}**, {topn}곳):"]
-    for _, row in res.head(topn).iterrows():
-        lines.append(f"- {_fmt_row(row)}")
-    return "\n".join(lines)
+def summarize_recos(intent: Dict, res: pd.DataFrame) -> str:
+    return "".join(stream_summary(intent, res))
 
 def followups(intent: Dict, had_results: bool) -> List[str]:
     area = intent.get("area")
@@ -38,3 +64,8 @@ def followups(intent: Dict, had_results: bool) -> List[str]:
         base.append("지역을 넓히거나(예: ‘경기도’) 테마를 바꿔볼까요?")
         base.append("장소 개수(예: ‘5곳’)나 시간대도 알려주시면 더 정확해져요.")
     return base
+
+def stream_followups(intent: Dict, had_results: bool) -> Iterator[str]:
+    """후속 질문을 마크다운 목록 항목으로 하나씩"""
+    for q in followups(intent, had_results):
+        yield f"- {q}\n"
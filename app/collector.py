@@ -2,49 +2,47 @@
 import argparse, json, os, sys, pathlib, datetime, time
 from typing import Dict, Any, List, Tuple
 import requests
+from app import http_client
 from app.config import get_settings
 
 OP = "areaBasedList1"
 
 def try_request(url: str, params: Dict[str, Any], key: str, svc: str) -> requests.Response:
-    """key는 'serviceKey' 또는 'ServiceKey'"""
-    p = dict(params)
-    if "%" in svc:
-        full = f"{url}?{key}={svc}"
-        return requests.get(full, params=p, timeout=25, allow_redirects=True)
-    else:
-        p[key] = svc
-        return requests.get(url, params=p, timeout=25, allow_redirects=True)
+    """key는 'serviceKey' 또는 'ServiceKey' (공용 Session으로 연결 재사용)"""
+    return http_client.get(url, params, key, svc, timeout=25, allow_redirects=True)
 
 def call_api(st, params: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
-    """HTTPS 우선 → HTTP 폴백, 키 대/소문자 모두 시도. 성공 시 (data, 사용URL) 반환."""
+    """
+    HTTPS 우선 → HTTP 폴백, 키 대/소문자 모두 시도. 성공 시 (data, 사용URL) 반환.
+    한 번 성공한 (호스트, 키) 조합은 기억해 두고 다음 호출부터 먼저 시도한다.
+    """
     hosts = [st.BASE_URL, st.FALLBACK_URL]
-    keys = ["serviceKey", "ServiceKey"]
+    keys = list(http_client.KEY_NAMES)
 
-    for base in hosts:
+    for base, key in http_client.attempt_order(hosts, keys):
         url = f"{base}/{OP}"
-        for key in keys:
-            try:
-                r = try_request(url, params, key, st.SERVICE_KEY)
-                ctype = (r.headers.get("content-type") or "").lower()
-                if "json" not in ctype:
-                    # 에러 본문 저장 도움용
-                    pathlib.Path("data/raw").mkdir(parents=True, exist_ok=True)
-                    open("data/raw/last_non_json.txt", "w", encoding="utf-8").write(r.text)
-                    continue
-                data = r.json()
-                code = (((data.get("response") or {}).get("header")) or {}).get("resultCode")
-                if code == "0000":
-                    return data, f"{url} [{key}]"
-                else:
-                    # 마지막 JSON 응답 보관
-                    open("data/raw/last_json.json", "w", encoding="utf-8").write(
-                        json.dumps(data, ensure_ascii=False, indent=2)
-                    )
-            except Exception as e:
-                # 재시도 간단 딜레이
-                time.sleep(0.5)
+        try:
+            r = try_request(url, params, key, st.SERVICE_KEY)
+            ctype = (r.headers.get("content-type") or "").lower()
+            if "json" not in ctype:
+                # 에러 본문 저장 도움용
+                pathlib.Path("data/raw").mkdir(parents=True, exist_ok=True)
+                open("data/raw/last_non_json.txt", "w", encoding="utf-8").write(r.text)
                 continue
+            data = r.json()
+            code = (((data.get("response") or {}).get("header")) or {}).get("resultCode")
+            if code == "0000":
+                http_client.remember_winner(hosts, keys, base, key)
+                return data, f"{url} [{key}]"
+            else:
+                # 마지막 JSON 응답 보관
+                open("data/raw/last_json.json", "w", encoding="utf-8").write(
+                    json.dumps(data, ensure_ascii=False, indent=2)
+                )
+        except Exception as e:
+            # 재시도 간단 딜레이
+            time.sleep(0.5)
+            continue
     raise SystemExit("모든 시도 실패: 유효한 JSON(resultCode=0000)을 받지 못했습니다.")
 
 def extract_items(data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -1,18 +1,37 @@
 # app/config.py
-from pydantic import BaseModel
-from dotenv import load_dotenv
 import os
+from pydantic import BaseModel, Field
+
+_ENV_LOADED = False
+
+
+def _env(name: str, default: str):
+    """인스턴스를 만들 때 환경변수를 읽는 필드(.env 로드는 get_settings()에서 한 번)"""
+    return Field(default_factory=lambda: os.getenv(name, default), validate_default=True)
 
-# .env 파일 로드
-load_dotenv()
 
 class Settings(BaseModel):
-    SERVICE_KEY: str = os.getenv("SERVICE_KEY", "")
-    MOBILE_OS: str = os.getenv("MOBILE_OS", "ETC")
-    MOBILE_APP: str = os.getenv("MOBILE_APP", "SmartTravelPlanner")
-    BASE_URL: str = os.getenv("BASE_URL", "https://apis.data.go.kr/B551011/TarRlteTarService1")
+    SERVICE_KEY: str = _env("SERVICE_KEY", "")
+    MOBILE_OS: str = _env("MOBILE_OS", "ETC")
+    MOBILE_APP: str = _env("MOBILE_APP", "SmartTravelPlanner")
+    BASE_URL: str = _env("BASE_URL", "https://apis.data.go.kr/B551011/TarRlteTarService1")
     # HTTPS 실패 시 사용할 폴백(HTTP)
-    FALLBACK_URL: str = os.getenv("FALLBACK_URL", "http://apis.data.go.kr/B551011/TarRlteTarService1")
+    FALLBACK_URL: str = _env("FALLBACK_URL", "http://apis.data.go.kr/B551011/TarRlteTarService1")
+    # 의도 파싱 LLM (none|fake|openai) — 키가 없으면 규칙 파서만 사용
+    LLM_BACKEND: str = _env("LLM_BACKEND", "openai")
+    LLM_API_KEY: str = _env("LLM_API_KEY", "")
+    LLM_MODEL: str = _env("LLM_MODEL", "gpt-4o-mini")
+    LLM_BASE_URL: str = _env("LLM_BASE_URL", "https://api.openai.com/v1")
+    # LLM 응답 대기 상한(초). 넘으면 규칙 파싱 결과로 바로 답한다
+    LLM_TIMEOUT: float = _env("LLM_TIMEOUT", "1.5")
+    INTENT_CACHE_PATH: str = _env("INTENT_CACHE_PATH", "data/cache/intent_cache.sqlite")
+
 
 def get_settings() -> Settings:
+    # .env 파일 로드 — import 시점이 아니라 설정이 처음 필요할 때 한 번 (규칙 파싱 등 CLI 빠른 경로는 건너뜀)
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _ENV_LOADED = True
     return Settings()
@@ -0,0 +1,32 @@
+# app/datafiles.py
+"""
+final_pois 경로/버전 헬퍼 (pandas 없이 import 되는 가벼운 모듈 — CLI 빠른 경로에서도 쓴다).
+app.recommender 가 그대로 다시 내보낸다.
+"""
+from __future__ import annotations
+from pathlib import Path
+
+DATA_PATH = Path("data/processed/final_pois.parquet")
+# scripts/build_pois.py 스트리밍 파이프라인 출력(areaNm 파티션 Parquet 디렉터리)
+DATASET_DIR = Path("data/processed/final_pois")
+
+
+def resolve_data_path(path: str | Path = DATA_PATH) -> Path:
+    """기본 경로에 단일 파일이 없으면 build_pois 파티션 디렉터리로"""
+    path = Path(path)
+    if not path.exists() and path == DATA_PATH and DATASET_DIR.exists():
+        return DATASET_DIR
+    return path
+
+
+def data_version(path: str | Path = DATA_PATH) -> str:
+    """
+    데이터 스냅샷 버전 = 파일(디렉터리면 하위 parquet 전체)의 최종 수정시각(ns)-크기.
+    nightly 갱신으로 파일이 바뀌면 버전이 달라진다.
+    """
+    path = resolve_data_path(path)
+    files = sorted(path.rglob("*.parquet")) if path.is_dir() else [path]
+    stats = [f.stat() for f in files]
+    if not stats:
+        raise FileNotFoundError(f"정제 데이터가 없습니다: {path}")
+    return f"{max(st.st_mtime_ns for st in stats)}-{sum(st.st_size for st in stats)}-{len(stats)}"
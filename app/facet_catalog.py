@@ -0,0 +1,132 @@
+# app/facet_catalog.py
+"""
+필터 UI용 facet 카탈로그.
+area → signgu → 대분류(L) → 중분류(M) → 소분류(S) 계층 트리와 노드별 건수를
+refine 단계(또는 첫 로드)에 한 번 만들어 작은 사이드카(data/processed/facets.json)로 저장한다.
+드릴다운 질의(특정 area의 signgu 목록 등)는 미리 펼쳐 둔 dict 조회라 O(1).
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+FACETS_PATH = Path("data/processed/facets.json")
+
+LEVEL_COLS = ["areaNm", "signguNm", "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm"]
+# facets() 반환 dict 키 (web/app.py, tests 기대 형태)
+FACET_KEYS = ["areas", "signgus", "lcats", "mcats", "scats"]
+
+
+class FacetCatalog:
+    """
+    tree 형식:
+    {area: {"count": n, "signgu": {sg: {"count": n, "cats": {L: {"count": n, "m": {M: {"count": n, "s": {S: n}}}}}}}}}
+    값이 비었거나 결측인 노드는 ""로 모이고 건수에는 포함되지만 선택지 목록에서는 빠진다.
+    """
+
+    def __init__(self, tree: Dict[str, Any], version: Optional[str] = None):
+        self.tree = tree
+        self.version = version
+        self._views: Dict[tuple, Dict[str, Any]] = {}
+        self._expand()
+
+    # ---------- 생성/저장 ----------
+    @staticmethod
+    def _counts(df):
+        """(area, signgu, L, M, S) 조합별 건수 Series (처음 나온 순서)"""
+        import numpy as np
+        import pandas as pd
+
+        def norm(s):
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                # 카테고리 값만 정규화 후 코드로 펼침(행 단위 문자열 연산 없음, 결측 코드 -1 → "")
+                cats = np.array([str(v).strip() for v in s.cat.categories] + [""], dtype=object)
+                return cats[s.cat.codes.to_numpy()]
+            return s.astype(object).where(s.notna(), "").astype(str).str.strip().to_numpy()
+
+        cols = {c: (norm(df[c]) if c in df.columns else np.full(len(df), "", dtype=object)) for c in LEVEL_COLS}
+        return pd.DataFrame(cols).groupby(LEVEL_COLS, sort=False).size()
+
+    @classmethod
+    def build(cls, df, version: Optional[str] = None) -> "FacetCatalog":
+        """정제 DataFrame에서 (area, signgu, L, M, S) 조합별 건수를 groupby 한 번으로 집계"""
+        return cls.from_counts(cls._counts(df).items(), version)
+
+    @classmethod
+    def build_chunks(cls, chunks: Iterable, version: Optional[str] = None) -> "FacetCatalog":
+        """청크(DataFrame)별 조합 건수를 더해 가며 집계 — 메모리는 청크 하나 + 조합 수"""
+        acc: Dict[tuple, int] = {}
+        for df in chunks:
+            for key, n in cls._counts(df).items():
+                acc[key] = acc.get(key, 0) + int(n)
+        return cls.from_counts(acc.items(), version)
+
+    @classmethod
+    def from_counts(cls, counts: Iterable, version: Optional[str] = None) -> "FacetCatalog":
+        """((area, signgu, L, M, S), 건수) 쌍들로 트리를 만든다"""
+        tree: Dict[str, Any] = {}
+        for (a, sg, l, m, s), n in counts:
+            n = int(n)
+            an = tree.setdefault(a, {"count": 0, "signgu": {}})
+            an["count"] += n
+            sn = an["signgu"].setdefault(sg, {"count": 0, "cats": {}})
+            sn["count"] += n
+            ln = sn["cats"].setdefault(l, {"count": 0, "m": {}})
+            ln["count"] += n
+            mn = ln["m"].setdefault(m, {"count": 0, "s": {}})
+            mn["count"] += n
+            mn["s"][s] = mn["s"].get(s, 0) + n
+        return cls(tree, version)
+
+    def save(self, path: str | Path = FACETS_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": self.version, "tree": self.tree}, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path = FACETS_PATH) -> "FacetCatalog":
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(raw["tree"], raw.get("version"))
+
+    # ---------- 질의 ----------
+    def _expand(self):
+        """(area|"", signgu|"") 모든 조합에 대한 선택지/건수를 미리 펼쳐 둔다."""
+        acc: Dict[tuple, Dict[str, Any]] = {}
+
+        def add(key, sg, l, m, s, n):
+            v = acc.setdefault(key, {"signgus": set(), "lcats": set(), "mcats": set(), "scats": set(), "count": 0})
+            v["count"] += n
+            for k, val in (("signgus", sg), ("lcats", l), ("mcats", m), ("scats", s)):
+                if val:
+                    v[k].add(val)
+
+        for a, an in self.tree.items():
+            for sg, sn in an["signgu"].items():
+                for l, ln in sn["cats"].items():
+                    for m, mn in ln["m"].items():
+                        for s, n in mn["s"].items():
+                            for key in {("", ""), (a, ""), ("", sg), (a, sg)}:
+                                add(key, sg, l, m, s, n)
+
+        areas = sorted(a for a in self.tree if a)
+        self._views = {
+            key: {"areas": areas, **{k: sorted(v[k]) for k in FACET_KEYS[1:]}, "count": v["count"]}
+            for key, v in acc.items()
+        }
+        self._empty = {"areas": areas, **{k: [] for k in FACET_KEYS[1:]}, "count": 0}
+
+    def query(self, area: Optional[str] = None, signgu: Optional[str] = None) -> Dict[str, Any]:
+        """area/signgu로 좁힌 선택지 {"areas","signgus","lcats","mcats","scats","count"} (area 목록은 항상 전체)"""
+        return dict(self._views.get((area or "", signgu or ""), self._empty))
+
+    def areas(self) -> List[str]:
+        return self.query()["areas"]
+
+    def signgus(self, area: Optional[str] = None) -> List[str]:
+        return self.query(area)["signgus"]
+
+    def count(self, area: Optional[str] = None, signgu: Optional[str] = None) -> int:
+        return self.query(area, signgu)["count"]
@@ -0,0 +1,290 @@
+# app/graph.py
+"""
+연관 관광지 그래프.
+TarRlteTarService1 한 행은 사실 간선(출발지 tAtsCd/tAtsNm → 연관지 rlteTatsCd/rlteTatsNm, 순위 rlteRank)이다.
+refine 단계에서 (평면 테이블이 코드 컬럼을 버리고 중복을 합치기 전에) 간선을 모아
+CSR 인접 배열(indptr/indices/weights, 가중치 = 1/rank)로 압축해 data/processed/graph.npz 에 저장한다.
+
+- similar(seed): "이곳과 비슷한 곳" — 직접 연결된 연관지(순위순), 부족하면 2-hop 으로 채움
+- ppr(seeds):   한 곳 또는 여러 곳에서 출발하는 개인화 PageRank (멀티홉 추천)
+질의는 간선 배열에 대한 np.bincount 반복이라 전국 데이터에서도 대화 턴마다 돌릴 수 있다.
+"""
+from __future__ import annotations
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+GRAPH_PATH = Path("data/processed/graph.npz")
+
+# 노드 메타데이터: 출발지 쪽은 areaNm/signguNm, 연관지 쪽은 rlteRegnNm/rlteSignguNm + 분류
+META_COLS = ["areaNm", "signguNm", "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm"]
+SRC_COLS = {"code": "tAtsCd", "name": "tAtsNm", "areaNm": "areaNm", "signguNm": "signguNm"}
+DST_COLS = {
+    "code": "rlteTatsCd", "name": "rlteTatsNm", "areaNm": "rlteRegnNm", "signguNm": "rlteSignguNm",
+    "rlteCtgryLclsNm": "rlteCtgryLclsNm", "rlteCtgryMclsNm": "rlteCtgryMclsNm", "rlteCtgrySclsNm": "rlteCtgrySclsNm",
+}
+
+
+def _text(s: pd.Series) -> np.ndarray:
+    """결측은 "", 나머지는 공백 정리한 문자열 (고유값만 변환해 코드로 펼침)"""
+    codes, uniq = pd.factorize(s)
+    text = np.array([str(v).strip() for v in uniq] + [""], dtype=object)
+    return text[codes]
+
+
+class GraphBuilder:
+    """
+    청크 단위로 간선을 모은다. 노드 키는 코드(없으면 이름)이고 정수 id로 바꿔
+    (src, dst, rank) 정수/실수 배열만 쌓으므로 build_pois 스트리밍 파이프라인에서도 쓸 수 있다.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.meta: Dict[str, List[str]] = {c: [] for c in META_COLS}
+        self._edges: List[tuple] = []
+
+    def _node_ids(self, df: pd.DataFrame, cols: Dict[str, str]) -> np.ndarray:
+        name = _text(df[cols["name"]])
+        code = _text(df[cols["code"]]) if cols["code"] in df.columns else name
+        key = np.where(code != "", code, name)
+        # 파이썬 루프와 메타데이터 변환은 청크 안의 고유 노드(첫 등장 행)만큼만
+        inverse, uniq = pd.factorize(key)
+        first = np.full(len(uniq), len(key), dtype=np.int64)
+        np.minimum.at(first, inverse, np.arange(len(key)))
+        head = df.iloc[first]
+        meta = {c: _text(head[src]) for c, src in cols.items() if c in META_COLS and src in df.columns}
+        ids = np.empty(len(uniq), dtype=np.int64)
+        for j, k in enumerate(uniq.tolist()):
+            nid = self.ids.get(k)
+            if nid is None:
+                nid = self.ids[k] = len(self.names)
+                self.names.append(name[first[j]])
+                for c in META_COLS:
+                    self.meta[c].append("")
+            # 비어 있던 메타데이터는 나중 행으로 채움(출발지로만 나온 노드도 연관지로 나오면 분류가 생김)
+            for c, vals in meta.items():
+                if vals[j] and not self.meta[c][nid]:
+                    self.meta[c][nid] = vals[j]
+            ids[j] = nid
+        return ids[inverse]
+
+    def add(self, df: pd.DataFrame) -> "GraphBuilder":
+        """정규화된 행(랭크 숫자화 후) 추가. 이름 컬럼이나 유효 랭크(>=1)가 없는 행은 무시"""
+        if df.empty or "tAtsNm" not in df.columns or "rlteTatsNm" not in df.columns:
+            return self
+        rank = pd.to_numeric(df.get("rlteRank_num", df.get("rlteRank")), errors="coerce").to_numpy(dtype=float)
+        df = df[rank >= 1]
+        rank = rank[rank >= 1]
+        if df.empty:
+            return self
+        src = self._node_ids(df, SRC_COLS)
+        dst = self._node_ids(df, DST_COLS)
+        loop = src != dst
+        self._edges.append((src[loop], dst[loop], rank[loop]))
+        return self
+
+    def build(self) -> "RelatedGraph":
+        n = len(self.names)
+        if self._edges:
+            src, dst, rank = (np.concatenate(a) for a in zip(*self._edges))
+        else:
+            src = dst = np.zeros(0, dtype=np.int64)
+            rank = np.zeros(0, dtype=float)
+        # 같은 간선이 여러 baseYm 에 나오면 가장 좋은(작은) 순위만 남김
+        order = np.lexsort((rank, dst, src))
+        src, dst, rank = src[order], dst[order], rank[order]
+        first = np.ones(len(src), dtype=bool)
+        first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, rank = src[first], dst[first], rank[first]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        codes = np.empty(n, dtype=object)
+        for k, i in self.ids.items():
+            codes[i] = k
+        return RelatedGraph(
+            indptr=indptr, indices=dst.astype(np.int32), weights=(1.0 / rank).astype(np.float32),
+            codes=codes.astype(str), names=np.array(self.names, dtype=str),
+            meta={c: np.array(v, dtype=str) for c, v in self.meta.items()},
+        )
+
+
+class RelatedGraph:
+    """CSR 인접 구조: 노드 i 의 연관지는 indices[indptr[i]:indptr[i+1]], 가중치는 같은 구간의 weights"""
+
+    def __init__(self, indptr, indices, weights, codes, names, meta, version: Optional[str] = None):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.codes = np.asarray(codes)
+        self.names = np.asarray(names)
+        self.meta = {c: np.asarray(meta.get(c, np.full(len(self.names), "")), dtype=str) for c in META_COLS}
+        self.version = version
+        n = len(self.names)
+        # PPR 전이용: 간선의 출발 노드와 행 정규화 가중치
+        self._src = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.indptr))
+        out_w = np.bincount(self._src, weights=self.weights, minlength=n)
+        self._norm_w = self.weights / np.where(out_w > 0, out_w, 1)[self._src]
+        self._dangling = out_w == 0
+        self._lookup: Dict[str, List[int]] = {}
+        for i, (code, name) in enumerate(zip(self.codes.tolist(), self.names.tolist())):
+            self._lookup.setdefault(code, []).append(i)
+            if name != code:
+                self._lookup.setdefault(name, []).append(i)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    # ---------- 저장 ----------
+    def save(self, path: str | Path = GRAPH_PATH, version: Optional[str] = None) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez_compressed(
+            tmp, indptr=self.indptr, indices=self.indices, weights=self.weights,
+            codes=self.codes, names=self.names, version=np.array(version or self.version or ""),
+            **{f"meta_{c}": v for c, v in self.meta.items()},
+        )
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path = GRAPH_PATH) -> "RelatedGraph":
+        with np.load(path, allow_pickle=False) as z:
+            meta = {c: z[f"meta_{c}"] for c in META_COLS if f"meta_{c}" in z.files}
+            version = str(z["version"]) or None
+            return cls(z["indptr"], z["indices"], z["weights"], z["codes"], z["names"], meta, version)
+
+    # ---------- 질의 ----------
+    def resolve(self, seeds: Iterable[str] | str) -> np.ndarray:
+        """코드 또는 이름(공백 정리) → 노드 id 배열. 모르는 시드는 건너뜀"""
+        if isinstance(seeds, str):
+            seeds = [seeds]
+        ids = [i for s in seeds for i in self._lookup.get(str(s).strip(), [])]
+        return np.unique(np.array(ids, dtype=np.int64))
+
+    def neighbors(self, node: int):
+        lo, hi = self.indptr[node], self.indptr[node + 1]
+        return self.indices[lo:hi], self.weights[lo:hi]
+
+    def similar(self, seed: str, top_n: int = 10, **filters) -> pd.DataFrame:
+        """직접 연관지를 가중치(=1/순위) 순으로, top_n 에 못 미치면 2-hop 연관지(가중치 곱)로 채운다"""
+        ids = self.resolve(seed)
+        if len(ids) == 0:
+            return self._frame(np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int8))
+        score = np.zeros(self.n_nodes)
+        hops = np.zeros(self.n_nodes, dtype=np.int8)
+        for i in ids.tolist():
+            nb, w = self.neighbors(i)
+            np.maximum.at(score, nb, w)
+        hops[score > 0] = 1
+        first = np.flatnonzero(score > 0)
+        if self._allowed(first, ids, filters).sum() < top_n:
+            second = np.zeros(self.n_nodes)
+            for i in first.tolist():
+                nb, w = self.neighbors(i)
+                np.maximum.at(second, nb, score[i] * w)
+            fill = (score == 0) & (second > 0)
+            score[fill] = second[fill]
+            hops[fill] = 2
+        cand = np.flatnonzero(score > 0)
+        cand = cand[self._allowed(cand, ids, filters)]
+        return self._top(cand, score, hops, top_n)
+
+    def ppr(
+        self, seeds: Iterable[str] | str, top_n: int = 10, alpha: float = 0.15,
+        max_iter: int = 50, tol: float = 1e-6, **filters,
+    ) -> pd.DataFrame:
+        """
+        시드(여러 개면 균등)에서 출발해 alpha 확률로 시드로 돌아오는 개인화 PageRank.
+        연관지가 없는 노드의 질량은 시드로 되돌린다. 시드 자신은 결과에서 뺀다.
+        """
+        ids = self.resolve(seeds)
+        if len(ids) == 0:
+            return self._frame(np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int8))
+        n = self.n_nodes
+        p = np.zeros(n)
+        p[ids] = 1.0 / len(ids)
+        x = p.copy()
+        for _ in range(max_iter):
+            spread = np.bincount(self.indices, weights=x[self._src] * self._norm_w, minlength=n)
+            nxt = (1 - alpha) * spread + (alpha + (1 - alpha) * x[self._dangling].sum()) * p
+            done = np.abs(nxt - x).sum() < tol
+            x = nxt
+            if done:
+                break
+        cand = np.flatnonzero(x > 0)
+        cand = cand[self._allowed(cand, ids, filters)]
+        return self._top(cand, x, np.zeros(n, dtype=np.int8), top_n)
+
+    def _allowed(self, cand: np.ndarray, seeds: np.ndarray, filters: dict) -> np.ndarray:
+        """시드 제외 + area/signgu/cat_l 필터 (recommend 와 같은 키워드)"""
+        ok = ~np.isin(cand, seeds)
+        for key, col in (("area", "areaNm"), ("signgu", "signguNm"), ("cat_l", "rlteCtgryLclsNm"),
+                         ("cat_m", "rlteCtgryMclsNm"), ("cat_s", "rlteCtgrySclsNm")):
+            if filters.get(key):
+                ok &= self.meta[col][cand] == filters[key]
+        return ok
+
+    def _top(self, cand: np.ndarray, score: np.ndarray, hops: np.ndarray, top_n: int) -> pd.DataFrame:
+        """가까운 hop 우선, 같은 hop 안에서는 점수 내림차순(점수는 모두 <= 1)"""
+        if top_n <= 0:
+            # argpartition(key, -1) 은 마지막 원소 기준이라 엉뚱한 결과 — 같은 컬럼의 빈 결과
+            cand = cand[:0]
+            return self._frame(cand, score[cand], hops[cand])
+        key = 2.0 * hops[cand] - score[cand]
+        if len(cand) > top_n:
+            part = np.argpartition(key, top_n - 1)[:top_n]
+            cand, key = cand[part], key[part]
+        cand = cand[np.lexsort((cand, key))]
+        return self._frame(cand, score[cand], hops[cand])
+
+    def _frame(self, ids: np.ndarray, score: np.ndarray, hops: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({
+            "rlteTatsCd": self.codes[ids], "rlteTatsNm": self.names[ids],
+            **{c: self.meta[c][ids] for c in META_COLS},
+            "score": np.asarray(score, dtype=float), "hops": np.asarray(hops, dtype=np.int8),
+        })
+
+
+def build_graph(df: pd.DataFrame) -> RelatedGraph:
+    return GraphBuilder().add(df).build()
+
+
+_CACHE: Dict[str, tuple] = {}
+_LOCK = threading.Lock()
+
+
+def get_graph(path: str | Path = GRAPH_PATH) -> Optional[RelatedGraph]:
+    """graph.npz 를 프로세스 공용으로 캐시(파일이 바뀌면 다시 읽음). 파일이 없으면 None"""
+    path = Path(path)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        hit = _CACHE.get(str(path))
+        if hit is None or hit[0] != stamp:
+            hit = _CACHE[str(path)] = (stamp, RelatedGraph.load(path))
+        return hit[1]
+
+
+def more_like_this(seed: str, top_n: int = 10, path: str | Path = GRAPH_PATH, **filters) -> pd.DataFrame:
+    """관광지 하나(코드/이름)와 직접 연관된 곳. 그래프 사이드카가 없으면 빈 DataFrame"""
+    g = get_graph(path)
+    return g.similar(seed, top_n, **filters) if g is not None else pd.DataFrame()
+
+
+def recommend_from(seeds: Iterable[str] | str, top_n: int = 10, path: str | Path = GRAPH_PATH, **kwargs) -> pd.DataFrame:
+    """여러 관광지를 시드로 한 개인화 PageRank 추천(멀티홉). 그래프 사이드카가 없으면 빈 DataFrame"""
+    g = get_graph(path)
+    return g.ppr(seeds, top_n, **kwargs) if g is not None else pd.DataFrame()
@@ -0,0 +1,106 @@
+# app/http_client.py
+"""
+수집기(app/collector.py, scripts/fetch_bulk.py) 공용 HTTP 클라이언트.
+- 프로세스 전역 requests.Session 하나를 재사용(keep-alive, 호스트별 커넥션 풀)
+- 연결 오류/429/5xx는 어댑터 레벨에서 지수 백오프 재시도
+- https→http / serviceKey→ServiceKey 폴백 중 성공한 조합(winner)을 기억해 다음 호출은 바로 그쪽으로
+"""
+from __future__ import annotations
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+KEY_NAMES = ("serviceKey", "ServiceKey")
+
+POOL_CONNECTIONS = 4    # 호스트별 풀 개수 (https/http 두 호스트 + 여유)
+POOL_MAXSIZE = 16       # 호스트당 유지할 keep-alive 연결 수 (fetch_bulk --workers 상한)
+USER_AGENT = "SmartTravelPlanner/1.0"
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+# (hosts, keys) -> 성공한 (base, key)
+_winners: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Tuple[str, str]] = {}
+_winner_lock = threading.Lock()
+
+
+def _retry_policy() -> Retry:
+    return Retry(
+        total=3,
+        connect=3,
+        read=2,
+        backoff_factor=0.5,                      # 0.5s, 1s, 2s ...
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,                   # 마지막 응답은 호출부에서 판단
+    )
+
+
+def _build_session(pool_maxsize: int) -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        max_retries=_retry_policy(),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"Accept": "application/json,*/*", "User-Agent": USER_AGENT})
+    return s
+
+
+def get_session() -> requests.Session:
+    """프로세스 전역 Session (스레드 간 공유)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(POOL_MAXSIZE)
+    return _session
+
+
+def configure(pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """풀 크기를 바꿔 Session을 새로 만든다 (예: 워커 수가 POOL_MAXSIZE보다 클 때)"""
+    global _session
+    with _session_lock:
+        old, _session = _session, _build_session(max(1, pool_maxsize))
+    if old is not None:
+        old.close()
+    return _session
+
+
+def get(url: str, params: Dict[str, Any], key: str, svc: str, timeout: float = 25, **kwargs) -> requests.Response:
+    """
+    key는 'serviceKey' 또는 'ServiceKey'.
+    svc가 이미 URL 인코딩된 키(%)면 requests가 다시 인코딩하지 않도록 쿼리에 직접 붙인다.
+    """
+    p = dict(params)
+    if "%" in svc:
+        return get_session().get(f"{url}?{key}={svc}", params=p, timeout=timeout, **kwargs)
+    p[key] = svc
+    return get_session().get(url, params=p, timeout=timeout, **kwargs)
+
+
+def attempt_order(hosts: Iterable[str], keys: Iterable[str] = KEY_NAMES) -> List[Tuple[str, str]]:
+    """(base, key) 시도 순서. 이전에 성공한 조합이 있으면 맨 앞으로."""
+    hosts, keys = tuple(hosts), tuple(keys)
+    combos = [(h, k) for h in hosts for k in keys]
+    winner = _winners.get((hosts, keys))
+    if winner in combos:
+        combos.remove(winner)
+        combos.insert(0, winner)
+    return combos
+
+
+def remember_winner(hosts: Iterable[str], keys: Iterable[str], base: str, key: str) -> None:
+    with _winner_lock:
+        _winners[(tuple(hosts), tuple(keys))] = (base, key)
+
+
+def forget_winners() -> None:
+    with _winner_lock:
+        _winners.clear()
@@ -0,0 +1,186 @@
+# app/metrics.py
+"""
+가벼운 단계별 지연 측정.
+  with metrics.span("chat.recommend"):
+      ...
+span 은 perf_counter_ns 로 잰 시간을 단계별 히스토그램에 넣는다.
+히스토그램은 누적 버킷(Prometheus 용)과 최근 RESERVOIR 개 샘플(p50/p95/p99 용)을 함께 가진다.
+비활성화(METRICS_ENABLED=0 또는 enable(False))하면 span 은 공용 no-op 컨텍스트를 돌려줘 비용이 거의 없다.
+
+내보내기: to_prometheus() (text exposition), snapshot() / write_json(), METRICS_EXPORT=경로(.prom|.json) 이면
+export_from_env() 가 스크립트 종료 시 파일로 남긴다.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 초 단위 버킷 상한(Prometheus 관례)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RESERVOIR = 2048
+METRIC_NAME = "smart_travel_stage_duration_seconds"
+
+_ENABLED = os.getenv("METRICS_ENABLED", "1") not in ("0", "false", "False", "")
+_NOOP = nullcontext()
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self._recent = np.zeros(RESERVOIR)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._recent[self.count % RESERVOIR] = seconds
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+            for i, le in enumerate(BUCKETS):
+                if seconds <= le:
+                    self.buckets[i] += 1
+                    break
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)) -> List[float]:
+        with self._lock:
+            recent = self._recent[:min(self.count, RESERVOIR)].copy()
+        if len(recent) == 0:
+            return [float("nan")] * len(qs)
+        return [float(v) for v in np.quantile(recent, qs)]
+
+    def cumulative(self) -> List[int]:
+        with self._lock:
+            return list(np.cumsum(self.buckets))
+
+
+class _Span:
+    __slots__ = ("name", "_t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, (time.perf_counter_ns() - self._t0) / 1e9)
+        return False
+
+
+_HISTS: Dict[str, Histogram] = {}
+_LOCK = threading.Lock()
+
+
+def enable(flag: bool = True):
+    global _ENABLED
+    _ENABLED = bool(flag)
+
+
+def enabled() -> bool:
+    return _ENABLED
+
+
+def span(name: str):
+    """단계 하나의 소요 시간을 재는 컨텍스트 매니저 (비활성 시 no-op)"""
+    return _Span(name) if _ENABLED else _NOOP
+
+
+def timed(name: str):
+    """함수 전체를 span 으로 감싸는 데코레이터"""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def observe(name: str, seconds: float):
+    if not _ENABLED:
+        return
+    hist = _HISTS.get(name)
+    if hist is None:
+        with _LOCK:
+            hist = _HISTS.setdefault(name, Histogram())
+    hist.observe(seconds)
+
+
+def reset():
+    with _LOCK:
+        _HISTS.clear()
+
+
+def _items():
+    """(이름, 히스토그램) 목록 — observe() 가 다른 스레드에서 새 이름을 넣어도 안전하게 잠근 채 복사"""
+    with _LOCK:
+        return sorted(_HISTS.items())
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """단계별 {count, sum_ms, p50_ms, p95_ms, p99_ms, max_ms}"""
+    out = {}
+    for name, h in _items():
+        p50, p95, p99 = h.quantiles()
+        out[name] = {
+            "count": h.count,
+            "sum_ms": round(h.sum * 1e3, 3),
+            "p50_ms": round(p50 * 1e3, 3),
+            "p95_ms": round(p95 * 1e3, 3),
+            "p99_ms": round(p99 * 1e3, 3),
+            "max_ms": round(h.max * 1e3, 3),
+        }
+    return out
+
+
+def to_prometheus() -> str:
+    lines = [
+        f"# HELP {METRIC_NAME} Per-stage latency.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for name, h in _items():
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for le, n in zip(BUCKETS, h.cumulative()):
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{le}"}} {n}')
+        lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="+Inf"}} {h.count}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {h.sum:.9f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {h.count}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str | Path) -> Path:
+    return _write(Path(path), to_prometheus())
+
+
+def write_json(path: str | Path) -> Path:
+    return _write(Path(path), json.dumps(snapshot(), ensure_ascii=False, indent=2))
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def export_from_env(var: str = "METRICS_EXPORT") -> Optional[Path]:
+    """환경변수에 경로가 있으면 확장자(.json 이면 JSON, 그 외 Prometheus 텍스트)에 맞춰 저장"""
+    target = os.getenv(var)
+    if not target or not _HISTS:
+        return None
+    return write_json(target) if target.endswith(".json") else write_prometheus(target)
@@ -0,0 +1,243 @@
+# app/planner.py
+"""
+일정(itinerary) 모드: 추천 상위 후보를 시간대 블록(아침/점심/저녁/야간) 안의 하루 동선으로 정렬한다.
+- 위치: 동봉한 시군구 중심 좌표표(data/seed/signgu_centroids.csv) — 없는 시군구는 시도 중심
+- 이동 비용: 후보 전체 쌍의 haversine 거리(벡터화) × 우회 계수 / 이동수단 속도 + 구간당 고정 시간
+- 경로: 블록마다 최근접 이웃으로 예산(분) 안에 들어가는 만큼 고른 뒤 2-opt 로 순서 개선, 남는 시간에 더 채움
+30개 후보 기준 수 ms 라 채팅 턴마다 돌려도 된다.
+"""
+from __future__ import annotations
+import csv
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+CENTROIDS_PATH = Path("data/seed/signgu_centroids.csv")
+EARTH_KM = 6371.0088
+
+# 이동수단별 (평균 속도 km/h, 직선 대비 우회 계수, 구간당 고정 시간[분]: 대기·환승·주차)
+TRANSPORT = {
+    "대중교통": (22.0, 1.35, 10.0),
+    "자가용": (32.0, 1.25, 5.0),
+}
+DEFAULT_TRANSPORT = "대중교통"
+# 같은 시군구 안 이동은 중심 좌표가 같으므로 최소 거리(km)로 본다
+INTRA_SIGNGU_KM = 1.5
+
+# 시간대 블록: (시작 시각[분], 예산[분])
+TIME_BLOCKS = {
+    "아침": (9 * 60, 180),
+    "점심": (12 * 60, 180),
+    "저녁": (17 * 60, 180),
+    "야간": (20 * 60, 150),
+}
+TIME_ALIASES = {"오전": "아침", "오후": "점심"}
+DAY_BLOCKS = ("아침", "점심", "저녁")
+# 대분류별 체류 시간(분)
+VISIT_MINUTES = {"관광지": 75, "음식": 60, "쇼핑": 50, "체험": 90, "숙박": 0}
+DEFAULT_VISIT = 60
+PLAN_CANDIDATES = 30
+
+_CENTROIDS: Optional[Tuple[float, Dict[Tuple[str, str], Tuple[float, float]]]] = None
+
+
+def load_centroids(path: str | Path = CENTROIDS_PATH) -> Dict[Tuple[str, str], Tuple[float, float]]:
+    """{(시도, 시군구): (위도, 경도)} — 시군구가 빈 행은 시도 중심. 파일 mtime 이 같으면 캐시"""
+    global _CENTROIDS
+    path = Path(path)
+    stamp = path.stat().st_mtime
+    if _CENTROIDS is not None and _CENTROIDS[0] == stamp and path == CENTROIDS_PATH:
+        return _CENTROIDS[1]
+    table = {}
+    with open(path, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            table[(row["areaNm"].strip(), row["signguNm"].strip())] = (float(row["lat"]), float(row["lon"]))
+    if path == CENTROIDS_PATH:
+        _CENTROIDS = (stamp, table)
+    return table
+
+
+def locate(areas: Sequence, signgus: Sequence, centroids: Dict | None = None) -> np.ndarray:
+    """행별 (위도, 경도). 시군구 → 시도 중심 → (둘 다 없으면) 알려진 좌표 평균 순으로 채운다"""
+    centroids = load_centroids() if centroids is None else centroids
+    coords = np.full((len(areas), 2), np.nan)
+    for i, (a, s) in enumerate(zip(areas, signgus)):
+        a = "" if a is None or a != a else str(a).strip()
+        s = "" if s is None or s != s else str(s).strip()
+        hit = centroids.get((a, s)) or centroids.get((a, ""))
+        if hit is not None:
+            coords[i] = hit
+    missing = np.isnan(coords[:, 0])
+    if missing.any():
+        coords[missing] = np.nanmean(coords, axis=0) if (~missing).any() else (37.5665, 126.9780)
+    return coords
+
+
+def haversine_matrix(coords: np.ndarray) -> np.ndarray:
+    """(n, 2) 위경도 → (n, n) 대권 거리(km), 브로드캐스팅으로 한 번에"""
+    lat, lon = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    h = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def travel_minutes(coords: np.ndarray, transport: Optional[str] = None) -> np.ndarray:
+    """(n, n) 이동 시간(분). 대각선은 0"""
+    speed, detour, fixed = TRANSPORT.get(transport or DEFAULT_TRANSPORT, TRANSPORT[DEFAULT_TRANSPORT])
+    km = np.maximum(haversine_matrix(coords), INTRA_SIGNGU_KM)
+    minutes = km * detour / speed * 60 + fixed
+    np.fill_diagonal(minutes, 0.0)
+    return minutes
+
+
+def _path_cost(route: List[int], cost: np.ndarray, start: Optional[int]) -> float:
+    nodes = ([start] if start is not None else []) + route
+    return float(sum(cost[a, b] for a, b in zip(nodes, nodes[1:])))
+
+
+def two_opt(route: List[int], cost: np.ndarray, start: int, max_rounds: int = 20) -> List[int]:
+    """start 에서 출발하는 열린 경로의 2-opt. 구간 뒤집기로 더 짧아지지 않을 때까지(최대 max_rounds 바퀴)"""
+    nodes = [start] + list(route)
+    n = len(nodes)
+    for _ in range(max_rounds):
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                a, b, c = nodes[i - 1], nodes[i], nodes[j]
+                d = nodes[j + 1] if j + 1 < n else None
+                before = cost[a, b] + (cost[c, d] if d is not None else 0.0)
+                after = cost[a, c] + (cost[b, d] if d is not None else 0.0)
+                if after + 1e-9 < before:
+                    nodes[i:j + 1] = nodes[i:j + 1][::-1]
+                    improved = True
+        if not improved:
+            break
+    return nodes[1:]
+
+
+def _route_block(
+    pool: List[int], cost: np.ndarray, visit: np.ndarray, scores: np.ndarray,
+    budget: float, start: Optional[int],
+) -> List[int]:
+    """
+    예산(분) 안의 경로. start 가 없으면 점수 최고 후보에서 출발.
+    최근접 이웃으로 채우고 → 2-opt → 줄어든 시간만큼 다시 최근접 이웃으로 덧붙인다.
+    """
+    pool = list(pool)
+    if not pool:
+        return []
+    route: List[int] = []
+    if start is None:
+        first = max(pool, key=lambda i: scores[i])
+        if visit[first] > budget:
+            return []
+        route.append(first)
+        pool.remove(first)
+
+    def used() -> float:
+        return _path_cost(route, cost, start) + float(visit[route].sum()) if route else 0.0
+
+    def extend():
+        spent = used()
+        while pool:
+            cur = route[-1] if route else start
+            cand = np.array(pool)
+            need = cost[cur, cand] + visit[cand]
+            ok = spent + need <= budget
+            if not ok.any():
+                return
+            # 가까운 곳 우선, 같은 거리면 점수 높은 곳
+            k = np.lexsort((-scores[cand][ok], cost[cur, cand][ok]))[0]
+            nxt = int(cand[ok][k])
+            spent += float(need[ok][k])
+            route.append(nxt)
+            pool.remove(nxt)
+
+    extend()
+    if len(route) > 1:
+        # 출발점(start 또는 첫 방문지)은 고정하고 나머지 순서만 개선
+        route[:] = two_opt(route, cost, start) if start is not None else [route[0]] + two_opt(route[1:], cost, route[0])
+        extend()
+    return route
+
+
+def plan_itinerary(
+    candidates: pd.DataFrame,
+    time_of_day: Optional[str] = None,
+    transport: Optional[str] = None,
+    centroids: Dict | None = None,
+) -> pd.DataFrame:
+    """
+    candidates: recommend() 결과(점수 순). time_of_day 가 있으면 그 블록 하나, 없으면 아침~저녁 하루 일정.
+    반환: 방문 순서대로 후보 컬럼 + block/order/arrive/depart/travel_min (arrive/depart 는 "HH:MM")
+    """
+    out_cols = list(candidates.columns) + ["block", "order", "arrive", "depart", "travel_min"]
+    if candidates.empty:
+        return pd.DataFrame(columns=out_cols)
+    tod = TIME_ALIASES.get(time_of_day, time_of_day)
+    blocks = [tod] if tod in TIME_BLOCKS else list(DAY_BLOCKS)
+
+    cands = candidates.reset_index(drop=True)
+    coords = locate(cands.get("areaNm", [None] * len(cands)), cands.get("signguNm", [None] * len(cands)), centroids)
+    cost = travel_minutes(coords, transport)
+    cats = cands["rlteCtgryLclsNm"] if "rlteCtgryLclsNm" in cands.columns else pd.Series([None] * len(cands))
+    visit = np.array([VISIT_MINUTES.get(c, DEFAULT_VISIT) for c in cats], dtype=float)
+    scores = pd.to_numeric(cands["score"], errors="coerce").fillna(0).to_numpy(dtype=float) \
+        if "score" in cands.columns else np.arange(len(cands), 0, -1, dtype=float)
+
+    pool = list(range(len(cands)))
+    rows, last = [], None
+    for block in blocks:
+        begin, budget = TIME_BLOCKS[block]
+        route = _route_block(pool, cost, visit, scores, budget, last)
+        clock, prev = float(begin), last
+        for i in route:
+            # 이전 블록의 마지막 장소에서 이어지면 블록 시작 시각부터 이동
+            travel = float(cost[prev, i]) if prev is not None else 0.0
+            arrive = clock + travel
+            depart = arrive + visit[i]
+            rows.append((i, block, len(rows) + 1, arrive, depart, round(travel, 1)))
+            clock, prev = depart, i
+            pool.remove(i)
+        if route:
+            last = route[-1]
+
+    if not rows:
+        return pd.DataFrame(columns=out_cols)
+    idx = [r[0] for r in rows]
+    res = cands.iloc[idx].reset_index(drop=True)
+    res["block"] = [r[1] for r in rows]
+    res["order"] = [r[2] for r in rows]
+    res["arrive"] = [_hhmm(r[3]) for r in rows]
+    res["depart"] = [_hhmm(r[4]) for r in rows]
+    res["travel_min"] = [r[5] for r in rows]
+    return res[out_cols]
+
+
+def _hhmm(minutes: float) -> str:
+    m = int(round(minutes))
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+def recommend_itinerary(
+    area: str | None = None,
+    signgu: str | None = None,
+    cat_l: str | None = None,
+    cat_m: str | None = None,
+    cat_s: str | None = None,
+    time_of_day: str | None = None,
+    transport: str | None = None,
+    n_candidates: int = PLAN_CANDIDATES,
+    df: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """recommend() 상위 n_candidates(시군구 다양성 적용)를 일정으로 정렬"""
+    from app.recommender import recommend
+
+    cands = recommend(
+        area=area, signgu=signgu, cat_l=cat_l, cat_m=cat_m, cat_s=cat_s, top_n=n_candidates,
+        time_of_day=time_of_day, transport=transport, df=df, diversify=True,
+    )
+    return plan_itinerary(cands, time_of_day, transport)
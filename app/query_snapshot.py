@@ -0,0 +1,174 @@
+# app/query_snapshot.py
+"""
+CLI 한 번짜리 질의용 압축 스냅샷 (data/processed/query.snap).
+refine 단계에서 final_pois 를 전역 순위 순서로 정렬해 facet 코드·posting list·이름·랭크를 이진 구간으로 저장하고,
+읽는 쪽은 표준 라이브러리만으로 mmap + memoryview 로 바로 조회한다(pandas/numpy import 없음).
+전역 순위를 그대로 따르므로 결과는 recommend(...)(diversify 없음)와 같다.
+
+파일: MAGIC | 헤더 길이(8바이트) | 헤더 JSON(8바이트 정렬 패딩 포함) | 구간들(각 8바이트 정렬)
+"""
+from __future__ import annotations
+import json
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.datafiles import DATA_PATH, data_version, resolve_data_path
+
+QUERY_SNAPSHOT_PATH = Path("data/processed/query.snap")
+MAGIC = b"STPQS1\n\0"
+# recommend() 필터 인자 → 컬럼 (app.recommender.FACET_COLS 와 같은 순서)
+FACET_COLS = {
+    "area": "areaNm",
+    "signgu": "signguNm",
+    "cat_l": "rlteCtgryLclsNm",
+    "cat_m": "rlteCtgryMclsNm",
+    "cat_s": "rlteCtgrySclsNm",
+}
+
+
+class QuerySnapshot:
+    def __init__(self, header: Dict[str, Any], buf, base: int):
+        self.header = header
+        self.version: Optional[str] = header.get("version")
+        self.n_rows: int = header["n_rows"]
+        self.int_rank: bool = header.get("int_rank", False)
+        self._buf = buf
+        view = memoryview(buf)
+        self._views = {
+            name: view[base + off:base + off + size].cast(code)
+            for name, (off, size, code) in header["sections"].items()
+        }
+        self._lookup = {col: {v: i for i, v in enumerate(vals)} for col, vals in header["values"].items()}
+
+    # ---------- 쓰기 (refine 단계, numpy/pandas 사용) ----------
+    @staticmethod
+    def write(index, path: str | Path = QUERY_SNAPSHOT_PATH, version: Optional[str] = None) -> Path:
+        """RecommenderIndex 로부터 스냅샷 파일 생성"""
+        import numpy as np
+        import pandas as pd
+
+        _, _, pos = index.ranking()
+        order = np.argsort(pos, kind="stable")          # 전역 순위 순서의 row-id
+        sections: Dict[str, tuple] = {}
+        blobs: List[bytes] = []
+        values: Dict[str, List[str]] = {}
+
+        def add(name: str, arr: np.ndarray | bytes, code: str):
+            data = arr if isinstance(arr, bytes) else np.ascontiguousarray(arr).tobytes()
+            sections[name] = (len(data), code)
+            blobs.append(data + b"\0" * (-len(data) % 8))
+
+        for col in FACET_COLS.values():
+            if col not in index.codes:
+                continue
+            codes = index.codes[col][order].astype(np.int32)
+            # 코드별 순위 위치 목록(CSR) — 오름차순이라 앞에서부터 top_n 만 보면 된다
+            post = np.argsort(codes, kind="stable").astype(np.uint32)
+            n_vals = len(index.lookup[col])
+            bounds = np.searchsorted(codes[post], np.arange(n_vals + 1)).astype(np.uint32)
+            values[col] = list(index.lookup[col])
+            add(f"codes:{col}", codes, "i")
+            add(f"post:{col}", post, "I")
+            add(f"bounds:{col}", bounds, "I")
+        names = index.df["rlteTatsNm"].iloc[order] if "rlteTatsNm" in index.df.columns else pd.Series([""] * len(order))
+        encoded = [("" if pd.isna(v) else str(v)).encode("utf-8") for v in names]
+        name_off = np.zeros(len(encoded) + 1, dtype=np.uint64)
+        name_off[1:] = np.cumsum([len(b) for b in encoded])
+        add("names_off", name_off, "Q")
+        add("names", b"".join(encoded), "B")
+        ranks = pd.to_numeric(index.df["rlteRank_num"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)[order] \
+            if "rlteRank_num" in index.df.columns else np.full(len(order), np.nan)
+        add("ranks", ranks.astype(np.float64), "d")
+        # 정수 컬럼이면 읽을 때도 int 로 돌려준다(pandas 경로 출력 "2" 와 "2.0" 이 어긋나지 않게)
+        int_rank = "rlteRank_num" in index.df.columns and pd.api.types.is_integer_dtype(index.df["rlteRank_num"])
+
+        # 구간 위치는 데이터 시작(헤더 뒤 8바이트 정렬) 기준 상대값
+        rel, cursor = {}, 0
+        for (name, (size, code)), blob in zip(sections.items(), blobs):
+            rel[name] = (cursor, size, code)
+            cursor += len(blob)
+        header = {"version": version, "n_rows": int(len(order)), "values": values, "sections": rel, "int_rank": int_rank}
+        raw = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        raw += b" " * (-(len(MAGIC) + 8 + len(raw)) % 8)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(raw)) + raw)
+            for blob in blobs:
+                f.write(blob)
+        tmp.replace(path)
+        return path
+
+    # ---------- 읽기 (표준 라이브러리만) ----------
+    @classmethod
+    def load(cls, path: str | Path = QUERY_SNAPSHOT_PATH) -> "QuerySnapshot":
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"query snapshot 형식이 아닙니다: {path}")
+        (size,) = struct.unpack_from("<Q", buf, len(MAGIC))
+        start = len(MAGIC) + 8
+        return cls(json.loads(bytes(buf[start:start + size])), buf, start + size)
+
+    def rows(self, top_n: int, **filters) -> List[int]:
+        """조건에 맞는 순위 위치 상위 top_n (가장 짧은 posting list 부터 훑고 나머지는 코드 비교)"""
+        conds = []
+        for key, value in filters.items():
+            value = None if value is None else (str(value).strip() or None)
+            if value is None:
+                continue
+            col = FACET_COLS[key]
+            if col not in self._lookup:
+                raise KeyError(col)
+            code = self._lookup[col].get(value)
+            if code is None:
+                return []
+            bounds = self._views[f"bounds:{col}"]
+            conds.append((bounds[code + 1] - bounds[code], col, code))
+        if not conds:
+            return list(range(min(top_n, self.n_rows)))
+        conds.sort()
+        _, col, code = conds[0]
+        bounds = self._views[f"bounds:{col}"]
+        post = self._views[f"post:{col}"][bounds[code]:bounds[code + 1]]
+        checks = [(self._views[f"codes:{c}"], k) for _, c, k in conds[1:]]
+        out = []
+        for p in post:
+            if all(codes[p] == k for codes, k in checks):
+                out.append(p)
+                if len(out) >= top_n:
+                    break
+        return out
+
+    def query(self, top_n: int = 10, **filters) -> List[Dict[str, Any]]:
+        """recommend() 와 같은 컬럼(RESULT_COLUMNS)의 레코드 목록"""
+        names, name_off, ranks = self._views["names"], self._views["names_off"], self._views["ranks"]
+        cols = {col: (self._views[f"codes:{col}"], self.header["values"][col]) for col in self._lookup}
+        out = []
+        for p in self.rows(top_n, **filters):
+            rank = ranks[p]
+            rec = {"rlteTatsNm": bytes(names[name_off[p]:name_off[p + 1]]).decode("utf-8")}
+            for col in ("areaNm", "signguNm", "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm"):
+                if col in cols:
+                    codes, vals = cols[col]
+                    rec[col] = vals[codes[p]] if codes[p] >= 0 else None
+            rec["rlteRank_num"] = int(rank) if self.int_rank and rank.is_integer() else rank
+            denom = 999.0 if math.isnan(rank) else rank
+            rec["score"] = 1 / denom if denom else math.inf
+            out.append(rec)
+        return out
+
+
+def load_fresh(path: str | Path = QUERY_SNAPSHOT_PATH, data_path: str | Path | None = None) -> Optional[QuerySnapshot]:
+    """스냅샷이 있고 final_pois 와 버전이 같으면 QuerySnapshot, 아니면 None(호출부가 pandas 경로로 폴백)"""
+    try:
+        snap = QuerySnapshot.load(path)
+        current = data_version(resolve_data_path(DATA_PATH if data_path is None else data_path))
+    except (OSError, ValueError):
+        return None
+    return snap if snap.version == current else None
@@ -0,0 +1,91 @@
+# app/raw_store.py
+"""
+수집 원본(raw) 저장 포맷.
+- 기본: gzip 압축 JSON Lines(pois.jsonl.gz). 페이지마다 gzip 멤버를 덧붙이는 방식이라
+  쓰는 쪽은 전체 리스트를 메모리에 들 필요가 없고, 읽는 쪽은 한 줄(한 item)씩 스트리밍할 수 있다.
+- 레거시: 들여쓰기된 JSON 배열(pois.json). 읽기만 계속 지원.
+"""
+from __future__ import annotations
+import gzip
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+RAW_DIR = Path("data/raw")
+POIS_JSONL = "pois.jsonl.gz"
+POIS_JSON = "pois.json"          # 레거시
+
+
+def append_page(path: str | Path, items: List[Dict[str, Any]]) -> int:
+    """items를 JSON Lines로 gzip 멤버 하나에 담아 파일 끝에 덧붙인다. 반환: 덧붙인 뒤 파일 크기(byte)"""
+    path = Path(path)
+    if items:
+        lines = "".join(json.dumps(it, ensure_ascii=False, separators=(",", ":")) + "\n" for it in items)
+        with open(path, "ab") as f:
+            f.write(gzip.compress(lines.encode("utf-8")))
+    return path.stat().st_size if path.exists() else 0
+
+
+def concat_files(srcs: Iterable[str | Path], dst: str | Path) -> Path:
+    """gzip 파일들을 바이트 단위로 이어 붙인다(다중 멤버 gzip도 유효한 gzip이라 재압축 불필요)."""
+    dst = Path(dst)
+    tmp = dst.with_name(dst.name + ".tmp")
+    with open(tmp, "wb") as out:
+        for src in srcs:
+            src = Path(src)
+            if src.exists():
+                with open(src, "rb") as f:
+                    shutil.copyfileobj(f, out)
+    tmp.replace(dst)
+    return dst
+
+
+def iter_records(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """JSON Lines(.jsonl / .jsonl.gz)는 한 줄씩, 레거시 JSON 배열은 통째로 읽어 item 단위로 내보낸다."""
+    path = Path(path)
+    if path.name.endswith((".jsonl", ".jsonl.gz")):
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        items = json.loads(path.read_text(encoding="utf-8"))
+        yield from (items if isinstance(items, list) else [items])
+
+
+def iter_chunks(path: str | Path, chunksize: int = 50_000):
+    """raw 파일을 chunksize 행짜리 DataFrame으로 나눠 읽는다."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.name.endswith((".jsonl", ".jsonl.gz")):
+        if path.stat().st_size == 0:
+            return
+        with pd.read_json(path, lines=True, chunksize=chunksize, compression="infer") as reader:
+            yield from reader
+    else:
+        df = pd.read_json(path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+
+def list_snapshots(raw_dir: str | Path = RAW_DIR) -> List[Path]:
+    """data/raw/YYYYMMDD/ 스냅샷 파일 전체를 오래된 순으로 (날짜별 pois.jsonl.gz 우선, 없으면 레거시 pois.json)"""
+    raw_dir = Path(raw_dir)
+    out = []
+    for day in sorted(p for p in raw_dir.glob("*") if p.is_dir()):
+        for name in (POIS_JSONL, POIS_JSON):
+            if (day / name).exists():
+                out.append(day / name)
+                break
+    return out
+
+
+def latest_snapshot(raw_dir: str | Path = RAW_DIR) -> Path:
+    """data/raw/YYYYMMDD/ 중 가장 최신 스냅샷 파일(pois.jsonl.gz 우선, 없으면 레거시 pois.json)"""
+    snapshots = list_snapshots(raw_dir)
+    if snapshots:
+        return snapshots[-1]
+    raise FileNotFoundError(f"{raw_dir}/YYYYMMDD/{POIS_JSONL} (또는 {POIS_JSON}) 이 없습니다.")
@@ -0,0 +1,130 @@
+# app/reco_cube.py
+"""
+추천 큐브: (시도 × 시군구 × 대분류) 필터 조합(각 차원 "전체" 와일드카드 포함)별 상위 K 행 id 를
+전역 순위 순서로 미리 잘라 둔 사이드카(data/processed/cube.npz). refine 단계에서 만든다.
+recommend() 는 조합 키 dict 조회 + 배열 슬라이스 한 번으로 답한다.
+
+- 시간대/이동수단은 모든 행에 같은 배수(_context_weight)라 순서를 바꾸지 않으므로
+  차원으로 펼치지 않고 읽을 때 점수에만 곱한다.
+- 크기 예산: 행이 CUBE_MIN_ROWS 보다 적은(희소) 조합은 저장하지 않고, 나머지도 큰 조합부터
+  CUBE_MAX_BYTES 안에 들어가는 만큼만 담는다. 없는 조합은 recommend() 가 그대로 라이브 계산한다.
+"""
+from __future__ import annotations
+import itertools
+import json
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+CUBE_PATH = Path("data/processed/cube.npz")
+# recommend() 필터 인자 → 컬럼 (큐브 차원)
+CUBE_DIMS = {
+    "area": "areaNm",
+    "signgu": "signguNm",
+    "cat_l": "rlteCtgryLclsNm",
+}
+CUBE_TOP_K = 50
+CUBE_MIN_ROWS = 200
+CUBE_MAX_BYTES = 8 * 2**20
+
+Key = Tuple[str, str, str]
+
+
+class RecoCube:
+    """
+    keys: {(area, signgu, cat_l): 칸 번호} — "" 는 와일드카드
+    indptr/rows: CSR 형태. 칸 i 의 행 id(원본 프레임 위치, 전역 순위순) = rows[indptr[i]:indptr[i+1]]
+    한 칸에 top_k 보다 적게 들어 있으면 그 조합의 전체 행이다.
+    """
+
+    def __init__(self, keys: Dict[Key, int], indptr: np.ndarray, rows: np.ndarray,
+                 top_k: int, version: Optional[str] = None):
+        self.keys = keys
+        self.indptr = indptr
+        self.rows = rows
+        self.top_k = top_k
+        self.version = version
+
+    @property
+    def n_cells(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rows.nbytes + self.indptr.nbytes)
+
+    # ---------- 생성 (refine 단계) ----------
+    @classmethod
+    def build(cls, index, version: Optional[str] = None, top_k: int = CUBE_TOP_K,
+              min_rows: int = CUBE_MIN_ROWS, max_bytes: int = CUBE_MAX_BYTES) -> "RecoCube":
+        """RecommenderIndex 의 전역 순위로 조합별 상위 top_k 를 한 번에 자른다"""
+        import pandas as pd
+
+        _, _, pos = index.ranking()
+        order = np.argsort(pos, kind="stable")              # 전역 순위 순서의 row-id
+        dims = [c for c in CUBE_DIMS.values() if c in index.codes]
+        names = {c: list(index.lookup[c]) for c in dims}
+        codes = pd.DataFrame({c: index.codes[c][order] for c in dims})
+
+        # 후보 칸: 차원 부분집합(와일드카드 조합)마다 groupby — 결측 코드(-1)가 낀 칸은 이름으로 질의할 수 없어 뺀다
+        cells = []      # (행 수, 키, 순위 위치 배열)
+        for r in range(len(dims) + 1):
+            for sub in itertools.combinations(dims, r):
+                if not sub:
+                    cells.append((len(order), ("", "", ""), np.arange(min(top_k, len(order)))))
+                    continue
+                for vals, idx in codes.groupby(list(sub), sort=False).indices.items():
+                    vals = vals if isinstance(vals, tuple) else (vals,)
+                    if len(idx) < min_rows or min(vals) < 0:
+                        continue
+                    fixed = dict(zip(sub, vals))
+                    key = tuple(names[c][fixed[c]] if c in fixed else "" for c in CUBE_DIMS.values())
+                    cells.append((len(idx), key, idx[:top_k]))
+
+        # 라이브 계산이 비싼(행이 많은) 칸부터 예산 안에서 채택
+        cells.sort(key=lambda c: -c[0])
+        keys: Dict[Key, int] = {}
+        chunks, used = [], 0
+        for _, key, idx in cells:
+            size = len(idx) * 4 + 8
+            if used + size > max_bytes:
+                continue
+            keys[key] = len(chunks)
+            chunks.append(order[idx])
+            used += size
+        indptr = np.zeros(len(chunks) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(c) for c in chunks])
+        rows = np.concatenate(chunks).astype(np.uint32) if chunks else np.empty(0, dtype=np.uint32)
+        return cls(keys, indptr, rows, top_k, version)
+
+    # ---------- 저장/로드 ----------
+    def save(self, path: str | Path = CUBE_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        keys = [list(k) for k, _ in sorted(self.keys.items(), key=lambda kv: kv[1])]
+        np.savez(
+            tmp, indptr=self.indptr, rows=self.rows, top_k=np.array(self.top_k),
+            keys=np.array(json.dumps(keys, ensure_ascii=False)), version=np.array(self.version or ""),
+        )
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path = CUBE_PATH) -> "RecoCube":
+        with np.load(path, allow_pickle=False) as z:
+            keys = {tuple(k): i for i, k in enumerate(json.loads(str(z["keys"])))}
+            return cls(keys, z["indptr"], z["rows"], int(z["top_k"]), str(z["version"]) or None)
+
+    # ---------- 조회 ----------
+    def lookup(self, top_n: int, area: str | None = None, signgu: str | None = None,
+               cat_l: str | None = None) -> Optional[np.ndarray]:
+        """상위 top_n 행 id(전역 순위순). 저장 안 된 조합이거나 top_n 이 잘라 둔 K 를 넘으면 None"""
+        i = self.keys.get((area or "", signgu or "", cat_l or ""))
+        if i is None:
+            return None
+        cell = self.rows[self.indptr[i]:self.indptr[i + 1]]
+        if top_n > len(cell) and len(cell) >= self.top_k:
+            return None
+        return cell[:top_n].astype(np.int64)
@@ -1,50 +1,513 @@
 # app/recommender.py
 from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from app.datafiles import DATA_PATH, DATASET_DIR, data_version, resolve_data_path  # noqa: F401
+from app.facet_catalog import FACETS_PATH, FacetCatalog
+from app.reco_cube import CUBE_PATH, RecoCube
 
-DATA_PATH = Path("data/processed/final_pois.parquet")
+# refine 이 함께 남기는 Arrow IPC(Feather v2, 비압축) 스냅샷 — load_data()가 메모리 맵으로 읽어
+# 여러 워커 프로세스가 OS 페이지 캐시의 한 벌을 공유한다(False 면 항상 Parquet)
+ARROW_SUFFIX = ".arrow"
+USE_MMAP = True
+
+# recommend() 상위 N 선택을 argpartition 부분 선택으로 할지(False면 전체 sort_values)
+USE_TOPK = True
+RESULT_COLUMNS = [
+    "rlteTatsNm", "areaNm", "signguNm",
+    "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm",
+    "rlteRank_num", "score"
+]
+# diversify=True 일 때 다양성 재정렬에 쓰는 후보 풀(top_n × 배수)과 같은 중분류 반복 감쇠
+DIVERSITY_POOL = 10
+MCLS_DECAY = 0.8
+# recommend() 결과 LRU 캐시: 항목 수/메모리 상한, 한 번에 계산해 두는 최소 K(작은 top_n은 잘라서 응답)
+RECO_CACHE_ENTRIES = 512
+RECO_CACHE_BYTES = 64 * 2**20
+RECO_CACHE_TTL: float | None = None
+RECO_CACHE_MIN_K = 20
+# refine 이 남긴 추천 큐브(cube.npz)로 (시도, 시군구, 대분류) 조합 질의를 조회 + 슬라이스로 답할지
+USE_CUBE = True
+
+# refine 단계에서 dictionary 인코딩해 저장하고 load_data()가 category로 돌려주는 컬럼
+CATEGORY_COLS = [
+    "baseYm", "areaNm", "signguNm",
+    "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm",
+    "rlteRegnNm", "rlteSignguNm",
+]
+
+# recommend() 필터 인자 → 컬럼 매핑 (인덱스/필터 공통)
+FACET_COLS = {
+    "area": "areaNm",
+    "signgu": "signguNm",
+    "cat_l": "rlteCtgryLclsNm",
+    "cat_m": "rlteCtgryMclsNm",
+    "cat_s": "rlteCtgrySclsNm",
+}
+
+# recommend()에 필요한 최소 컬럼 (load_data(columns=RECO_COLUMNS)로 메모리 절약)
+RECO_COLUMNS = [
+    "rlteTatsNm", "areaNm", "signguNm",
+    "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm",
+    "rlteRank_num",
+]
+
+def arrow_path(path: str | Path = DATA_PATH) -> Path:
+    """final_pois(파일 또는 파티션 디렉터리) 옆의 Arrow 스냅샷 경로"""
+    path = resolve_data_path(path)
+    return path.with_suffix(ARROW_SUFFIX) if path.suffix else path.with_name(path.name + ARROW_SUFFIX)
+
+def write_arrow(df: pd.DataFrame, path: str | Path, version: str | None = None) -> Path:
+    """
+    df를 비압축 Arrow IPC 파일로 저장(category는 dictionary 그대로).
+    version(원본 data_version)을 스키마 메타데이터에 남겨 load_data()가 어긋난 스냅샷을 무시하게 한다.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return write_arrow_batches(table.to_batches(), table.schema, path, version)
+
+def write_arrow_batches(batches, schema, path: str | Path, version: str | None = None) -> Path:
+    """
+    write_arrow 의 스트리밍 판: 같은 schema 의 레코드 배치를 하나씩 덧붙여 쓴다(전체 테이블을 들지 않음).
+    dictionary 컬럼은 배치마다 같은 사전을 써야 한다(IPC 파일 형식은 사전 교체를 허용하지 않음).
+    """
+    import pyarrow as pa
 
-def load_data(path: str | Path = DATA_PATH) -> pd.DataFrame:
-    """정제된 파케이 파일 로드"""
     path = Path(path)
+    if version is not None:
+        schema = schema.with_metadata({**(schema.metadata or {}), b"data_version": version.encode()})
+    tmp = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(pa.RecordBatch.from_arrays(batch.columns, schema=schema))
+    tmp.replace(path)
+    return path
+
+def _read_arrow(path: Path, columns: list[str] | None, version: str | None) -> pd.DataFrame | None:
+    """메모리 맵으로 Arrow 스냅샷 읽기(버퍼 복사 없음). version이 다르면 None"""
+    import pyarrow as pa
+
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        meta = reader.schema.metadata or {}
+        if version is not None and meta.get(b"data_version", b"").decode() != version:
+            return None
+        table = reader.read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    # split_blocks: 컬럼을 2차원 블록으로 합치지 않아 숫자 컬럼도 맵핑된 버퍼를 그대로 쓴다
+    return table.to_pandas(split_blocks=True)
+
+def load_data(
+    path: str | Path = DATA_PATH,
+    columns: list[str] | None = None,
+    categorical: bool = True,
+    mmap: bool | None = None,
+) -> pd.DataFrame:
+    """
+    정제된 파케이 파일(또는 파티션 디렉터리) 로드.
+    columns: 필요한 컬럼만 읽기 (없는 컬럼은 무시)
+    categorical: CATEGORY_COLS를 pandas category로 (예전 object 저장 파일도 변환)
+    mmap: 옆에 같은 버전의 Arrow 스냅샷(.arrow)이 있으면 메모리 맵으로 읽는다(None이면 USE_MMAP).
+          스냅샷이 없거나 원본보다 오래됐으면 Parquet으로 폴백. path가 .arrow 파일이면 그대로 맵핑.
+    """
+    path = resolve_data_path(path)
     if not path.exists():
         raise FileNotFoundError(f"정제 데이터가 없습니다: {path}")
-    df = pd.read_parquet(path)
+    df = None
+    if path.suffix == ARROW_SUFFIX:
+        df = _read_arrow(path, columns, None)
+    elif USE_MMAP if mmap is None else mmap:
+        side = arrow_path(path)
+        if side.exists():
+            df = _read_arrow(side, columns, data_version(path))
+    if df is None:
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.ParquetDataset(path).schema.names)
+            columns = [c for c in columns if c in available]
+        df = pd.read_parquet(path, columns=columns)
     # 타입 정리(안전장치)
-    if "rlteRank_num" in df.columns:
+    if categorical:
+        for c in CATEGORY_COLS:
+            if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+                df[c] = df[c].astype("category")
+    if "rlteRank_num" in df.columns and not pd.api.types.is_float_dtype(df["rlteRank_num"]):
         df["rlteRank_num"] = pd.to_numeric(df["rlteRank_num"], errors="coerce")
     return df
 
-def facets(df: pd.DataFrame | None = None):
+class RecommenderIndex:
+    """
+    facet 컬럼별 카테고리 코드 + posting list(row-id 배열)를 미리 만들어 두는 필터 인덱스.
+    load_data() 직후 한 번만 만들고, 질의 때는 posting list 교집합으로
+    조건에 맞는 행만 골라낸다(전체 df.copy()/불리언 마스크 없음).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.n_rows = len(df)
+        self.codes: dict[str, np.ndarray] = {}              # col -> 행별 코드 (결측은 -1)
+        self.lookup: dict[str, dict[str, int]] = {}         # col -> {값: 코드}
+        self.postings: dict[str, list[np.ndarray]] = {}     # col -> 코드별 row-id(오름차순)
+        self._ranking = None
+        for col in FACET_COLS.values():
+            if col not in df.columns:
+                continue
+            cat = pd.Categorical(df[col])
+            codes = np.asarray(cat.codes, dtype=np.int32)
+            # 코드 기준 stable 정렬 → 코드별 구간이 곧 posting list (row-id 오름차순 유지)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(cat.categories) + 1))
+            self.codes[col] = codes
+            self.lookup[col] = {str(v): i for i, v in enumerate(cat.categories)}
+            self.postings[col] = [order[bounds[i]:bounds[i + 1]] for i in range(len(cat.categories))]
+
+    @classmethod
+    def from_path(cls, path: str | Path = DATA_PATH) -> "RecommenderIndex":
+        return cls(load_data(path))
+
+    def rows(self, **filters) -> np.ndarray | None:
+        """
+        filters: area/signgu/cat_l/cat_m/cat_s (빈 값은 무시).
+        가장 짧은 posting list에서 시작해 나머지 조건은 코드 비교로 좁힌다.
+        Returns: 조건을 모두 만족하는 row-id 배열(오름차순). 필터가 하나도 없으면 None(= 전체 행)
+        """
+        conds = []
+        for key, value in filters.items():
+            if not value:
+                continue
+            col = FACET_COLS[key]
+            if col not in self.codes:
+                raise KeyError(col)
+            code = self.lookup[col].get(str(value))
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            conds.append((len(self.postings[col][code]), col, code))
+
+        if not conds:
+            return None
+
+        conds.sort(key=lambda c: c[0])
+        _, col, code = conds[0]
+        rows = self.postings[col][code]
+        for _, col, code in conds[1:]:
+            if len(rows) == 0:
+                break
+            rows = rows[self.codes[col][rows] == code]
+        return rows
+
+    def ranking(self):
+        """(ranks, 기본 점수, 전역 순위 위치) — 전체 프레임을 한 번만 정렬해 캐시(recommend_many용)"""
+        if self._ranking is None:
+            ranks = _rank_array(self.df)
+            scores = _score_array(self.df, ranks, None, None)
+            pos = np.empty(self.n_rows, dtype=np.int64)
+            pos[_topk_order(scores, ranks, self.n_rows)] = np.arange(self.n_rows)
+            self._ranking = (ranks, scores, pos)
+        return self._ranking
+
+    def query(self, **filters) -> pd.DataFrame:
+        """조건에 맞는 행만 담은 DataFrame(원본 행 순서 유지). 필터가 없으면 복사 없이 self.df"""
+        rows = self.rows(**filters)
+        return self.df if rows is None else self.df.iloc[rows]
+
+
+class Snapshot:
+    """한 버전의 final_pois 데이터 + 파생 인덱스. get_snapshot()이 프로세스 전역으로 캐시한다."""
+
+    def __init__(self, path: Path, version: str, df: pd.DataFrame):
+        self.path = path
+        self.version = version
+        self.df = df
+        self._index: RecommenderIndex | None = None
+        self._catalog: FacetCatalog | None = None
+        self._cube: RecoCube | None | bool = False     # False = 아직 안 읽음, None = 사이드카 없음/버전 불일치
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> RecommenderIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = RecommenderIndex(self.df)
+        return self._index
+
+    @property
+    def catalog(self) -> FacetCatalog:
+        """refine이 남긴 facets.json(같은 데이터 버전일 때만) 또는 첫 사용 시 df로 생성"""
+        if self._catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    sidecar = self.path.parent / FACETS_PATH.name
+                    cat = None
+                    if sidecar.exists():
+                        cat = FacetCatalog.load(sidecar)
+                        if cat.version != self.version:
+                            cat = None
+                    self._catalog = cat or FacetCatalog.build(self.df, self.version)
+        return self._catalog
+
+    @property
+    def cube(self) -> RecoCube | None:
+        """refine이 남긴 cube.npz(같은 데이터 버전일 때만). 없으면 None — 추천은 라이브 계산"""
+        if self._cube is False:
+            with self._lock:
+                if self._cube is False:
+                    sidecar = self.path.parent / CUBE_PATH.name
+                    cube = RecoCube.load(sidecar) if sidecar.exists() else None
+                    self._cube = cube if cube is not None and cube.version == self.version else None
+        return self._cube
+
+    def warm(self) -> "Snapshot":
+        """인덱스/카탈로그/전역 순위/큐브를 미리 만들어 둔다(첫 요청 지연 제거용)"""
+        self.index.ranking()
+        self.catalog
+        self.cube
+        return self
+
+
+_SNAPSHOTS: dict[Path, Snapshot] = {}
+_SNAPSHOT_LOCK = threading.Lock()
+
+def get_snapshot(path: str | Path | None = None, warm: bool = False) -> Snapshot:
+    """
+    프로세스 전역 캐시 로더(path 기본값은 DATA_PATH). 호출마다 stat만 확인하고, 버전(mtime/크기)이 바뀌었을 때만 다시 읽는다.
+    warm=True면 새 버전을 인덱스까지 다 만든 뒤에 교체한다(서비스의 무중단 갱신용).
+    반환된 df는 여러 호출부가 공유하므로 수정하지 말 것.
+    """
+    path = resolve_data_path(DATA_PATH if path is None else path)
+    key = path.resolve()
+    version = data_version(path)
+    snap = _SNAPSHOTS.get(key)
+    if snap is not None and snap.version == version:
+        return snap
+    with _SNAPSHOT_LOCK:
+        snap = _SNAPSHOTS.get(key)
+        if snap is None or snap.version != version:
+            snap = Snapshot(path, version, load_data(path))
+            if warm:
+                snap.warm()
+            _SNAPSHOTS[key] = snap
+    return snap
+
+def get_data(path: str | Path | None = None) -> pd.DataFrame:
+    """get_snapshot(path).df — UI/CLI 공용 데이터 진입점"""
+    return get_snapshot(path).df
+
+def clear_snapshots():
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOTS.clear()
+    _RECO_CACHE.clear()
+
+def _snapshot_of(df: pd.DataFrame) -> Snapshot | None:
+    """df가 캐시된 스냅샷의 프레임이면 그 스냅샷(인덱스/카탈로그 재사용용)"""
+    for snap in list(_SNAPSHOTS.values()):
+        if snap.df is df:
+            return snap
+    return None
+
+def _snapshot_index(df: pd.DataFrame) -> RecommenderIndex | None:
+    snap = _snapshot_of(df)
+    return snap.index if snap is not None else None
+
+
+class RecoCache:
+    """
+    recommend() 결과용 LRU(+선택 TTL) 캐시. 키 = 스냅샷(경로, 버전) + 정규화된 필터 튜플.
+    항목마다 상위 K행을 한 번 저장해 두고 top_n <= K 요청은 앞부분을 잘라 응답한다.
+    항목 수와 DataFrame 메모리(deep) 합계가 상한을 넘으면 오래된 것부터 내보낸다.
+    경로별로 최신 버전을 기억해, 어떤 경로의 버전이 바뀌면(nightly 갱신) 그 경로의 이전 버전 항목만
+    put 시점에 비운다(다른 경로 항목은 그대로).
+    """
+
+    def __init__(self, max_entries: int = RECO_CACHE_ENTRIES, max_bytes: int = RECO_CACHE_BYTES,
+                 ttl: float | None = RECO_CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: OrderedDict[tuple, tuple[int, pd.DataFrame, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions: dict[str, str] = {}        # 경로 -> 마지막으로 본 버전
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: tuple, top_n: int) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                k, frame, stored, _ = entry
+                if self.ttl is not None and time.monotonic() - stored > self.ttl:
+                    self._drop(key)
+                    self.evictions += 1
+                elif top_n <= k or len(frame) < k:      # len < k: 후보를 이미 다 담았음
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return frame.head(top_n).copy()
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, frame: pd.DataFrame, k: int):
+        nbytes = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            path, version = key[0]
+            if self._versions.get(path, version) != version:
+                stale = [k for k in self._data if k[0][0] == path and k[0][1] != version]
+                for old in stale:
+                    self._drop(old)
+                self.invalidations += len(stale)
+            self._versions[path] = version
+            if key in self._data:
+                self._drop(key)
+            if nbytes > self.max_bytes:
+                return
+            self._data[key] = (k, frame, time.monotonic(), nbytes)
+            self.bytes += nbytes
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _drop(self, key: tuple):
+        self.bytes -= self._data.pop(key)[3]
+
+    def clear(self):
+        """항목과 카운터를 모두 초기화"""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self._versions.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "invalidations": self.invalidations, "entries": len(self._data), "bytes": self.bytes,
+            }
+
+
+_RECO_CACHE = RecoCache()
+
+def reco_cache_stats() -> dict:
+    """recommend() 결과 캐시 카운터 (hits/misses/evictions/invalidations/entries/bytes)"""
+    return _RECO_CACHE.stats()
+
+def _norm(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def facets(df: pd.DataFrame | None = None, area: str | None = None, signgu: str | None = None) -> dict:
     """
-    필터 UI에 쓸 선택지 반환.
-    df가 None이면 내부에서 load_data()로 읽어오므로 facets()와 facets(df) 모두 지원.
-    Returns: (areas, signgus, cats_l, cats_m, cats_s)
+    필터 UI에 쓸 선택지 반환: {"areas","signgus","lcats","mcats","scats","count"}.
+    df가 None이면 캐시된 스냅샷의 facet 카탈로그(facets.json 사이드카)를 쓰고,
+    area/signgu를 주면 그 아래로 드릴다운한 선택지를 돌려준다(미리 펼쳐 둔 dict 조회).
     """
     if df is None:
-        df = load_data()
-
-    def uniq(col):
-        return (
-            df[col]
-            .dropna()
-            .astype(str)
-            .map(lambda s: s.strip())
-            .replace({"": pd.NA})
-            .dropna()
-            .sort_values()
-            .unique()
-            .tolist()
-            if col in df.columns else []
-        )
+        catalog = get_snapshot().catalog
+    else:
+        snap = _snapshot_of(df)
+        catalog = snap.catalog if snap is not None else FacetCatalog.build(df)
+    return catalog.query(area, signgu)
 
-    areas  = uniq("areaNm")
-    signgu = uniq("signguNm")
-    cats_l = uniq("rlteCtgryLclsNm")
-    cats_m = uniq("rlteCtgryMclsNm")
-    cats_s = uniq("rlteCtgrySclsNm")
-    return areas, signgu, cats_l, cats_m, cats_s
+def _rank_array(q: pd.DataFrame) -> np.ndarray:
+    if "rlteRank_num" not in q.columns:
+        return np.zeros(len(q))
+    return pd.to_numeric(q["rlteRank_num"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+def _score_array(q: pd.DataFrame, ranks: np.ndarray, time_of_day: str | None, transport: str | None) -> np.ndarray:
+    """기본 스코어 = (랭크가 낮을수록 가중치 높게) — NumPy 배열로 계산"""
+    if "rlteRank_num" in q.columns:
+        scores = 1 / np.where(np.isnan(ranks), 999.0, ranks)
+    else:
+        scores = np.ones(len(q))
+
+    return scores * _context_weight(time_of_day, transport)
+
+def _context_weight(time_of_day: str | None, transport: str | None) -> float:
+    """시간/교통수단에 따른 가벼운 가중치 예시 — 모든 행에 같은 배수라 순위는 바뀌지 않는다"""
+    # 시간대·이동수단을 실제로 반영하는 건 일정 모드(app/planner.py: 블록별 시간 예산 + 이동 비용 행렬)
+    w = 1.0
+    if time_of_day == "저녁":
+        w *= 1.05
+    if transport == "대중교통":
+        w *= 1.03
+    return w
+
+def _topk_order(scores: np.ndarray, ranks: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    sort_values(["score","rlteRank_num"], ascending=[False, True]).head(top_n)와
+    같은 순서의 위치 배열. argpartition으로 k번째 점수를 찾아 그 이상인 후보(동점 포함)만
+    lexsort한다. 타이브레이크: 점수 내림차순 → 랭크 오름차순(NaN 마지막) → 원래 행 순서.
+    """
+    n = len(scores)
+    neg = -scores
+    if 0 < top_n < n:
+        kth = neg[np.argpartition(neg, top_n - 1)[top_n - 1]]
+        cand = np.flatnonzero(neg <= kth)
+    else:
+        cand = np.arange(n)
+    nan_rank = np.isnan(ranks[cand])
+    rank_key = np.where(nan_rank, 0.0, ranks[cand])
+    order = cand[np.lexsort((cand, rank_key, nan_rank, neg[cand]))]
+    return order[:top_n]
+
+def _diversify_order(order: np.ndarray, q: pd.DataFrame, scores: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    점수순 후보 풀(order)을 signguNm 라운드로빈 쿼터로 재정렬.
+    시군구별 큐의 머리만 비교하며, 가장 적게 뽑힌 시군구들 중에서
+    점수 × MCLS_DECAY^(같은 중분류를 이미 뽑은 횟수)가 가장 큰 머리를 고른다.
+    선택마다 그룹 수만큼만 보므로 비용은 O(top_n × 그룹 수).
+    시군구가 하나뿐이면(시군구 필터 등) 중분류로 묶는다.
+    """
+    def codes(col):
+        if col not in q.columns:
+            return np.zeros(len(order), dtype=np.int64)
+        return pd.factorize(q[col].iloc[order].to_numpy(), use_na_sentinel=False)[0]
+
+    group, mcls = codes("signguNm"), codes("rlteCtgryMclsNm")
+    if group.max(initial=0) == 0:
+        group = mcls
+    n_groups = int(group.max(initial=-1)) + 1
+    # 그룹별 큐: order 안의 위치들(점수순 유지)
+    by_group = np.argsort(group, kind="stable")
+    bounds = np.searchsorted(group[by_group], np.arange(n_groups + 1))
+    head = bounds[:-1].copy()
+    used = np.zeros(n_groups, dtype=np.int64)
+    used_m = np.zeros(int(mcls.max(initial=-1)) + 1, dtype=np.int64)
+    pool_scores = scores[order]
+
+    picked = []
+    while len(picked) < top_n:
+        live = np.flatnonzero(head < bounds[1:])
+        if len(live) == 0:
+            break
+        live = live[used[live] == used[live].min()]
+        pos = by_group[head[live]]
+        adj = pool_scores[pos] * MCLS_DECAY ** used_m[mcls[pos]]
+        j = int(np.argmax(adj))                     # 동점이면 앞선(점수순) 그룹
+        g, p = live[j], pos[j]
+        picked.append(p)
+        head[g] += 1
+        used[g] += 1
+        used_m[mcls[p]] += 1
+    return order[np.array(picked, dtype=np.int64)]
+
+def _mask_filter(df: pd.DataFrame, area, signgu, cat_l, cat_m, cat_s) -> pd.DataFrame:
+    """인덱스가 없을 때의 불리언 마스크 필터 (마스크를 합쳐 한 번만 슬라이싱)"""
+    mask = None
+    for col, value in zip(FACET_COLS.values(), (area, signgu, cat_l, cat_m, cat_s)):
+        if not value:
+            continue
+        m = (df[col] == value).to_numpy()
+        mask = m if mask is None else (mask & m)
+    return df if mask is None else df[mask]
 
 def recommend(
     area: str | None = None,
@@ -56,42 +519,138 @@ def recommend(
     time_of_day: str | None = None,   # 옵션(스코어 튜닝용)
     transport: str | None = None,     # 옵션(스코어 튜닝용)
     df: pd.DataFrame | None = None,
+    index: RecommenderIndex | None = None,
+    topk: bool | None = None,
+    diversify: bool = False,
+    cache: bool = True,
 ) -> pd.DataFrame:
-    """간단 필터 + 랭크 기반 추천 결과"""
-    if df is None:
-        df = load_data()
-
-    q = df.copy()
-    if area:
-        q = q[q["areaNm"] == area]
-    if signgu:
-        q = q[q["signguNm"] == signgu]
-    if cat_l:
-        q = q[q["rlteCtgryLclsNm"] == cat_l]
-    if cat_m:
-        q = q[q["rlteCtgryMclsNm"] == cat_m]
-    if cat_s:
-        q = q[q["rlteCtgrySclsNm"] == cat_s]
-
-    # 기본 스코어 = (랭크가 낮을수록 가중치 높게)
-    if "rlteRank_num" in q.columns:
-        q = q.assign(score=1 / (q["rlteRank_num"].fillna(999).astype(float)))
+    """
+    간단 필터 + 랭크 기반 추천 결과.
+    (시도, 시군구, 대분류) 조합 질의는 스냅샷의 추천 큐브(cube.npz)에 있으면 조회 + 슬라이스로 답한다.
+    스냅샷 데이터를 쓰는 호출은 결과를 RecoCache(LRU)에 두고 재사용한다(cache=False로 끔).
+    diversify=True면 상위 top_n × DIVERSITY_POOL 후보를 시군구 라운드로빈(+중분류 감쇠)으로 재정렬한다.
+    index(RecommenderIndex)가 주어지면 posting list로 필터링하고 df는 무시한다.
+    df도 index도 없으면 캐시된 스냅샷(get_snapshot())과 그 인덱스를 쓴다.
+    topk=False면 부분 선택 대신 기존 전체 sort_values 경로를 쓴다(비교용, 기본은 USE_TOPK).
+    """
+    area, signgu, cat_l, cat_m, cat_s, time_of_day, transport = (
+        _norm(v) for v in (area, signgu, cat_l, cat_m, cat_s, time_of_day, transport)
+    )
+    snap = None
+    if index is None:
+        snap = get_snapshot() if df is None else _snapshot_of(df)
+        index = snap.index if snap is not None else None
+
+    # 큐브에 있는 조합이면 조회 + 슬라이스(점수 = 전역 기본 점수 × 시간/교통 배수)
+    use_cube = USE_CUBE and snap is not None and not diversify and topk is not False
+    if use_cube and not cat_m and not cat_s and snap.cube is not None:
+        rows = snap.cube.lookup(top_n, area=area, signgu=signgu, cat_l=cat_l)
+        if rows is not None:
+            _, base_scores, _ = index.ranking()
+            # 필요한 컬럼만 배열 take 로 모아 프레임을 한 번에 만든다(iloc/assign 거치지 않음)
+            cols = {c: index.df[c].array.take(rows) for c in RESULT_COLUMNS if c in index.df.columns}
+            cols["score"] = base_scores[rows] * _context_weight(time_of_day, transport)
+            return pd.DataFrame(cols, columns=[c for c in RESULT_COLUMNS if c in cols])
+
+    use_topk = USE_TOPK if topk is None else topk
+    # 스냅샷을 쓰는 호출만 캐시(버전을 알 수 있어야 nightly 갱신 때 자동 무효화)
+    key = None
+    k = top_n
+    if cache and snap is not None:
+        key = (
+            (str(snap.path), snap.version),
+            area, signgu, cat_l, cat_m, cat_s, time_of_day, transport,
+            top_n if diversify else None,   # 다양성 재정렬은 top_n마다 결과가 달라 따로 저장
+            use_topk,                       # 부분 선택/전체 정렬 비교 경로가 서로의 항목을 쓰지 않게
+        )
+        hit = _RECO_CACHE.get(key, top_n)
+        if hit is not None:
+            return hit
+        if not diversify:
+            k = max(top_n, RECO_CACHE_MIN_K)
+
+    if index is not None:
+        q = index.query(area=area, signgu=signgu, cat_l=cat_l, cat_m=cat_m, cat_s=cat_s)
     else:
-        q = q.assign(score=1.0)
+        q = _mask_filter(df, area, signgu, cat_l, cat_m, cat_s)
 
-    # (선택) 시간/교통수단 등에 따른 가벼운 가중치 예시
-    # 실제 로직은 추후 고도화
-    if time_of_day == "저녁":
-        q["score"] *= 1.05
-    if transport == "대중교통":
-        q["score"] *= 1.03
+    ranks = _rank_array(q)
+    scores = _score_array(q, ranks, time_of_day, transport)
 
     # 정렬 후 상위 N개
-    cols_order = [
-        "rlteTatsNm", "areaNm", "signguNm",
-        "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm",
-        "rlteRank_num", "score"
-    ]
-    existing = [c for c in cols_order if c in q.columns]
-    q = q.sort_values(["score", "rlteRank_num"], ascending=[False, True])
-    return q[existing].head(top_n).reset_index(drop=True)
+    if diversify:
+        order = _diversify_order(_topk_order(scores, ranks, k * DIVERSITY_POOL), q, scores, k)
+        q = q.iloc[order].assign(score=scores[order])
+    elif use_topk:
+        order = _topk_order(scores, ranks, k)
+        q = q.iloc[order].assign(score=scores[order])
+    else:
+        q = q.assign(score=scores)
+        sort_cols = [c for c in ["score", "rlteRank_num"] if c in q.columns]
+        q = q.sort_values(sort_cols, ascending=[False, True][:len(sort_cols)]).head(k)
+    existing = [c for c in RESULT_COLUMNS if c in q.columns]
+    result = q[existing].reset_index(drop=True)
+    if key is not None:
+        _RECO_CACHE.put(key, result, k)
+        return result.head(top_n).copy()
+    return result
+
+def _parse_intent(intent) -> tuple[dict, int, float]:
+    """Intent(dict 또는 pydantic 모델) → (필터, top_n, 시간/교통 가중치)"""
+    if hasattr(intent, "model_dump"):
+        intent = intent.model_dump()
+    filters = {k: (intent.get(k) or None) for k in FACET_COLS}
+    weight = _context_weight(intent.get("time_of_day"), intent.get("transport"))
+    return filters, intent.get("top_n") or 10, weight
+
+def recommend_many(
+    intents: list,
+    df: pd.DataFrame | None = None,
+    index: RecommenderIndex | None = None,
+    diversify: bool = False,
+) -> list[pd.DataFrame]:
+    """
+    여러 의도(app.chat.intent_parser 가 만든 Intent dict)를 한 번에 추천. 결과는 intents 순서대로.
+    전체 프레임의 점수/순위는 인덱스에 한 번만 계산해 두고, 같은 필터 키의 의도끼리 묶어
+    posting list 의 전역 순위 위치에서 argpartition 으로 가장 큰 top_n 만큼만 뽑는다.
+    시간/교통 가중치는 배수라 의도별로 점수에만 곱한다. 결과는 recommend() 와 같다.
+    """
+    if index is None:
+        if df is None:
+            index = get_snapshot().index
+        else:
+            index = _snapshot_index(df) or RecommenderIndex(df)
+    base = index.df
+    _, scores, pos = index.ranking()
+    existing = [c for c in RESULT_COLUMNS if c in base.columns or c == "score"]
+
+    parsed = [_parse_intent(it) for it in intents]
+    groups: dict[tuple, list[int]] = {}
+    for i, (filters, _, _) in enumerate(parsed):
+        groups.setdefault(tuple(filters.values()), []).append(i)
+
+    takes: list[np.ndarray | None] = [None] * len(intents)
+    for members in groups.values():
+        rows = index.rows(**parsed[members[0]][0])
+        if rows is None:
+            rows = np.arange(index.n_rows)
+        need = max(parsed[i][1] for i in members) * (DIVERSITY_POOL if diversify else 1)
+        if 0 < need < len(rows):
+            rows = rows[np.argpartition(pos[rows], need - 1)[:need]]
+        rows = rows[np.argsort(pos[rows])]
+        for i in members:
+            top_n = parsed[i][1]
+            if diversify:
+                takes[i] = _diversify_order(rows[:top_n * DIVERSITY_POOL], base, scores, top_n)
+            else:
+                takes[i] = rows[:top_n]
+
+    # 모든 결과 행을 한 번에 모은 뒤 의도별 구간으로 자른다(의도마다 iloc/assign 하지 않음)
+    sizes = np.array([len(t) for t in takes], dtype=np.int64)
+    flat = np.concatenate(takes) if takes else np.empty(0, dtype=np.int64)
+    weights = np.repeat([p[2] for p in parsed], sizes)
+    out = base.iloc[flat][[c for c in existing if c != "score"]].reset_index(drop=True)
+    out["score"] = scores[flat] * weights
+    out = out[existing]
+    bounds = np.concatenate([[0], np.cumsum(sizes)])
+    return [out.iloc[a:b].reset_index(drop=True) for a, b in zip(bounds[:-1], bounds[1:])]
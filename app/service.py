@@ -0,0 +1,429 @@
+# app/service.py
+"""
+Streamlit 과 분리된 추천 HTTP 서비스 (ASGI).
+  GET  /recommend?area=&signgu=&cat_l=&cat_m=&cat_s=&top_n=&time_of_day=&transport=&diversify=
+  POST /recommend   {"area": ..., ...}  또는  {"intents": [...]}  (recommend_many 일괄 처리)
+  GET  /facets?area=&signgu=
+  GET  /parse?msg=&llm=0|1   (POST {"msg": ...} 도 가능)
+  GET  /healthz, /metrics (Prometheus)
+
+app.recommender / app.chat 코드를 그대로 쓰고, 워커 프로세스마다 데이터·인덱스를 한 번 올린다.
+백그라운드 작업이 refresh_interval 초마다 파일 버전을 확인해 새 스냅샷을 인덱스까지 만든 뒤
+참조 하나만 바꿔 끼우므로(진행 중인 요청은 이전 스냅샷으로 끝남) 갱신 중에도 멈추지 않는다.
+
+ASGI 앱이라 uvicorn 등으로도 띄울 수 있고(app.service:app), 의존성 없이 쓰는 내장 asyncio
+HTTP/1.1 서버(serve)는 미리 바인드한 소켓을 fork 한 워커들이 나눠 받는 멀티 프로세스를 지원한다.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import math
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from app import metrics
+
+RECO_KEYS = ["area", "signgu", "cat_l", "cat_m", "cat_s", "time_of_day", "transport"]
+MAX_BODY = 1 << 20
+MAX_TOP_N = 500
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _records(df) -> List[Dict[str, Any]]:
+    """DataFrame → JSON 레코드 (NaN → null)"""
+    rows = df.to_dict("records")
+    for row in rows:
+        for k, v in row.items():
+            if isinstance(v, float) and math.isnan(v):
+                row[k] = None
+    return rows
+
+
+def _flag(value) -> bool:
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+def _top_n(value) -> int:
+    try:
+        n = int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"top_n must be an integer: {value!r}")
+    if not 1 <= n <= MAX_TOP_N:
+        raise HTTPError(400, f"top_n must be in 1..{MAX_TOP_N}")
+    return n
+
+
+def _text(params: Dict[str, Any], key: str) -> Optional[str]:
+    """필터 값: 없거나 빈 값은 None, 문자열이 아니면 400"""
+    value = params.get(key)
+    if value is None or value == "":
+        return None
+    if not isinstance(value, str):
+        raise HTTPError(400, f"{key} must be a string")
+    return value
+
+
+def _intents(value) -> List[Dict[str, Any]]:
+    """POST intents 검증: 객체 목록, 필터는 문자열, top_n 은 단건 요청과 같은 범위(_top_n)"""
+    if not isinstance(value, list):
+        raise HTTPError(400, "intents must be a list")
+    out = []
+    for i, intent in enumerate(value):
+        if not isinstance(intent, dict):
+            raise HTTPError(400, f"intents[{i}] must be an object")
+        try:
+            clean = {k: _text(intent, k) for k in RECO_KEYS}
+            clean["top_n"] = _top_n(10 if intent.get("top_n") is None else intent["top_n"])
+        except HTTPError as e:
+            raise HTTPError(400, f"intents[{i}]: {e.message}")
+        out.append(clean)
+    return out
+
+
+class RecoService:
+    """ASGI 앱. data_path=None 이면 app.recommender.DATA_PATH"""
+
+    def __init__(self, data_path: str | Path | None = None, refresh_interval: float = 30.0):
+        self.data_path = data_path
+        self.refresh_interval = refresh_interval
+        self.snapshot = None
+        self._refresher: Optional[asyncio.Task] = None
+
+    # ---------- 스냅샷 ----------
+    def load(self):
+        """현재 데이터 버전을 인덱스까지 준비해 교체(버전이 같으면 그대로)"""
+        from app.recommender import get_snapshot
+        snap = get_snapshot(self.data_path, warm=True)
+        if snap is not self.snapshot:
+            self.snapshot = snap
+        return snap
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                with metrics.span("service.refresh"):
+                    await asyncio.to_thread(self.load)
+            except Exception as e:  # 파일 교체 중 등 — 다음 주기에 다시 시도, 기존 스냅샷 유지
+                print(f"[service] refresh failed: {e}")
+
+    async def startup(self):
+        if self.snapshot is None:
+            await asyncio.to_thread(self.load)
+        if self.refresh_interval and self._refresher is None:
+            self._refresher = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def shutdown(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+
+    def _snap(self):
+        if self.snapshot is None:
+            raise HTTPError(503, "data not loaded")
+        return self.snapshot
+
+    # ---------- 핸들러 ----------
+    async def recommend(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        from app.recommender import recommend, recommend_many
+        snap = self._snap()
+        diversify = _flag(params.get("diversify", False))
+        loop = asyncio.get_running_loop()
+        # 계산은 실행기 스레드에서 — 큰 일괄 요청이 이벤트 루프(/healthz 등 다른 연결)를 막지 않게
+        if "intents" in params:
+            intents = _intents(params["intents"])
+
+            def run_many():
+                with metrics.span("service.recommend_many"):
+                    return recommend_many(intents, df=snap.df, diversify=diversify)
+            res = await loop.run_in_executor(None, run_many)
+            return {"version": snap.version, "results": [_records(r) for r in res]}
+        kwargs = {k: _text(params, k) for k in RECO_KEYS}
+        top_n = _top_n(params.get("top_n", 10))
+
+        def run():
+            with metrics.span("service.recommend"):
+                return recommend(**kwargs, top_n=top_n, df=snap.df, diversify=diversify)
+        res = await loop.run_in_executor(None, run)
+        return {"version": snap.version, "items": _records(res)}
+
+    def facets(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        snap = self._snap()
+        with metrics.span("service.facets"):
+            res = snap.catalog.query(params.get("area") or None, params.get("signgu") or None)
+        return {"version": snap.version, **res}
+
+    async def parse(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        from app.chat.intent_parser import parse_intent, rule_parse
+        msg = params.get("msg")
+        if not msg:
+            raise HTTPError(400, "msg is required")
+        with metrics.span("service.parse"):
+            if _flag(params.get("llm", "0")):
+                # LLM 대기(시간 제한 있음)는 이벤트 루프 밖에서
+                intent = await asyncio.to_thread(parse_intent, msg)
+            else:
+                intent = rule_parse(msg)
+        return {"intent": intent}
+
+    def health(self) -> Dict[str, Any]:
+        snap = self.snapshot
+        return {
+            "status": "ok" if snap is not None else "loading",
+            "version": snap.version if snap else None,
+            "rows": len(snap.df) if snap else 0,
+            "pid": os.getpid(),
+        }
+
+    async def handle(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[int, str, bytes]:
+        if path == "/metrics":
+            return 200, "text/plain; version=0.0.4", metrics.to_prometheus().encode("utf-8")
+        routes = {
+            "/recommend": ("GET", "POST"), "/facets": ("GET",), "/parse": ("GET", "POST"), "/healthz": ("GET",),
+        }
+        if path not in routes:
+            raise HTTPError(404, f"not found: {path}")
+        if method not in routes[path]:
+            raise HTTPError(405, f"method not allowed: {method}")
+        if path == "/recommend":
+            body = await self.recommend(params)
+        elif path == "/facets":
+            body = self.facets(params)
+        elif path == "/parse":
+            body = await self.parse(params)
+        else:
+            body = self.health()
+        return 200, "application/json", json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+    # ---------- ASGI ----------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                event = await receive()
+                if event["type"] == "lifespan.startup":
+                    try:
+                        await self.startup()
+                    except Exception as e:
+                        await send({"type": "lifespan.startup.failed", "message": str(e)})
+                        return
+                    await send({"type": "lifespan.startup.complete"})
+                elif event["type"] == "lifespan.shutdown":
+                    await self.shutdown()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            event = await receive()
+            body += event.get("body", b"")
+            if len(body) > MAX_BODY:
+                break
+            if not event.get("more_body"):
+                break
+        try:
+            params = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode("utf-8")).items()}
+            if len(body) > MAX_BODY:
+                raise HTTPError(413, "body too large")
+            if body:
+                try:
+                    data = json.loads(body)
+                except ValueError:
+                    raise HTTPError(400, "invalid JSON body")
+                if not isinstance(data, dict):
+                    raise HTTPError(400, "JSON body must be an object")
+                params.update(data)
+            status, ctype, payload = await self.handle(scope["method"], scope["path"], params)
+        except HTTPError as e:
+            status, ctype = e.status, "application/json"
+            payload = json.dumps({"error": e.message}, ensure_ascii=False).encode("utf-8")
+        except Exception as e:
+            status, ctype = 500, "application/json"
+            payload = json.dumps({"error": f"{type(e).__name__}: {e}"}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start", "status": status,
+            "headers": [(b"content-type", ctype.encode()), (b"content-length", str(len(payload)).encode())],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+
+def create_app(data_path: str | Path | None = None, refresh_interval: float = 30.0) -> RecoService:
+    return RecoService(data_path, refresh_interval)
+
+
+app = create_app()   # uvicorn app.service:app
+
+
+# ---------- 내장 asyncio HTTP/1.1 서버 ----------
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, headers, body: bytes, keep: bool):
+    resp = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}"]
+    resp += [f"{k.decode()}: {v.decode()}" for k, v in headers]
+    resp.append(f"connection: {'keep-alive' if keep else 'close'}")
+    writer.write(("\r\n".join(resp) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def _serve_connection(asgi, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """keep-alive 를 지원하는 최소 HTTP/1.1 → ASGI 어댑터 (Content-Length 본문만)"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                return
+            headers = []
+            for line in lines[1:]:
+                if ":" in line:
+                    k, v = line.split(":", 1)
+                    headers.append((k.strip().lower().encode("latin-1"), v.strip().encode("latin-1")))
+            hdr = dict(headers)
+            try:
+                length = int(hdr.get(b"content-length", b"0") or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                # 본문 경계를 알 수 없어 연결을 이어 쓸 수 없다 — 400 으로 답하고 닫는다
+                payload = json.dumps({"error": "invalid Content-Length"}).encode("utf-8")
+                await _write_response(writer, 400, [(b"content-type", b"application/json"),
+                                                    (b"content-length", str(len(payload)).encode())], payload, False)
+                return
+            try:
+                body = await reader.readexactly(length) if 0 < length <= MAX_BODY + 1 else b""
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return          # 본문 도중에 끊긴 연결 — 답할 곳이 없으니 조용히 닫는다
+            url = urlsplit(target)
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": version.split("/")[-1],
+                "method": method.upper(), "path": url.path, "raw_path": url.path.encode(),
+                "query_string": url.query.encode("latin-1"), "headers": headers,
+                "client": writer.get_extra_info("peername"), "server": writer.get_extra_info("sockname"),
+            }
+            if length > MAX_BODY + 1:
+                body = b"x" * (MAX_BODY + 1)       # 읽지 않고 413 으로 끝냄
+            sent = False
+
+            async def receive():
+                nonlocal sent
+                if sent:
+                    return {"type": "http.disconnect"}
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            out: Dict[str, Any] = {"headers": [], "body": b""}
+
+            async def send(event):
+                if event["type"] == "http.response.start":
+                    out["status"] = event["status"]
+                    out["headers"] = event.get("headers", [])
+                elif event["type"] == "http.response.body":
+                    out["body"] += event.get("body", b"")
+
+            await asgi(scope, receive, send)
+            keep = version == "HTTP/1.1" and hdr.get(b"connection", b"").lower() != b"close" \
+                and length <= MAX_BODY + 1
+            await _write_response(writer, out.get("status", 500), out["headers"], out["body"], keep)
+            if not keep:
+                return
+    finally:
+        writer.close()
+
+
+class _Lifespan:
+    """ASGI lifespan 프로토콜로 startup/shutdown 을 한 번씩 보낸다"""
+
+    def __init__(self, asgi):
+        self.asgi = asgi
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _send(self, event):
+        await self._outbox.put(event)
+
+    async def _event(self, phase: str):
+        await self._inbox.put({"type": f"lifespan.{phase}"})
+        event = await self._outbox.get()
+        if event["type"].endswith("failed"):
+            raise RuntimeError(event.get("message", f"lifespan {phase} failed"))
+
+    async def startup(self):
+        self._task = asyncio.get_running_loop().create_task(
+            self.asgi({"type": "lifespan"}, self._inbox.get, self._send))
+        await self._event("startup")
+
+    async def shutdown(self):
+        if self._task is not None and not self._task.done():
+            await self._event("shutdown")
+
+
+async def serve_socket(asgi, sock: socket.socket, ready=None):
+    """이미 바인드된 소켓에서 ASGI 앱을 서비스(워커 하나)"""
+    lifespan = _Lifespan(asgi)
+    await lifespan.startup()
+    server = await asyncio.start_server(lambda r, w: _serve_connection(asgi, r, w), sock=sock)
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await lifespan.shutdown()
+
+
+def bind(host: str = "127.0.0.1", port: int = 8000) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(512)
+    sock.setblocking(False)
+    return sock
+
+
+def _worker(sock: socket.socket, data_path, refresh_interval: float):
+    try:
+        asyncio.run(serve_socket(create_app(data_path, refresh_interval), sock))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 1,
+          data_path: str | Path | None = None, refresh_interval: float = 30.0):
+    """
+    workers > 1 이면 소켓을 먼저 바인드하고 fork 한 워커들이 같은 소켓에서 accept 한다(POSIX).
+    각 워커는 자기 프로세스에서 데이터·인덱스를 한 번 올린다.
+    """
+    sock = bind(host, port)
+    print(f"[service] listening on http://{host}:{sock.getsockname()[1]} (workers={workers})")
+    if workers <= 1 or not hasattr(os, "fork"):
+        _worker(sock, data_path, refresh_interval)
+        return
+    import multiprocessing as mp
+    ctx = mp.get_context("fork")
+    procs = [ctx.Process(target=_worker, args=(sock, data_path, refresh_interval), daemon=True) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
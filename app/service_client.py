@@ -0,0 +1,103 @@
+# app/service_client.py
+"""
+추천 서비스(app/service.py) 클라이언트.
+RECO_SERVICE_URL 이 설정돼 있으면 Streamlit 앱이 HTTP 로 서비스를 부르고,
+없으면 같은 프로세스에서 app.recommender / app.chat 을 직접 호출한다(기존 동작).
+"""
+from __future__ import annotations
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+SERVICE_TIMEOUT = 5.0
+# 로컬/사내 서비스용 — 수집기 세션(app.http_client)의 공개 API용 재시도·백오프는 쓰지 않는다
+SERVICE_POOL_MAXSIZE = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """서비스 클라이언트 전용 Session (keep-alive 재사용, 재시도 없음 — 실패는 바로 호출부로)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=SERVICE_POOL_MAXSIZE, max_retries=0)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                s.headers.update({"Accept": "application/json"})
+                _session = s
+    return _session
+
+
+class ServiceClient:
+    def __init__(self, base_url: str, timeout: float = SERVICE_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        params = {k: v for k, v in params.items() if v is not None}
+        r = get_session().get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def _post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        r = get_session().post(f"{self.base_url}{path}", json=body, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def recommend(self, area=None, signgu=None, cat_l=None, cat_m=None, cat_s=None, top_n: int = 10,
+                  time_of_day=None, transport=None, diversify: bool = False) -> pd.DataFrame:
+        data = self._get("/recommend", dict(
+            area=area, signgu=signgu, cat_l=cat_l, cat_m=cat_m, cat_s=cat_s, top_n=top_n,
+            time_of_day=time_of_day, transport=transport, diversify=int(bool(diversify)),
+        ))
+        return pd.DataFrame(data["items"])
+
+    def recommend_many(self, intents: List[Dict[str, Any]], diversify: bool = False) -> List[pd.DataFrame]:
+        data = self._post("/recommend", {"intents": intents, "diversify": bool(diversify)})
+        return [pd.DataFrame(r) for r in data["results"]]
+
+    def facets(self, area: Optional[str] = None, signgu: Optional[str] = None) -> Dict[str, Any]:
+        data = self._get("/facets", {"area": area, "signgu": signgu})
+        data.pop("version", None)
+        return data
+
+    def parse(self, msg: str, llm: bool = True) -> Dict[str, Any]:
+        return self._get("/parse", {"msg": msg, "llm": int(bool(llm))})["intent"]
+
+    def health(self) -> Dict[str, Any]:
+        return self._get("/healthz", {})
+
+
+class LocalClient:
+    """서비스 없이 같은 프로세스에서 바로 계산(ServiceClient 와 같은 인터페이스)"""
+
+    def recommend(self, **kwargs) -> pd.DataFrame:
+        from app.recommender import recommend
+        return recommend(**kwargs)
+
+    def recommend_many(self, intents, diversify: bool = False):
+        from app.recommender import recommend_many
+        return recommend_many(intents, diversify=diversify)
+
+    def facets(self, area: Optional[str] = None, signgu: Optional[str] = None) -> Dict[str, Any]:
+        from app.recommender import facets
+        return facets(area=area, signgu=signgu)
+
+    def parse(self, msg: str, llm: bool = True) -> Dict[str, Any]:
+        from app.chat.intent_parser import parse_intent, rule_parse
+        return parse_intent(msg) if llm else rule_parse(msg)
+
+
+def get_client():
+    """RECO_SERVICE_URL 이 있으면 ServiceClient, 없으면 LocalClient"""
+    url = os.getenv("RECO_SERVICE_URL")
+    return ServiceClient(url) if url else LocalClient()
@@ -1,33 +1,30 @@
 # app/ui_app.py
-import pandas as pd
 import streamlit as st
-from app.recommender import recommend, facets, load_data
+from app.service_client import get_client
 
 st.set_page_config(page_title="수도권 연관 관광지 추천", page_icon="🧭", layout="wide")
 
-# 데이터 로딩
-@st.cache_data
-def load_final():
-    try:
-        return pd.read_parquet("data/processed/final_pois.parquet")
-    except Exception as e:
-        st.error(f"데이터를 읽는 중 오류: {e}")
-        return pd.DataFrame()
-
-df = load_final()
+# RECO_SERVICE_URL 이 있으면 추천 서비스, 없으면 프로세스 공용 캐시(파일이 갱신되면 자동으로 다시 읽음)
+client = get_client()
 
 st.title("🧭 수도권 연관 관광지 추천 데모")
 st.caption("TarRlteTarService1 결과를 정제한 데이터 기반 간단 추천")
 
 # 필터
-areas, signgus, cats_l, cats_m, cats_s = facets(df)
+try:
+    f = client.facets()
+except Exception as e:
+    st.error(f"데이터를 읽는 중 오류: {e}")
+    st.stop()
 col1, col2, col3 = st.columns(3)
 with col1:
-    area = st.selectbox("지역", sorted(areas))
+    area = st.selectbox("지역", f["areas"])
+# 선택한 지역 아래로 드릴다운(카탈로그 조회라 전체 스캔 없음)
+sub = client.facets(area=area)
 with col2:
-    signgu = st.selectbox("시군구(선택)", ["(전체)"] + sorted(signgus))
+    signgu = st.selectbox("시군구(선택)", ["(전체)"] + sub["signgus"])
 with col3:
-    cat_l = st.selectbox("대분류", ["(전체)"] + sorted(cats_l))
+    cat_l = st.selectbox("대분류", ["(전체)"] + sub["lcats"])
 
 col4, col5, col6 = st.columns(3)
 with col4:
@@ -49,7 +46,7 @@ if st.button("추천 보기"):
     if transport != "(무관)":
         kwargs["transport"] = transport
 
-    res = recommend(**kwargs)
+    res = client.recommend(**kwargs)
     if res.empty:
         st.warning("조건에 맞는 결과가 없습니다.")
     else:
@@ -4,80 +4,110 @@ import os
 import streamlit as st
 import pandas as pd
 
-from app.recommender import recommend, facets, load_data
-from app.chat.intent_parser import parse_intent, rule_parse
-from app.chat.nlg import summarize_recos, followups
+from app import metrics
+from app.service_client import get_client
+from app.chat.nlg import stream_summary, stream_followups
+from app.planner import PLAN_CANDIDATES, plan_itinerary
 
 st.set_page_config(page_title="수도권 여행 챗봇", page_icon="🗺️", layout="wide")
 
-@st.cache_resource
-def _data():
-    try:
-        df = load_data()
-    except Exception as e:
-        st.error(f"정제 데이터 로드 실패: {e}")
-        df = pd.DataFrame()
-    return df
+# RECO_SERVICE_URL 이 있으면 추천 서비스(app/service.py)를 부르고,
+# 없으면 프로세스 공용 캐시(get_data) — 인덱스도 함께 캐시되고, nightly 갱신 시 자동 재로딩
+client = get_client()
+
+@metrics.timed("chat.turn")
+def _answer(user_msg: str, use_llm: bool, itinerary: bool = False):
+    # 응답 말풍선을 먼저 열어 두고 단계 진행을 보여준 뒤, 요약은 스트리밍으로 채운다
+    with st.chat_message("assistant"):
+        status = st.empty()
+        status.caption("요청을 이해하는 중…")
+
+        # 파싱 (LLM → 부족분 rule 보완 / 규칙만)
+        with metrics.span("chat.parse"):
+            intent = client.parse(user_msg, llm=use_llm)
+            parse_mode = "LLM+Rule" if use_llm else "RuleOnly"
+
+        # 의도 표시(디버그)
+        with st.expander(f"파싱된 의도 ({parse_mode})", expanded=False):
+            st.json(intent)
+
+        # 추천
+        status.caption("추천을 고르는 중…")
+        with metrics.span("chat.recommend"):
+            res = client.recommend(
+                area=intent.get("area"),
+                signgu=intent.get("signgu"),
+                cat_l=intent.get("cat_l"),
+                cat_m=intent.get("cat_m"),
+                cat_s=intent.get("cat_s"),
+                # 일정 모드는 후보를 넉넉히(시군구 다양성 적용) 받아 시간 예산 안에서 고른다
+                top_n=PLAN_CANDIDATES if itinerary else intent.get("top_n") or 10,
+                time_of_day=intent.get("time_of_day"),
+                transport=intent.get("transport"),
+                diversify=itinerary,
+            )
+        if itinerary:
+            with metrics.span("chat.plan"):
+                res = plan_itinerary(res, intent.get("time_of_day"), intent.get("transport"))
+        status.empty()
+
+        had_results = not res.empty
+        if had_results:
+            # 머리말·항목이 만들어지는 대로 바로 그린다
+            with metrics.span("chat.summarize"):
+                # 일정 모드는 고른 방문지 전부를 요약
+                st.write_stream(stream_summary({**intent, "top_n": len(res)} if itinerary else intent, res))
+            st.dataframe(res, use_container_width=True)
+        else:
+            st.warning("조건에 맞는 결과가 없었어요. 조건을 조금 완화해 볼게요!")
+
+        # 후속 질문(대화형 느낌 강화)
+        with metrics.span("chat.followups"):
+            st.write_stream(stream_followups(intent, had_results))
+
+def _render_metrics(box):
+    stats = metrics.snapshot()
+    if not stats:
+        return
+    with box:
+        st.caption("단계별 지연 (ms, 최근 샘플 기준)")
+        st.dataframe(
+            pd.DataFrame.from_dict(stats, orient="index")[["count", "p50_ms", "p95_ms", "p99_ms"]],
+            use_container_width=True,
+        )
+        st.download_button("metrics (Prometheus)", metrics.to_prometheus(), file_name="metrics.prom")
 
 def main():
     st.title("🗺️ 수도권 여행 챗봇 (LLM + 규칙)")
     st.caption("자연스러운 대화로 취향 기반 추천을 도와드려요.")
 
-    df = _data()
-    areas, signgus, cats_l, cats_m, cats_s = facets(df if not df.empty else None)
+    try:
+        f = client.facets()
+    except Exception as e:
+        st.error(f"정제 데이터 로드 실패: {e}")
+        f = {"areas": [], "lcats": [], "count": 0}
 
     with st.sidebar:
         st.subheader("옵션")
         use_llm = st.toggle("LLM 의도 파싱 사용", value=True, help="끄면 규칙 기반 파싱만 사용")
+        itinerary = st.toggle("일정 모드", value=False, help="시간대·이동수단에 맞춰 방문 순서와 시각까지 짜기")
         st.write("데이터 현황")
         st.code(f"""
-rows={len(df)}
-areas_sample={areas[:5]}
-catsL_sample={cats_l[:5]}
+rows={f["count"]}
+areas_sample={f["areas"][:5]}
+catsL_sample={f["lcats"][:5]}
         """.strip())
+        # 지연 표는 이번 턴 답변 뒤에 채운다(자리만 먼저 잡아 둠)
+        metrics_box = st.container()
 
     user_msg = st.chat_input("예) 서울 야간 전시 3곳만, 대중교통")
     if user_msg:
         with st.chat_message("user"):
             st.write(user_msg)
 
-        # 파싱
-        if use_llm:
-            intent = parse_intent(user_msg)  # LLM → 부족분 rule 보완
-            parse_mode = "LLM+Rule"
-        else:
-            intent = rule_parse(user_msg)
-            parse_mode = "RuleOnly"
-
-        # 의도 표시(디버그)
-        with st.expander(f"파싱된 의도 ({parse_mode})", expanded=False):
-            st.json(intent)
-
-        # 추천
-        res = recommend(
-            area=intent.get("area"),
-            signgu=intent.get("signgu"),
-            cat_l=intent.get("cat_l"),
-            cat_m=intent.get("cat_m"),
-            cat_s=intent.get("cat_s"),
-            top_n=intent.get("top_n") or 10,
-            time_of_day=intent.get("time_of_day"),
-            transport=intent.get("transport"),
-            df=df if not df.empty else None,
-        )
-
-        had_results = not res.empty
-
-        with st.chat_message("assistant"):
-            if had_results:
-                st.write(summarize_recos(intent, res))
-                st.dataframe(res, use_container_width=True)
-            else:
-                st.warning("조건에 맞는 결과가 없었어요. 조건을 조금 완화해 볼게요!")
+        _answer(user_msg, use_llm, itinerary)
 
-            # 후속 질문(대화형 느낌 강화)
-            for q in followups(intent, had_results):
-                st.markdown(f"- {q}")
+    _render_metrics(metrics_box)
 
 if __name__ == "__main__":
     main()
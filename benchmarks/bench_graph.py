@@ -0,0 +1,56 @@
+# benchmarks/bench_graph.py
+"""
+연관 관광지 그래프: 구축 시간, CSR 크기, similar()/ppr() 질의 지연.
+
+사용: PYTHONPATH=. python benchmarks/bench_graph.py --rows 1000000 [--json out.json]
+"""
+from __future__ import annotations
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.graph import GraphBuilder
+from benchmarks.bench_storage import _best_ms
+from benchmarks.synth import make_final
+
+
+def run(rows: int, repeat: int = 5, chunksize: int = 200_000) -> dict:
+    df = make_final(rows)
+    t0 = time.perf_counter()
+    builder = GraphBuilder()
+    for start in range(0, len(df), chunksize):
+        builder.add(df.iloc[start:start + chunksize])
+    g = builder.build()
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    rng = np.random.default_rng(1)
+    sources = g.names[np.flatnonzero(np.diff(g.indptr) > 0)]
+    one = str(rng.choice(sources))
+    many = [str(s) for s in rng.choice(sources, 5, replace=False)]
+    return {
+        "rows": rows, "nodes": g.n_nodes, "edges": g.n_edges,
+        "csr_mb": round((g.indptr.nbytes + g.indices.nbytes + g.weights.nbytes) / 2**20, 2),
+        "build_ms": round(build_ms, 1),
+        "similar_ms": round(_best_ms(lambda: g.similar(one, 10), repeat), 2),
+        "ppr_1seed_ms": round(_best_ms(lambda: g.ppr(one, 10), repeat), 2),
+        "ppr_5seed_ms": round(_best_ms(lambda: g.ppr(many, 10), repeat), 2),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="연관 관광지 그래프 벤치마크")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+    res = run(args.rows, args.repeat)
+    print(json.dumps(res, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
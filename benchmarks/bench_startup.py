@@ -0,0 +1,95 @@
+# benchmarks/bench_startup.py
+"""
+CLI/모듈 시작 시간 리포트.
+- 모듈별 import 시간: `python -X importtime -c "import X"` 를 새 인터프리터에서 돌려 누적 시간 상위 항목 집계
+- CLI 한 번 실행 wall time(인터프리터 기동 포함)
+
+사용: PYTHONPATH=. python benchmarks/bench_startup.py [--repeat 5] [--top 8] [--json out.json]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODULES = ["app.recommender", "app.chat.intent_parser", "app.query_snapshot", "app.config", "app.service"]
+CLIS = {
+    "parse_intent": ["scripts/parse_intent.py", "--msg", "서울 야간 전시 3곳만, 대중교통"],
+    "try_recommend": ["scripts/try_recommend.py", "--area", "서울특별시", "--top", "5"],
+    "try_recommend(pandas)": ["scripts/try_recommend.py", "--area", "서울특별시", "--top", "5", "--no-snapshot"],
+}
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    return env
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, float, float]]:
+    """-X importtime 출력 → [(모듈, self_ms, cumulative_ms)] (import 순서)"""
+    out = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        out.append((name.strip(), int(self_us) / 1000, int(cum_us) / 1000))
+    return out
+
+
+def import_report(module: str, top: int = 8) -> dict:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=_env())
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed"}
+    rows = parse_importtime(proc.stderr)
+    # 인터프리터 기동(site 및 .pth) 구간은 빼고 대상 모듈이 끌어온 것만
+    starts = [i for i, (name, _, _) in enumerate(rows) if name == "site"]
+    rows = rows[starts[-1] + 1:] if starts else rows
+    total = next((cum for name, _, cum in reversed(rows) if name == module), 0.0)
+    # 누적 시간이 큰 하위 모듈
+    heavy = sorted(((name, cum) for name, _, cum in rows if name != module), key=lambda r: -r[1])[:top]
+    return {"total_ms": round(total, 2), "heavy": [(n, round(ms, 2)) for n, ms in heavy]}
+
+
+def cli_ms(argv: list[str], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *argv], capture_output=True, env=_env())
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000, 2)
+
+
+def run(repeat: int = 5, top: int = 8) -> dict:
+    return {
+        "python_startup_ms": cli_ms(["-c", "pass"], repeat),
+        "imports": {m: import_report(m, top) for m in MODULES},
+        "cli_ms": {name: cli_ms(argv, repeat) for name, argv in CLIS.items()},
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="CLI/모듈 시작 시간 리포트")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=8)
+    ap.add_argument("--json", default=None)
+    args = ap.parse_args()
+    res = run(args.repeat, args.top)
+    print(f"python -c pass: {res['python_startup_ms']} ms")
+    for m, r in res["imports"].items():
+        print(f"\nimport {m}: {r.get('total_ms', r.get('error'))} ms")
+        for name, ms in r.get("heavy", []):
+            print(f"    {ms:>9.2f}  {name}")
+    print()
+    for name, ms in res["cli_ms"].items():
+        print(f"{name:<24} {ms:>9.2f} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(res, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_storage.py
+"""
+final_pois 저장 방식 비교: 문자열(object/str) vs dictionary 인코딩(category).
+- Parquet 파일 크기, load_data() 시간, 메모리(deep), recommend() 필터 지연
+
+사용: PYTHONPATH=. python benchmarks/bench_storage.py --rows 1000000 [--json out.json]
+"""
+from __future__ import annotations
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from app.recommender import CATEGORY_COLS, RECO_COLUMNS, load_data, recommend
+from benchmarks.synth import make_final
+
+QUERIES = [
+    dict(area="서울특별시"),
+    dict(area="경기도", cat_l="음식"),
+    dict(area="인천광역시", signgu="중구", cat_l="관광지"),
+]
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run(rows: int, repeat: int = 5) -> dict:
+    base = make_final(rows)
+    out = {"rows": rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_path = Path(tmp) / "plain.parquet"
+        cat_path = Path(tmp) / "category.parquet"
+        base.to_parquet(plain_path, index=False)
+        encoded = base.copy()
+        for c in CATEGORY_COLS:
+            if c in encoded.columns:
+                encoded[c] = encoded[c].astype("category")
+        encoded.to_parquet(cat_path, index=False)
+
+        variants = {
+            "plain": lambda: load_data(plain_path, categorical=False),
+            "category": lambda: load_data(cat_path),
+            "category+columns": lambda: load_data(cat_path, columns=RECO_COLUMNS),
+        }
+        for name, loader in variants.items():
+            df = loader()
+            res = {
+                "file_mb": round((cat_path if name != "plain" else plain_path).stat().st_size / 2**20, 2),
+                "load_ms": round(_best_ms(loader, repeat), 2),
+                "memory_mb": round(df.memory_usage(deep=True).sum() / 2**20, 2),
+            }
+            for q in QUERIES:
+                key = "recommend[" + ",".join(f"{k}={v}" for k, v in q.items()) + "]_ms"
+                res[key] = round(_best_ms(lambda: recommend(df=df, top_n=20, **q), repeat), 2)
+            out[name] = res
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="object vs category 저장 비교")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+    res = run(args.rows, args.repeat)
+    print(json.dumps(res, ensure_ascii=False, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
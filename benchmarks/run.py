@@ -0,0 +1,173 @@
+# benchmarks/run.py
+"""
+합성 데이터 벤치마크 스위트: ingest(raw 쓰기/읽기) → clean → refine → build → load_data → facets → recommend(+큐브) → rule_parse.
+행 수별로 각 단계의 최단 시간(ms)을 재서 JSON으로 남기고, 두 결과 파일을 비교할 수 있다.
+
+사용:
+  PYTHONPATH=. python benchmarks/run.py --rows 10000 100000 [--repeat 3] [--out benchmarks/results/]
+  PYTHONPATH=. python benchmarks/run.py --compare old.json new.json
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app import raw_store
+from app.chat.intent_parser import build_matcher, rule_parse
+from app.facet_catalog import FacetCatalog
+from app.reco_cube import CUBE_PATH, RecoCube
+from app.recommender import (
+    RecommenderIndex, arrow_path, clear_snapshots, data_version, get_snapshot, load_data, recommend, write_arrow,
+)
+from benchmarks.bench_storage import _best_ms
+from benchmarks.synth import MESSAGES, make_raw
+from scripts.build_pois import build
+from scripts.clean_pois import clean
+from scripts.refine_pois import refine
+
+RESULTS_DIR = Path("benchmarks/results")
+RECO_QUERIES = [
+    ({}, 10),
+    ({"area": "서울특별시"}, 10),
+    ({"area": "경기도", "cat_l": "음식"}, 10),
+    ({"area": "인천광역시", "signgu": "중구", "cat_l": "관광지"}, 5),
+    ({"cat_m": "문화관광", "time_of_day": "저녁", "transport": "대중교통"}, 50),
+    ({"area": "서울특별시"}, 200),
+]
+PAGE = 1000
+
+
+def _quiet(fn):
+    """refine/build 의 진행 로그를 숨긴 채 실행"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_rows(rows: int, repeat: int = 3, seed: int = 0) -> dict:
+    raw = make_raw(rows, seed)
+    res: dict = {"rows": len(raw)}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src = tmp / raw_store.POIS_JSONL
+        items = raw.to_dict("records")
+
+        def ingest_write():
+            src.unlink(missing_ok=True)
+            for start in range(0, len(items), PAGE):
+                raw_store.append_page(src, items[start:start + PAGE])
+
+        res["ingest_write_ms"] = _best_ms(ingest_write, repeat)
+        res["ingest_read_ms"] = _best_ms(lambda: sum(len(c) for c in raw_store.iter_chunks(src, 50_000)), repeat)
+
+        res["clean_ms"] = _best_ms(lambda: clean(raw), repeat)
+        cleaned = clean(raw)
+        res["refine_ms"] = _best_ms(_quiet(lambda: refine(cleaned)), repeat)
+        final = _quiet(lambda: refine(cleaned))()
+        res["build_ms"] = _best_ms(_quiet(lambda: build(src, tmp / "final_pois", chunksize=50_000)), repeat)
+
+        path = tmp / "final_pois.parquet"
+        final.to_parquet(path, index=False)
+        res["final_rows"] = len(final)
+        res["load_data_ms"] = _best_ms(lambda: load_data(path, mmap=False), repeat)
+        df = load_data(path, mmap=False)
+        write_arrow(df, arrow_path(path), data_version(path))
+        res["load_data_mmap_ms"] = _best_ms(lambda: load_data(path), repeat)
+
+        res["facets_build_ms"] = _best_ms(lambda: FacetCatalog.build(df), repeat)
+        catalog = FacetCatalog.build(df)
+        res["facets_query_ms"] = _best_ms(lambda: [catalog.query(a) for a in [None] + catalog.areas()], repeat)
+
+        res["index_build_ms"] = _best_ms(lambda: RecommenderIndex(df), repeat)
+        index = RecommenderIndex(df)
+        for filters, top_n in RECO_QUERIES:
+            name = ",".join(f"{k}={v}" for k, v in filters.items()) or "all"
+            res[f"recommend[{name};top{top_n}]_ms"] = _best_ms(lambda: recommend(index=index, top_n=top_n, **filters), repeat)
+
+        # 추천 큐브 사이드카: 있는 조합은 조회 + 슬라이스, 없는 조합(cat_m 등)은 라이브 계산
+        res["cube_build_ms"] = _best_ms(lambda: RecoCube.build(index, data_version(path)), repeat)
+        RecoCube.build(index, data_version(path)).save(path.parent / CUBE_PATH.name)
+        snap = get_snapshot(path).warm()
+        for filters, top_n in RECO_QUERIES:
+            name = ",".join(f"{k}={v}" for k, v in filters.items()) or "all"
+            res[f"recommend_cube[{name};top{top_n}]_ms"] = _best_ms(
+                lambda: recommend(df=snap.df, top_n=top_n, cache=False, **filters), repeat)
+        clear_snapshots()
+
+        matcher = build_matcher(catalog.signgus())
+        msgs = MESSAGES * 250
+        ms = _best_ms(lambda: [rule_parse(m, matcher) for m in msgs], repeat)
+        res["rule_parse_us_per_msg"] = ms * 1000 / len(msgs)
+    return {k: (round(v, 3) if isinstance(v, float) else v) for k, v in res.items()}
+
+
+def run(rows_list, repeat: int = 3) -> dict:
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "results": [run_rows(n, repeat) for n in rows_list],
+    }
+
+
+def compare(old_path: str, new_path: str) -> list[tuple]:
+    """같은 rows 결과끼리 지표별 (old, new, new/old) — 1보다 크면 느려진 것"""
+    old, new = (json.loads(Path(p).read_text(encoding="utf-8")) for p in (old_path, new_path))
+    by_rows = {r["rows"]: r for r in old["results"]}
+    out = []
+    for r in new["results"]:
+        base = by_rows.get(r["rows"])
+        if base is None:
+            continue
+        for key, value in r.items():
+            if key.endswith(("_ms", "_us_per_msg")) and key in base and base[key]:
+                out.append((r["rows"], key, base[key], value, round(value / base[key], 2)))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="합성 데이터 벤치마크 스위트")
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default=str(RESULTS_DIR), help="결과 JSON 파일 또는 디렉터리")
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="두 결과 JSON 비교")
+    args = ap.parse_args()
+
+    if args.compare:
+        for rows, key, a, b, ratio in compare(*args.compare):
+            flag = "  <-- slower" if ratio > 1.2 else ""
+            print(f"{rows:>10} {key:<60} {a:>10} {b:>10} x{ratio}{flag}")
+        return
+
+    res = run(args.rows, args.repeat)
+    out = Path(args.out)
+    if out.suffix != ".json":
+        out = out / f"bench-{res['commit']}-{res['timestamp'].replace(':', '')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps(res, ensure_ascii=False, indent=2))
+    print(f"[OK] saved -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/synth.py
+"""벤치마크용 합성 final_pois 데이터 (TarRlteTarService1 정제 결과 스키마 흉내)"""
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+AREAS = {
+    "서울특별시": ["강남구", "종로구", "마포구", "중구", "송파구", "용산구", "성동구", "서초구"],
+    "경기도": ["수원시", "성남시분당구", "고양시", "용인시", "가평군", "파주시", "양평군"],
+    "인천광역시": ["연수구", "중구", "남동구", "강화군", "부평구"],
+    "강원특별자치도": ["원주시", "강릉시", "춘천시", "평창군", "횡성군"],
+    "부산광역시": ["해운대구", "중구", "수영구", "기장군"],
+}
+CATS = [
+    ("관광지", "문화관광", "전시시설"),
+    ("관광지", "문화관광", "공연시설"),
+    ("관광지", "역사관광", "종교성지"),
+    ("관광지", "자연관광", "자연경관(하천/해양)"),
+    ("음식", "음식", "한식"),
+    ("음식", "음식", "카페/찻집"),
+    ("음식", "음식", "외국식"),
+    ("쇼핑", "쇼핑", "시장"),
+    ("숙박", "숙박", "콘도미니엄"),
+    ("체험", "레저스포츠", "육상레저스포츠"),
+]
+
+
+def make_final(n: int, seed: int = 0) -> pd.DataFrame:
+    """final_pois 형태의 n행 DataFrame (문자열 컬럼은 object/str 그대로)"""
+    rng = np.random.default_rng(seed)
+    pairs = [(a, s) for a, sigs in AREAS.items() for s in sigs]
+    loc = rng.integers(0, len(pairs), n)
+    cat = rng.integers(0, len(CATS), n)
+    area = np.array([a for a, _ in pairs], dtype=object)[loc]
+    sig = np.array([s for _, s in pairs], dtype=object)[loc]
+    cl, cm, cs = (np.array([c[i] for c in CATS], dtype=object)[cat] for i in range(3))
+    rank = rng.integers(1, 51, n).astype(float)
+    rank[rng.random(n) < 0.01] = np.nan
+    ids = rng.integers(0, max(1, n // 5), n)
+    return pd.DataFrame({
+        "baseYm": "202504",
+        "areaNm": area,
+        "signguNm": sig,
+        "tAtsNm": pd.Series(ids % max(1, n // 50)).map("출발관광지{}".format).to_numpy(),
+        "rlteTatsNm": pd.Series(ids).map("관광지{}".format).to_numpy(),
+        "rlteCtgryLclsNm": cl,
+        "rlteCtgryMclsNm": cm,
+        "rlteCtgrySclsNm": cs,
+        "rlteRank_num": rank,
+        "rlteRegnNm": area,
+        "rlteSignguNm": sig,
+    })
+
+
+AREA_CODES = {"서울특별시": "11", "경기도": "41", "인천광역시": "28", "강원특별자치도": "51", "부산광역시": "26"}
+
+
+def make_raw(n: int, seed: int = 0, related: int = 50) -> pd.DataFrame:
+    """
+    TarRlteTarService1 원본 응답(item) 형태의 n행 DataFrame.
+    출발 관광지마다 연관 관광지 related개(rlteRank 1..related, 문자열)가 붙는 구조이고
+    랭크 결측("")·중복 행도 조금 섞는다. clean/refine/build 벤치마크 입력용.
+    """
+    rng = np.random.default_rng(seed)
+    pairs = [(a, s) for a, sigs in AREAS.items() for s in sigs]
+    src = np.arange(n) // related
+    n_src = int(src.max(initial=0)) + 1
+    src_loc = rng.integers(0, len(pairs), n_src)[src]
+    dst = rng.integers(0, max(1, n // 4), n)
+    dst_loc = dst % len(pairs)
+    cat = dst % len(CATS)
+
+    def col(values, idx):
+        return np.array(values, dtype=object)[idx]
+
+    area_nm = [a for a, _ in pairs]
+    sig_nm = [s for _, s in pairs]
+    area_cd = [AREA_CODES[a] for a in area_nm]
+    sig_cd = [f"{AREA_CODES[a]}{110 + 10 * i:03d}" for i, (a, _) in enumerate(pairs)]
+    rank = ((np.arange(n) % related) + 1).astype(str).astype(object)
+    rank[rng.random(n) < 0.005] = ""
+    df = pd.DataFrame({
+        "baseYm": "202504",
+        "tAtsCd": pd.Series(src).map("T{:08d}".format).to_numpy(),
+        "tAtsNm": pd.Series(src).map("출발관광지{}".format).to_numpy(),
+        "areaCd": col(area_cd, src_loc), "areaNm": col(area_nm, src_loc),
+        "signguCd": col(sig_cd, src_loc), "signguNm": col(sig_nm, src_loc),
+        "rlteTatsCd": pd.Series(dst).map("R{:08d}".format).to_numpy(),
+        "rlteTatsNm": pd.Series(dst).map("관광지 {}".format).to_numpy(),
+        "rlteRegnCd": col(area_cd, dst_loc), "rlteRegnNm": col(area_nm, dst_loc),
+        "rlteSignguCd": col(sig_cd, dst_loc), "rlteSignguNm": col(sig_nm, dst_loc),
+        "rlteCtgryLclsNm": col([c[0] for c in CATS], cat),
+        "rlteCtgryMclsNm": col([c[1] for c in CATS], cat),
+        "rlteCtgrySclsNm": col([c[2] for c in CATS], cat),
+        "rlteRank": rank,
+    })
+    dup = rng.random(n) < 0.01
+    return pd.concat([df, df[dup]], ignore_index=True) if dup.any() else df
+
+
+MESSAGES = [
+    "서울 야간 전시 3곳만, 대중교통",
+    "경기 가평군 드라이브 코스 5곳",
+    "인천 중구 맛집이랑 시장 구경",
+    "주말에 아이랑 체험할 곳 추천해줘",
+    "강남 카페 브런치 2곳",
+    "노을 보기 좋은 곳 알려줘, 지하철로",
+    "수원 박물관 10 곳",
+    "아무 데나 괜찮아",
+]
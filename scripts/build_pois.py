@@ -0,0 +1,319 @@
+# scripts/build_pois.py
+"""
+raw 스냅샷 → final_pois 를 한 번에 만드는 스트리밍 파이프라인 (clean_pois + refine_pois 통합).
+원본을 --chunksize 행 단위로 두 번 훑는다.
+  1차: clean/normalize 후 랭크 히스토그램(q95 상한)과 중복 키별 최소 랭크, 출력 스키마 수집
+  2차: 같은 변환 + 랭크 범위 필터 + 해시셋 중복 제거 후 areaNm(옵션: baseYm) 파티션 Parquet로 기록
+중복 제거 상태(키별 최소 랭크, 본 키 집합)는 고유 키 수에 비례하므로 --buckets N(>1)이면 먼저 변환된 행을
+rlteTatsNm 해시로 N개 버킷(Parquet 조각)에 흘려 쓴 뒤 버킷마다 두 패스를 돌린다. 두 중복 제거 키가 모두
+rlteTatsNm 을 포함해 같은 키의 행은 같은 버킷에 원래 순서대로 모이므로 결과는 같고, 메모리는 청크 크기 +
+버킷 하나의 키 상태로 줄어든다. 버킷별 최소 랭크는 정렬된 (해시, 랭크) 배열로 디스크에 내려 둔다.
+
+--merge 면 먼저 밀린 raw 스냅샷을 누적 테이블에 증분 병합(scripts/merge_pois.py)하고, 그 현재 테이블(파티션 디렉터리)을 입력으로 쓴다.
+
+사용: PYTHONPATH=. python scripts/build_pois.py [--src data/raw/YYYYMMDD/pois.jsonl.gz | --merge] [--partition-baseym] [--buckets N]
+"""
+from __future__ import annotations
+import argparse
+import shutil
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app import metrics, raw_store
+from scripts.clean_pois import clean
+from app.graph import GraphBuilder
+from app.recommender import CATEGORY_COLS
+from scripts.refine_pois import DEDUP_KEYS, DROP_CODE_COLS, normalize, order_columns, publish_sidecars, rank_upper
+
+OUT = Path("data/processed/final_pois")
+CLEAN_KEYS = ["tAtsNm", "rlteTatsNm"]
+# 중복 제거 상태를 나눠 드는 버킷 키 — CLEAN_KEYS 와 DEDUP_KEYS 에 공통으로 들어 있는 컬럼
+BUCKET_KEYS = ["rlteTatsNm"]
+BUCKETS = 8
+
+
+class RankHistogram:
+    """
+    값별 개수만 세는 스트리밍 분위수 추정기. 랭크는 1~50 수준의 이산값이라
+    메모리는 고유값 수에 비례하고, 결과는 pandas quantile(선형보간)과 동일하다.
+    """
+
+    def __init__(self):
+        self.counts: dict[float, int] = {}
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if len(values):
+            uniq, cnt = np.unique(values, return_counts=True)
+            for v, c in zip(uniq.tolist(), cnt.tolist()):
+                self.counts[v] = self.counts.get(v, 0) + c
+
+    @property
+    def n(self) -> int:
+        return sum(self.counts.values())
+
+    def quantile(self, q: float) -> float:
+        n = self.n
+        if n == 0:
+            return float("nan")
+        vals = np.array(sorted(self.counts))
+        cum = np.cumsum([self.counts[v] for v in vals])
+        pos = (n - 1) * q
+        lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+        v_lo = vals[np.searchsorted(cum, lo, side="right")]
+        v_hi = vals[np.searchsorted(cum, hi, side="right")]
+        return float(v_lo + (v_hi - v_lo) * (pos - lo))
+
+
+def _key_hashes(df: pd.DataFrame, cols: list[str]) -> np.ndarray:
+    """키 컬럼 조합의 64비트 해시 (문자열 튜플 대신 정수만 집합에 보관)"""
+    cols = [c for c in cols if c in df.columns]
+    if not cols or df.empty:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy()
+
+
+def _first_seen(hashes: np.ndarray, seen: set) -> np.ndarray:
+    """앞 청크까지 본 적 없는 키의 첫 등장 행만 True"""
+    keep = np.zeros(len(hashes), dtype=bool)
+    for i, h in enumerate(hashes.tolist()):
+        if h not in seen:
+            seen.add(h)
+            keep[i] = True
+    return keep
+
+
+def _source_chunks(src: Path, chunksize: int):
+    """src 가 디렉터리면 병합 현재 테이블(merge/current), 아니면 raw 스냅샷 파일"""
+    if src.is_dir():
+        from scripts.merge_pois import iter_current
+        return iter_current(src, chunksize)
+    return raw_store.iter_chunks(src, chunksize)
+
+
+def _hashed_chunks(src: Path, chunksize: int):
+    """clean → normalize 까지 적용된 청크(코드 컬럼 포함, 중복 제거 전) + 원본 (tAtsNm, rlteTatsNm) 키 해시 _ck"""
+    for chunk in _source_chunks(src, chunksize):
+        df = clean(chunk)
+        ck = _key_hashes(df, CLEAN_KEYS)
+        df = normalize(df.copy())
+        if "rlteRank_num" in df.columns:
+            df["rlteRank_num"] = df["rlteRank_num"].astype(float)
+        df["_ck"] = ck
+        yield df
+
+
+def _prepared_chunks(chunks):
+    """청크 간 (tAtsNm, rlteTatsNm) 중복 제거 — 처음 나온 행만 남기고 _ck 를 뗀다"""
+    seen: set = set()
+    for df in chunks:
+        yield df[_first_seen(df["_ck"].to_numpy(), seen)].drop(columns="_ck")
+
+
+def spill_buckets(src: Path, chunksize: int, buckets: int, spill: Path) -> list[Path]:
+    """_hashed_chunks 를 BUCKET_KEYS 해시로 buckets 개 디렉터리에 나눠 쓴다. 반환: 행이 있는 버킷 디렉터리(순서대로)"""
+    dirs = [spill / f"bucket-{b:03d}" for b in range(buckets)]
+    for i, df in enumerate(_hashed_chunks(src, chunksize)):
+        which = _key_hashes(df, BUCKET_KEYS) % np.uint64(buckets)
+        for b, idx in pd.Series(np.arange(len(df))).groupby(which, sort=False).indices.items():
+            dirs[b].mkdir(parents=True, exist_ok=True)
+            df.iloc[idx].to_parquet(dirs[b] / f"part-{i:05d}.parquet", index=False)
+    return [d for d in dirs if d.exists()]
+
+
+def _spilled_chunks(bucket: Path):
+    for path in sorted(bucket.glob("*.parquet")):
+        yield pd.read_parquet(path)
+
+
+def _drop_codes(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop(columns=[c for c in DROP_CODE_COLS if c in df.columns])
+
+
+def _merge_type(a: pa.DataType | None, b: pa.DataType) -> pa.DataType:
+    if a is None or pa.types.is_null(a):
+        return b
+    if pa.types.is_null(b) or a == b:
+        return a
+    if (pa.types.is_integer(a) or pa.types.is_floating(a)) and (pa.types.is_integer(b) or pa.types.is_floating(b)):
+        return pa.float64()
+    return pa.large_string()
+
+
+def scan(chunks, hist: RankHistogram, types: dict[str, pa.DataType]):
+    """
+    1차 패스(버킷 하나): 랭크 히스토그램과 출력 타입은 hist/types 에 누적하고,
+    키별 최소 랭크(>=1)를 해시 오름차순 (keys, ranks) 배열로, 행 수와 함께 돌려준다
+    """
+    best: dict[int, float] = {}
+    rows = 0
+    for df in _prepared_chunks(chunks):
+        df = _drop_codes(df)
+        rows += len(df)
+        for name, typ in zip(df.columns, pa.Schema.from_pandas(df, preserve_index=False).types):
+            types[name] = _merge_type(types.get(name), typ)
+        if "rlteRank_num" not in df.columns:
+            continue
+        ranks = df["rlteRank_num"].to_numpy(dtype=float)
+        hist.update(ranks)
+        valid = ranks >= 1
+        if valid.any():
+            part = pd.DataFrame({"h": _key_hashes(df, DEDUP_KEYS)[valid], "r": ranks[valid]})
+            for h, r in part.groupby("h", sort=False)["r"].min().items():
+                if r < best.get(h, np.inf):
+                    best[h] = r
+    keys = np.fromiter(best.keys(), dtype=np.uint64, count=len(best))
+    ranks = np.fromiter(best.values(), dtype=float, count=len(best))
+    order = np.argsort(keys)
+    return keys[order], ranks[order], rows
+
+
+def _best_ranks(hashes: np.ndarray, keys: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """정렬된 (keys, ranks) 에서 해시별 최소 랭크 (없으면 nan)"""
+    if len(keys) == 0:
+        return np.full(len(hashes), np.nan)
+    i = np.minimum(np.searchsorted(keys, hashes), len(keys) - 1)
+    return np.where(keys[i] == hashes, ranks[i], np.nan)
+
+
+def _schema(types: dict[str, pa.DataType]) -> pa.Schema:
+    cols = list(order_columns(pd.DataFrame(columns=list(types))).columns)
+    return pa.schema([(c, _output_type(c, types[c])) for c in cols])
+
+
+def _output_type(col: str, typ: pa.DataType) -> pa.DataType:
+    """저카디널리티 컬럼은 dictionary 인코딩(읽으면 category), 전부 null이면 문자열"""
+    value = pa.large_string() if pa.types.is_null(typ) else typ
+    return pa.dictionary(pa.int32(), value) if col in CATEGORY_COLS else value
+
+
+def _to_table(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    for f in schema:
+        if f.name not in df.columns:
+            df[f.name] = None
+    t = pa.Table.from_pandas(df[schema.names], preserve_index=False)
+    plain = pa.schema([pa.field(f.name, f.type.value_type if pa.types.is_dictionary(f.type) else f.type) for f in schema])
+    t = t.cast(plain.with_metadata(t.schema.metadata))
+    for i, f in enumerate(schema):
+        if pa.types.is_dictionary(f.type):
+            t = t.set_column(i, f, t.column(i).dictionary_encode())
+    return t
+
+
+def build(
+    src: Path, out: Path = OUT, chunksize: int = 50_000, partition_baseym: bool = False,
+    graph: GraphBuilder | None = None, buckets: int = 1,
+) -> Path:
+    """graph를 주면 랭크 필터를 통과한 간선(코드 포함, 중복 제거 전)을 함께 모은다. buckets>1 이면 버킷별로 중복 제거"""
+    print(f"[build] src: {src} (chunksize={chunksize}, buckets={buckets})")
+    spill = out.with_name(out.name + ".spill")
+    shutil.rmtree(spill, ignore_errors=True)
+    if buckets > 1:
+        with metrics.span("build.spill"):
+            sources = [partial(_spilled_chunks, d) for d in spill_buckets(src, chunksize, buckets, spill)]
+    else:
+        sources = [partial(_hashed_chunks, src, chunksize)]
+
+    hist, types, bests, rows = RankHistogram(), {}, [], 0
+    with metrics.span("build.scan"):
+        for k, chunks in enumerate(sources):
+            keys, ranks, n = scan(chunks(), hist, types)
+            rows += n
+            if buckets > 1:
+                bests.append(spill / f"best-{k:03d}.npz")
+                np.savez(bests[-1], keys=keys, ranks=ranks)
+            else:
+                bests.append((keys, ranks))
+    schema = _schema(types)
+    if hist.n:
+        upper = rank_upper(hist.quantile(0.95))
+        print(f"[build] rows={rows}, rank q95={hist.quantile(0.95)} -> upper={upper}")
+    else:
+        upper = None
+        print(f"[build] rows={rows}, rank filter skipped (no valid rlteRank_num)")
+
+    partition_cols = ["areaNm"] + (["baseYm"] if partition_baseym else [])
+    tmp = out.with_name(out.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    written = 0
+    for k, chunks in enumerate(sources):
+        if isinstance(bests[k], Path):
+            with np.load(bests[k]) as z:
+                best = (z["keys"], z["ranks"])
+        else:
+            best = bests[k]
+        emitted: set = set()
+        for i, df in enumerate(_prepared_chunks(chunks())):
+            if upper is not None and "rlteRank_num" in df.columns:
+                ranks = df["rlteRank_num"].to_numpy(dtype=float)
+                hashes = _key_hashes(df, DEDUP_KEYS)
+                in_range = (ranks >= 1) & (ranks <= upper)
+                if graph is not None:
+                    graph.add(df[in_range])
+                # 키별 최소 랭크 행 중 처음 나온 것만 (refine의 sort_values → drop_duplicates와 같은 결과)
+                is_best = in_range & (ranks == _best_ranks(hashes, *best))
+                keep = np.zeros(len(df), dtype=bool)
+                idx = np.flatnonzero(is_best)
+                keep[idx] = _first_seen(hashes[idx], emitted)
+                df = df[keep]
+            else:
+                if graph is not None:
+                    graph.add(df)
+                df = df[_first_seen(_key_hashes(df, DEDUP_KEYS), emitted)]
+            df = _drop_codes(df)
+            if df.empty:
+                continue
+            with metrics.span("build.write_chunk"):
+                pq.write_to_dataset(
+                    _to_table(df, schema), root_path=str(tmp),
+                    partition_cols=[c for c in partition_cols if c in schema.names],
+                    basename_template=f"part-{k:03d}-{i:05d}-{{i}}.parquet",
+                )
+            written += len(df)
+    shutil.rmtree(spill, ignore_errors=True)
+
+    if written == 0:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise SystemExit("정제 후 결과가 비었습니다. 랭크 필터/중복 제거 조건을 확인하세요.")
+    shutil.rmtree(out, ignore_errors=True)
+    tmp.rename(out)
+    print(f"[OK] saved -> {out}/ (rows={written}, partition={partition_cols})")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="raw → final_pois 스트리밍 파이프라인")
+    ap.add_argument("--src", default=None, help="raw 스냅샷 파일 (기본: data/raw 최신)")
+    ap.add_argument("--merge", action="store_true", help="밀린 스냅샷을 증분 병합한 뒤 누적 현재 테이블로 빌드")
+    ap.add_argument("--out", default=str(OUT))
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    ap.add_argument("--partition-baseym", action="store_true", help="areaNm 아래 baseYm 파티션도 만든다")
+    ap.add_argument("--buckets", type=int, default=BUCKETS, help="중복 제거 상태를 나눠 드는 버킷 수 (1이면 나누지 않음)")
+    args = ap.parse_args()
+    if args.merge:
+        from scripts.merge_pois import MergeStore, merge_pending
+
+        store = MergeStore()
+        with metrics.span("build.merge"):
+            merge_pending(store=store, chunksize=args.chunksize)
+        src = store.current_dir
+    else:
+        src = Path(args.src) if args.src else raw_store.latest_snapshot()
+    graph = GraphBuilder()
+    out = build(src, Path(args.out), chunksize=args.chunksize, partition_baseym=args.partition_baseym, graph=graph,
+                buckets=args.buckets)
+    publish_sidecars(out, graph=graph.build())
+    exported = metrics.export_from_env()
+    if exported:
+        print(f"      metrics -> {exported}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 # scripts/clean_pois.py
 from __future__ import annotations
 from pathlib import Path
+from typing import Iterable, Iterator
 import pandas as pd
+from app import raw_store
 
-RAW_DIR = Path("data/raw")
+RAW_DIR = raw_store.RAW_DIR
 OUT_DIR = Path("data/processed")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -54,22 +56,60 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def load_latest_pois() -> tuple[pd.DataFrame, Path]:
-    """data/raw/YYYYMMDD/pois.json 중 가장 최신 파일을 읽어온다."""
-    candidates = sorted(RAW_DIR.glob("*/pois.json"))
-    if not candidates:
-        raise FileNotFoundError("data/raw/YYYYMMDD/pois.json 이 없습니다.")
-    pois_path = candidates[-1]
-    df = pd.read_json(pois_path)
+def clean_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    원본을 청크 단위로 clean(). (tAtsNm, rlteTatsNm) 중복은 앞 청크에서 본 키를 기억해
+    전체 기준 '처음 나온 행 유지'가 되도록 청크 간에도 제거한다.
+    """
+    seen: set = set()
+    for chunk in chunks:
+        part = clean(chunk)
+        key_cols = [c for c in ["tAtsNm", "rlteTatsNm"] if c in part.columns]
+        if key_cols and len(part):
+            keys = list(zip(*(part[c].tolist() for c in key_cols)))
+            fresh = [k not in seen for k in keys]
+            seen.update(keys)
+            part = part[fresh]
+        yield part
+
+
+def load_legacy_pois(path: Path) -> pd.DataFrame:
+    """레거시 pois.json(JSON 배열) 리더"""
+    return pd.read_json(path)
+
+
+def load_latest_pois(chunksize: int | None = None) -> tuple[pd.DataFrame, Path]:
+    """
+    data/raw/YYYYMMDD/ 중 가장 최신 스냅샷을 읽어온다.
+    pois.jsonl.gz(스트리밍 포맷)가 있으면 그것을, 없으면 레거시 pois.json을 읽는다.
+    """
+    pois_path = raw_store.latest_snapshot(RAW_DIR)
+    if pois_path.name == raw_store.POIS_JSON:
+        return load_legacy_pois(pois_path), pois_path
+    chunks = list(raw_store.iter_chunks(pois_path, chunksize or 50_000))
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
     return df, pois_path
 
 
-def main() -> Path:
-    df, src = load_latest_pois()
-    df_clean = clean(df)
+def main(chunksize: int = 50_000, merge: bool = False) -> Path:
+    """
+    기본: 최신 스냅샷 하나만 정제.
+    merge=True: 밀린 raw 스냅샷을 누적 테이블에 증분 병합(scripts/merge_pois.py)한 뒤 현재 테이블 전체를 출력.
+    """
     out = OUT_DIR / "clean_pois.parquet"
+    if merge:
+        from scripts.merge_pois import MergeStore, merge_pending
+
+        store = MergeStore()
+        merge_pending(RAW_DIR, store, chunksize)
+        df_clean = store.load_current()
+        src = store.current_dir
+    else:
+        src = raw_store.latest_snapshot(RAW_DIR)
+        parts = list(clean_chunks(raw_store.iter_chunks(src, chunksize)))
+        df_clean = pd.concat(parts, ignore_index=True) if parts else clean(pd.DataFrame())
     df_clean.to_parquet(out, index=False)
-    print(f"[OK] cleaned: {out}  (src: {src})")
+    print(f"[OK] cleaned: {out}  (src: {src}, rows={len(df_clean)})")
     return out
 
 
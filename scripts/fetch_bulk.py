@@ -1,15 +1,47 @@
 # scripts/fetch_bulk.py
-import os, json, time, argparse
+import os, json, time, argparse, threading, hashlib, shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import requests
+from app import http_client, metrics, raw_store
 from app.config import get_settings
 
 """
 여러 지역/시군구에 대해 TarRlteTarService1/areaBasedList1를 반복 호출하여
-하루 폴더(data/raw/YYYYMMDD)에 개별 JSON과 통합 pois.json을 저장
+하루 폴더(data/raw/YYYYMMDD)에 지역별 {areaCd}_{signguCd}.jsonl.gz와 통합 pois.jsonl.gz를 저장
+(gzip JSON Lines, 페이지 단위로 덧붙임 — 레거시 pois.json은 --legacy-json 으로 추가 생성)
+--workers N 으로 지역 단위 병렬 수집(스레드 풀), 호출 속도는 공유 토큰 버킷(--rate)으로 제한
 """
 
+class TokenBucket:
+    """
+    스레드 간 공유 토큰 버킷. 초당 rate개씩 채워지고 최대 burst개까지 쌓인다.
+    모든 워커가 같은 버킷을 쓰므로 워커 수와 무관하게 전체 호출 속도가 rate 이하로 유지된다.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 def build_params(st, area_cd, signgu_cd, page, rows):
     return {
         "MobileOS": st.MOBILE_OS,
@@ -23,54 +55,273 @@ def build_params(st, area_cd, signgu_cd, page, rows):
         "pageNo": page,
     }
 
-def safe_get(url, params, svc):
-    # serviceKey(인코딩 유무)에 따라 전달
-    if "%" in svc:
-        full = f"{url}?serviceKey={svc}"
-        r = requests.get(full, params=params, timeout=20)
-    else:
-        r = requests.get(url, params={**params, "serviceKey": svc}, timeout=20)
-    r.raise_for_status()
-    return r
-
-def fetch_one_region(st, area_cd, signgu_cd, rows=100, max_pages=50, base_url_override=None):
-    url = (base_url_override or st.BASE_URL).rstrip("/") + "/areaBasedList1"
-    all_items = []
-    used_url = None
-    for page in range(1, max_pages + 1):
-        params = build_params(st, area_cd, signgu_cd, page, rows)
-        r = safe_get(url, params, st.SERVICE_KEY.strip())
-        used_url = r.url
-        # JSON 파싱
+OP = "areaBasedList1"
+
+def _result_code(r):
+    try:
+        return (((r.json().get("response") or {}).get("header")) or {}).get("resultCode")
+    except Exception:
+        return None
+
+def safe_get(hosts, params, svc):
+    """
+    (호스트, 키 이름) 조합을 http_client.attempt_order 순서로 시도 — 공용 Session으로 연결 재사용.
+    resultCode=0000 을 받은 조합은 remember_winner 로 기억해(수집기와 공유) 다음 페이지부터 바로 쓴다.
+    모두 실패하면 마지막 응답을 돌려주고(호출부가 비JSON/오류 코드를 처리), 응답이 하나도 없으면 마지막 예외
+    """
+    hosts, keys = tuple(hosts), http_client.KEY_NAMES
+    last, error = None, None
+    for base, key in http_client.attempt_order(hosts, keys):
         try:
-            data = r.json()
-        except Exception:
+            r = http_client.get(f"{base.rstrip('/')}/{OP}", params, key, svc, timeout=20)
+            r.raise_for_status()
+        except requests.RequestException as e:
+            error = e
+            continue
+        last = r
+        if _result_code(r) == "0000":
+            http_client.remember_winner(hosts, keys, base, key)
+            return r
+    if last is None:
+        raise error
+    return last
+
+UNIT_SUFFIX = ".jsonl.gz"
+
+def page_hash(items):
+    """페이지 내용 해시(키 정렬 JSON의 sha1) — 재수집/변경 감지용"""
+    raw = json.dumps(items, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+def iter_pages(st, area_cd, signgu_cd, rows=100, max_pages=50, base_url_override=None, limiter=None, start_page=1):
+    """
+    start_page부터 한 페이지씩 호출해 (page, items, used_url, sha1)을 내보낸다.
+    - 정상 종료(빈 페이지/마지막 페이지/max_pages)면 그냥 끝난다.
+    - 비JSON/resultCode 오류면 items=None 을 한 번 내보내고 끝난다(해당 지역 미완료 처리용).
+    limiter(TokenBucket)가 있으면 매 페이지 호출 전에 토큰을 받고, 없으면 기존처럼 0.2초 간격
+    """
+    # 기본은 HTTPS → HTTP 폴백(collector.call_api 와 같은 조합이라 성공한 조합도 공유), override 면 그 호스트만
+    hosts = [base_url_override] if base_url_override else [st.BASE_URL, st.FALLBACK_URL]
+    hosts = [h for h in hosts if h]
+    for page in range(start_page, max_pages + 1):
+        if limiter is not None:
+            limiter.acquire()
+        elif page > start_page:
+            time.sleep(0.2)
+        params = build_params(st, area_cd, signgu_cd, page, rows)
+        with metrics.span("fetch.page"):
+            r = safe_get(hosts, params, st.SERVICE_KEY.strip())
+            # JSON 파싱
+            try:
+                data = r.json()
+            except Exception:
+                data = None
+        if data is None:
             # SOAP/HTML 등일 경우 종료
-            break
+            yield page, None, r.url, None
+            return
         header = (((data.get("response") or {}).get("header")) or {})
         code = header.get("resultCode")
         if code != "0000":
-            break
+            yield page, None, r.url, None
+            return
         items = (((data.get("response") or {}).get("body") or {}).get("items") or {}).get("item") or []
         if isinstance(items, dict):
             items = [items]
-        if not items:
-            break
+        sha1 = page_hash(items)
         for it in items:
             it["baseYm"] = it.get("baseYm") or datetime.utcnow().strftime("%Y%m")
-            all_items.append(it)
-        # 페이지 소진 조건: numOfRows 보다 적게 올 때
+        yield page, items, r.url, sha1
+        # 페이지 소진 조건: 빈 페이지 또는 numOfRows 보다 적게 올 때
         if len(items) < rows:
+            return
+
+def fetch_one_region(st, area_cd, signgu_cd, rows=100, max_pages=50, base_url_override=None, limiter=None):
+    all_items = []
+    used_url = None
+    for page, items, used_url, _ in iter_pages(st, area_cd, signgu_cd, rows, max_pages, base_url_override, limiter):
+        if items is None:
             break
-        time.sleep(0.2)
+        all_items.extend(items)
     return all_items, used_url
 
+class Manifest:
+    """
+    data/raw/YYYYMMDD/manifest.json — 지역별 완료 페이지(page, count, sha1, offset)와 완료 여부 기록.
+    페이지마다 원자적으로 저장(tmp → replace)하므로 중간에 죽어도 마지막 정상 페이지까지는 남는다.
+    """
+
+    FILE = "manifest.json"
+
+    def __init__(self, out_dir):
+        self.path = Path(out_dir) / self.FILE
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+        else:
+            self.data = {"regions": {}}
+
+    @classmethod
+    def previous(cls, out_dir):
+        """out_dir 이전 날짜 폴더 중 manifest가 있는 가장 최근 것 (없으면 None)"""
+        out_dir = Path(out_dir)
+        older = sorted(p.parent for p in out_dir.parent.glob(f"*/{cls.FILE}") if p.parent.name < out_dir.name)
+        return cls(older[-1]) if older else None
+
+    def region(self, key):
+        return self.data["regions"].get(key)
+
+    def start(self, key, rows):
+        """진행 기록 초기화(처음부터 다시 받을 때)"""
+        with self._lock:
+            self.data["regions"][key] = {"rows": rows, "pages": [], "items": 0, "offset": 0, "done": False}
+            self._save()
+
+    def record_page(self, key, page, count, sha1, offset):
+        """offset: 이 페이지까지 덧붙인 뒤의 개별 파일 크기(byte) — 재개 시 여기까지 잘라낸다"""
+        with self._lock:
+            ent = self.data["regions"][key]
+            ent["pages"].append({"page": page, "count": count, "sha1": sha1, "offset": offset})
+            ent["items"] += count
+            ent["offset"] = offset
+            self._save()
+
+    def finish(self, key):
+        with self._lock:
+            self.data["regions"][key]["done"] = True
+            self._save()
+
+    def reuse(self, key, prev_entry, reused_from):
+        """직전 스냅샷의 지역 기록을 그대로 가져와 완료 처리"""
+        with self._lock:
+            self.data["regions"][key] = {**prev_entry, "done": True, "reused_from": reused_from}
+            self._save()
+
+    def _save(self):
+        _write_json_atomic(self.path, self.data)
+
+def _write_json_atomic(path, obj, indent=2):
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp, path)
+
+def read_seed(path):
+    """시드 CSV(areaCd,signguCd,...) 읽기. 헤더의 sigunguCd 표기도 signguCd로 맞춘다."""
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        header = None
+        for line in f:
+            line = line.strip()
+            if not line: 
+                continue
+            if header is None:
+                header = [h.strip() for h in line.split(",")]
+                continue
+            cols = [c.strip() for c in line.split(",")]
+            rec = dict(zip(header, cols))
+            if "signguCd" not in rec and "sigunguCd" in rec:
+                rec["signguCd"] = rec["sigunguCd"]
+            rows.append(rec)
+    return rows
+
+def fetch_regions(st, regions, out_dir, rows=200, max_pages=40, base_url=None, workers=1, limiter=None,
+                  skip_unchanged=False):
+    """
+    지역별 수집 → 개별 파일(out_dir/{areaCd}_{signguCd}.jsonl.gz)에 페이지 단위로 덧붙여 저장.
+    workers > 1 이면 스레드 풀로 병렬 실행. 반환값은 시드 순서대로 지역별 요약
+    {"key", "path", "items"} (item 자체는 메모리에 모으지 않는다).
+
+    manifest.json 기준으로
+    - 오늘 이미 끝난 지역은 호출 없이 건너뛰고
+    - 중간에 멈춘 지역은 파일을 마지막 정상 페이지 끝(offset)까지 잘라낸 뒤 다음 페이지부터 이어 받는다.
+    skip_unchanged=True면 1페이지 해시가 직전 스냅샷과 같은 지역은 나머지 페이지를 건너뛰고 이전 결과를 복사한다.
+    """
+    out_dir = Path(out_dir)
+    manifest = Manifest(out_dir)
+    prev = Manifest.previous(out_dir) if skip_unchanged else None
+
+    def run_one(rec):
+        area_cd = rec["areaCd"]
+        signgu_cd = rec["signguCd"]
+        key = f"{area_cd}_{signgu_cd}"
+        unit_path = out_dir / f"{key}{UNIT_SUFFIX}"
+        summary = {"key": key, "path": unit_path}
+
+        ent = manifest.region(key)
+        size = unit_path.stat().st_size if unit_path.exists() else 0
+        if ent and ent.get("rows") == rows and "offset" in ent and size >= ent["offset"]:
+            if ent["done"] and size == ent["offset"]:
+                print(f"[SKIP] {area_cd}-{signgu_cd}: 오늘 이미 완료 ({ent['items']})")
+                return {**summary, "items": ent["items"]}
+            # 마지막 정상 페이지 이후에 쓰다 만 바이트는 버린다
+            os.truncate(unit_path, ent["offset"])
+            start_page = ent["pages"][-1]["page"] + 1 if ent["pages"] else 1
+        else:
+            unit_path.unlink(missing_ok=True)
+            manifest.start(key, rows)
+            start_page = 1
+
+        prev_ent = prev.region(key) if prev else None
+        reusable = bool(prev_ent and prev_ent.get("done") and prev_ent.get("rows") == rows and prev_ent["pages"])
+        complete = True
+        for page, page_items, used, sha1 in iter_pages(
+            st, area_cd, signgu_cd, rows=rows, max_pages=max_pages,
+            base_url_override=base_url, limiter=limiter, start_page=start_page,
+        ):
+            if page_items is None:
+                complete = False
+                break
+            if page == 1 and reusable and sha1 == prev_ent["pages"][0]["sha1"]:
+                # 직전 스냅샷과 1페이지가 같으면 변경 없음으로 보고 이전 결과 복사
+                prev_unit = prev.path.parent / unit_path.name
+                if prev_unit.exists():
+                    shutil.copyfile(prev_unit, unit_path)
+                    manifest.reuse(key, prev_ent, reused_from=prev.path.parent.name)
+                    print(f"[SAME] {area_cd}-{signgu_cd}: {prev_ent['items']}  (<- {prev.path.parent.name})")
+                    return {**summary, "items": prev_ent["items"]}
+            # 개별 파일에 먼저 덧붙이고 manifest에 페이지 완료(끝 offset) 기록
+            offset = raw_store.append_page(unit_path, page_items)
+            manifest.record_page(key, page, len(page_items), sha1, offset)
+
+        n_items = manifest.region(key)["items"]
+        if complete:
+            manifest.finish(key)
+            print(f"[OK] {area_cd}-{signgu_cd}: {n_items}  -> {unit_path.name}")
+        else:
+            print(f"[WARN] {area_cd}-{signgu_cd}: 응답 오류로 중단 ({n_items}건까지 저장, 재실행 시 이어받기)")
+        return {**summary, "items": n_items}
+
+    if workers <= 1:
+        return [run_one(rec) for rec in regions]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+        return list(pool.map(run_one, regions))
+
+def write_legacy_json(src, dst):
+    """pois.jsonl.gz → 레거시 pois.json (item 단위 스트리밍 기록, 전체 리스트를 만들지 않음)"""
+    n = 0
+    with open(dst, "w", encoding="utf-8") as f:
+        f.write("[")
+        for it in raw_store.iter_records(src):
+            f.write(",\n" if n else "\n")
+            f.write(json.dumps(it, ensure_ascii=False))
+            n += 1
+        f.write("\n]")
+    return n
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--seed", default="data/seed/regions.csv")
     ap.add_argument("--rows", type=int, default=200)
     ap.add_argument("--max-pages", type=int, default=40)
     ap.add_argument("--base-url", default="")  # 필요시 https로 시도 안될 때 http 등
+    ap.add_argument("--workers", type=int, default=1, help="동시 수집 지역 수(스레드)")
+    ap.add_argument("--rate", type=float, default=5.0, help="전체 초당 최대 호출 수(data.go.kr 쿼터에 맞춰 조정)")
+    ap.add_argument("--burst", type=int, default=1, help="토큰 버킷 최대 적립 수")
+    ap.add_argument("--skip-unchanged", action="store_true",
+                    help="1페이지 해시가 직전 스냅샷과 같은 지역은 이전 결과 재사용")
+    ap.add_argument("--legacy-json", action="store_true", help="통합 pois.json(레거시 포맷)도 함께 저장")
     args = ap.parse_args()
 
     st = get_settings()
@@ -82,41 +333,26 @@ def main():
     out_dir = Path(f"data/raw/{date_tag}")
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # 시드 읽기
-    rows = []
-    with open(args.seed, "r", encoding="utf-8") as f:
-        header = None
-        for i, line in enumerate(f):
-            line = line.strip()
-            if not line: 
-                continue
-            if i == 0:
-                header = [h.strip() for h in line.split(",")]
-                continue
-            cols = [c.strip() for c in line.split(",")]
-            rec = dict(zip(header, cols))
-            rows.append(rec)
+    if args.workers > http_client.POOL_MAXSIZE:
+        http_client.configure(pool_maxsize=args.workers)
 
-    grand = []
-    for rec in rows:
-        area_cd = rec["areaCd"]
-        signgu_cd = rec["signguCd"]
-        items, used = fetch_one_region(
-            st, area_cd, signgu_cd, rows=args.rows, max_pages=args.max_pages,
-            base_url_override=(args.base_url or None),
-        )
-        # 개별 저장
-        unit_path = out_dir / f"{area_cd}_{signgu_cd}.json"
-        with open(unit_path, "w", encoding="utf-8") as f:
-            json.dump(items, f, ensure_ascii=False, indent=2)
-        print(f"[OK] {area_cd}-{signgu_cd}: {len(items)}  -> {unit_path.name}")
-        grand.extend(items)
-
-    # 통합 저장
-    pois_path = out_dir / "pois.json"
-    with open(pois_path, "w", encoding="utf-8") as f:
-        json.dump(grand, f, ensure_ascii=False, indent=2)
-    print(f"[DONE] 통합 저장: {pois_path} (rows={len(grand)})")
+    regions = read_seed(args.seed)
+    limiter = TokenBucket(args.rate, burst=args.burst)
+    results = fetch_regions(
+        st, regions, out_dir, rows=args.rows, max_pages=args.max_pages,
+        base_url=(args.base_url or None), workers=args.workers, limiter=limiter,
+        skip_unchanged=args.skip_unchanged,
+    )
+    # 통합 저장 — 지역 파일(gzip 멤버들)을 시드 순서대로 이어 붙임
+    pois_path = raw_store.concat_files([r["path"] for r in results], out_dir / raw_store.POIS_JSONL)
+    total = sum(r["items"] for r in results)
+    print(f"[DONE] 통합 저장: {pois_path} (rows={total})")
+    if args.legacy_json:
+        n = write_legacy_json(pois_path, out_dir / raw_store.POIS_JSON)
+        print(f"       레거시 JSON: {out_dir / raw_store.POIS_JSON} (rows={n})")
+    exported = metrics.export_from_env()
+    if exported:
+        print(f"       metrics: {exported}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,332 @@
+# scripts/merge_pois.py
+"""
+raw 스냅샷 → 누적 POI 테이블 증분 병합(upsert).
+"최신 pois.json 하나만" 대신 밤마다 새 스냅샷을 현재 테이블과 API 코드 키 (tAtsCd, rlteTatsCd, baseYm)로
+해시 조인해 insert/update/delete 만 반영하고, 바뀌거나 지워진 이전 행은 이력으로 남긴다.
+
+상태(data/processed/merge/):
+  current/<baseYm>_<areaCd>.parquet  현재 행 + _key(키 해시) _hash(내용 해시) _since(반영된 스냅샷)
+  history/<스냅샷>_<baseYm>_<areaCd>[.n].parquet  닫힌 이전 버전(+ _until, _op=U|D|S) — 변경분만, 덧붙이기
+  manifest.json  반영한 스냅샷 목록
+스냅샷은 청크 단위로 읽어 청크마다 insert/update 를 반영한다(스냅샷 전체를 메모리에 올리지 않음).
+청크가 건드린 (baseYm, areaCd) 파티션만 읽고, 실제로 바뀐 파티션만 다시 쓴다.
+삭제는 모든 청크를 본 뒤, 스냅샷에 있던 (baseYm, signguCd) 범위 안에서만 판단한다(일부 지역 수집 실패가 삭제로 번지지 않게).
+baseYm 은 키·파티션에 들어 있어 달이 바뀌면 새 행으로 들어온다. 그래서 스냅샷이 어떤 시군구의 더 최신 달을
+가져오면 그 시군구의 이전 달 현재 행은 닫는다(_op=S, superseded) — 현재 테이블에는 시군구마다 최신 달만 남는다.
+nightly 는 scripts/build_pois.py --merge 로 병합 후 현재 테이블에서 final_pois 를 만든다.
+
+사용: PYTHONPATH=. python scripts/merge_pois.py [--src data/raw/YYYYMMDD/pois.jsonl.gz]  (없으면 밀린 스냅샷 전부)
+"""
+from __future__ import annotations
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app import metrics, raw_store
+from scripts.clean_pois import clean_chunks
+
+MERGE_DIR = Path("data/processed/merge")
+KEY_COLS = ["tAtsCd", "rlteTatsCd", "baseYm"]
+PART_COLS = ["baseYm", "areaCd"]
+SCOPE_COLS = ["baseYm", "signguCd"]
+# 내용 해시에서 빼는 파생 컬럼(원본 컬럼에서 다시 계산되는 값)
+DERIVED_COLS = ["baseYm_dt", "rlteRank_num"]
+META_COLS = ["_key", "_hash", "_since"]
+
+
+def _part_name(baseym, area_cd) -> str:
+    return f"{baseym}_{area_cd}"
+
+
+def _hash_rows(df: pd.DataFrame, cols: List[str]) -> np.ndarray:
+    if not cols:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+
+
+def prepare(df: pd.DataFrame, snapshot: str) -> pd.DataFrame:
+    """
+    clean() 결과에 병합용 메타 컬럼을 붙인다.
+    코드/baseYm/랭크 원문은 문자열로 맞춰(JSON 숫자/문자 혼용 대비) 스냅샷 간 해시가 안정적이게 하고,
+    같은 키가 여러 번 나오면 처음 행만 남긴다.
+    """
+    missing = [c for c in KEY_COLS + PART_COLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"병합 키 컬럼이 없습니다: {missing}")
+    df = df.copy()
+    for c in df.columns:
+        if c.endswith("Cd") or c in ("baseYm", "rlteRank"):
+            df[c] = df[c].astype(str)
+    df["_key"] = _hash_rows(df, KEY_COLS)
+    df = df.drop_duplicates("_key").reset_index(drop=True)
+    content = sorted(c for c in df.columns if c not in KEY_COLS + DERIVED_COLS + META_COLS)
+    df["_hash"] = _hash_rows(df, content)
+    df["_since"] = snapshot
+    return df
+
+
+def diff(current: pd.DataFrame, new: pd.DataFrame, deletes: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    _key 해시 조인으로 변경분 계산.
+    반환: inserts(new 행), updates(new 행), replaced(updates 의 이전 행), deletes(current 행), unchanged 수는 len 으로
+    deletes=False 면 삭제는 계산하지 않는다(청크 단위 upsert — 삭제는 스냅샷을 다 본 뒤 따로).
+    """
+    if current.empty:
+        empty = new.iloc[0:0]
+        return {"inserts": new, "updates": empty, "replaced": empty, "deletes": empty, "unchanged": empty}
+    pos = pd.Index(current["_key"]).get_indexer(new["_key"])
+    matched = pos >= 0
+    cur_hash = current["_hash"].to_numpy()
+    changed = matched.copy()
+    changed[matched] = cur_hash[pos[matched]] != new["_hash"].to_numpy()[matched]
+
+    if deletes:
+        # 새 스냅샷이 다룬 (baseYm, signguCd) 범위에서 사라진 키만 삭제
+        gone = _missing(current, new["_key"], pd.MultiIndex.from_frame(new[SCOPE_COLS].drop_duplicates()))
+    else:
+        gone = np.zeros(len(current), dtype=bool)
+    return {
+        "inserts": new[~matched],
+        "updates": new[changed],
+        "replaced": current.iloc[pos[changed]],
+        "deletes": current[gone],
+        "unchanged": new[matched & ~changed],
+    }
+
+
+def _missing(current: pd.DataFrame, keys, scope) -> np.ndarray:
+    """scope((baseYm, signguCd) 목록) 안에 있으면서 keys 에 없는 current 행"""
+    in_scope = pd.MultiIndex.from_frame(current[SCOPE_COLS]).isin(scope)
+    return in_scope & ~current["_key"].isin(keys).to_numpy()
+
+
+class MergeStore:
+    """data/processed/merge 아래 현재 테이블·이력·manifest 관리"""
+
+    def __init__(self, root: str | Path = MERGE_DIR):
+        self.root = Path(root)
+        self.current_dir = self.root / "current"
+        self.history_dir = self.root / "history"
+        self.manifest_path = self.root / "manifest.json"
+
+    # ---------- manifest ----------
+    def manifest(self) -> dict:
+        if self.manifest_path.exists():
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        return {"applied": []}
+
+    def applied(self) -> List[str]:
+        return self.manifest()["applied"]
+
+    def _record(self, snapshot: str, stats: dict):
+        m = self.manifest()
+        m["applied"] = sorted(set(m["applied"]) | {snapshot})
+        m.setdefault("runs", []).append({"snapshot": snapshot, "at": time.strftime("%Y-%m-%dT%H:%M:%S"), **stats})
+        m["runs"] = m["runs"][-50:]
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp.write_text(json.dumps(m, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.manifest_path)
+
+    # ---------- 파티션 ----------
+    def _part_path(self, name: str) -> Path:
+        return self.current_dir / f"{name}.parquet"
+
+    def read_part(self, name: str) -> pd.DataFrame:
+        path = self._part_path(name)
+        return pd.read_parquet(path) if path.exists() else pd.DataFrame()
+
+    def write_part(self, name: str, df: pd.DataFrame):
+        path = self._part_path(name)
+        if df.empty:
+            path.unlink(missing_ok=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        df.to_parquet(tmp, index=False)
+        tmp.replace(path)
+
+    def append_history(self, snapshot: str, name: str, closed: pd.DataFrame):
+        """같은 스냅샷·파티션에 여러 번(청크마다) 닫히면 .1, .2 … 로 이어 붙인다"""
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        n = len(list(self.history_dir.glob(f"{snapshot}_{name}.parquet"))) + \
+            len(list(self.history_dir.glob(f"{snapshot}_{name}.*.parquet")))
+        suffix = f".{n}" if n else ""
+        closed.to_parquet(self.history_dir / f"{snapshot}_{name}{suffix}.parquet", index=False)
+
+    # ---------- 조회 ----------
+    def load_current(self, meta: bool = False) -> pd.DataFrame:
+        """현재 테이블 전체(기본: 메타 컬럼 제외 — clean_pois 출력과 같은 스키마)"""
+        parts = [pd.read_parquet(p) for p in sorted(self.current_dir.glob("*.parquet"))]
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat(parts, ignore_index=True)
+        return df if meta else df.drop(columns=[c for c in META_COLS if c in df.columns])
+
+    def iter_current(self, chunksize: int = 50_000) -> Iterator[pd.DataFrame]:
+        return iter_current(self.current_dir, chunksize)
+
+    def load_history(self) -> pd.DataFrame:
+        parts = [pd.read_parquet(p) for p in sorted(self.history_dir.glob("*.parquet"))]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+def _apply(store: MergeStore, name: str, snapshot: str, current: pd.DataFrame, d: Dict[str, pd.DataFrame],
+           delete_op: str = "D"):
+    """변경분 하나를 파티션에 반영: 닫힌 행은 이력으로, 나머지 + 갱신/추가 행을 다시 쓴다"""
+    with metrics.span("merge.write_part"):
+        closed = pd.concat([d["replaced"].assign(_op="U"), d["deletes"].assign(_op=delete_op)], ignore_index=True)
+        if len(closed):
+            store.append_history(snapshot, name, closed.assign(_until=snapshot))
+        drop = set(d["deletes"]["_key"].tolist()) | set(d["updates"]["_key"].tolist())
+        keep = current[~current["_key"].isin(drop)] if len(current) else current
+        store.write_part(name, pd.concat([keep, d["updates"], d["inserts"]], ignore_index=True))
+
+
+def merge_chunks(store: MergeStore, chunks: Iterable[pd.DataFrame], snapshot: str) -> dict:
+    """
+    정제된 스냅샷 청크들을 하나씩 현재 테이블에 upsert 하고, 다 본 뒤 사라진 키를 삭제한다.
+    메모리에는 청크 하나와 (키 해시, 범위) 집합만 남는다. 반환: 변경 통계
+    """
+    stats = {"inserted": 0, "updated": 0, "deleted": 0, "superseded": 0, "unchanged": 0}
+    seen: set = set()                   # 이번 스냅샷에서 본 _key (청크 간 중복은 처음 행만)
+    scope: set = set()                  # 이번 스냅샷이 다룬 (baseYm, signguCd)
+    latest: Dict[tuple, str] = {}       # (areaCd, signguCd) -> 이번 스냅샷의 최신 baseYm
+    touched, written = set(), set()
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        new = prepare(chunk, snapshot)
+        keys = new["_key"].tolist()
+        fresh = np.fromiter((k not in seen for k in keys), dtype=bool, count=len(keys))
+        seen.update(keys)
+        new = new[fresh]
+        scope.update(new[SCOPE_COLS].drop_duplicates().itertuples(index=False, name=None))
+        for (area_cd, sig_cd), ym in new.groupby(["areaCd", "signguCd"], observed=True)["baseYm"].max().items():
+            latest[(area_cd, sig_cd)] = max(ym, latest.get((area_cd, sig_cd), ym))
+        for (baseym, area_cd), part_new in new.groupby(PART_COLS, sort=True, observed=True):
+            name = _part_name(baseym, area_cd)
+            touched.add(name)
+            with metrics.span("merge.read_part"):
+                current = store.read_part(name)
+            with metrics.span("merge.diff"):
+                d = diff(current, part_new, deletes=False)
+            stats["inserted"] += len(d["inserts"])
+            stats["updated"] += len(d["updates"])
+            stats["unchanged"] += len(d["unchanged"])
+            if len(d["inserts"]) or len(d["updates"]):
+                _apply(store, name, snapshot, current, d)
+                written.add(name)
+
+    # 삭제: 스냅샷을 다 본 뒤, 건드린 파티션에서 범위 안인데 이번에 나오지 않은 키
+    scope_index = pd.MultiIndex.from_tuples(sorted(scope), names=SCOPE_COLS) if scope else None
+    for name in sorted(touched):
+        current = store.read_part(name)
+        if current.empty:
+            continue
+        gone = _missing(current, seen, scope_index)
+        if not gone.any():
+            continue
+        empty = current.iloc[0:0]
+        _apply(store, name, snapshot, current,
+               {"inserts": empty, "updates": empty, "replaced": empty, "deletes": current[gone]})
+        stats["deleted"] += int(gone.sum())
+        written.add(name)
+
+    stats["superseded"], closed = _close_superseded(store, snapshot, latest)
+    stats["partitions_written"] = len(written | closed)
+    return stats
+
+
+def _close_superseded(store: MergeStore, snapshot: str, latest: Dict[tuple, str]) -> tuple:
+    """
+    이번 스냅샷이 (areaCd, signguCd)에 가져온 최신 baseYm 보다 이전 달의 현재 행을 닫는다(_op=S).
+    이전 달 파티션(<baseYm>_<areaCd>)만 골라 읽는다. 반환: (닫은 행 수, 다시 쓴 파티션 이름 집합)
+    """
+    by_area: Dict[str, Dict[str, str]] = {}
+    for (area_cd, sig_cd), ym in latest.items():
+        by_area.setdefault(str(area_cd), {})[str(sig_cd)] = str(ym)
+    n, written = 0, set()
+    for path in sorted(store.current_dir.glob("*.parquet")):
+        ym, area_cd = path.stem.split("_", 1)
+        sigs = by_area.get(area_cd)
+        if not sigs or all(ym >= v for v in sigs.values()):
+            continue
+        current = store.read_part(path.stem)
+        newer = current["signguCd"].astype(str).map(sigs)
+        old = (newer.notna() & (current["baseYm"].astype(str) < newer.fillna(""))).to_numpy()
+        if not old.any():
+            continue
+        empty = current.iloc[0:0]
+        _apply(store, path.stem, snapshot, current,
+               {"inserts": empty, "updates": empty, "replaced": empty, "deletes": current[old]}, delete_op="S")
+        n += int(old.sum())
+        written.add(path.stem)
+    return n, written
+
+
+def iter_current(current_dir: str | Path, chunksize: int = 50_000) -> Iterator[pd.DataFrame]:
+    """현재 테이블을 파티션별·chunksize 행씩(메타 컬럼 제외) — build_pois --merge 의 입력"""
+    import pyarrow.parquet as pq
+
+    for path in sorted(Path(current_dir).glob("*.parquet")):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            df = batch.to_pandas()
+            yield df.drop(columns=[c for c in META_COLS if c in df.columns])
+
+
+def merge_frame(store: MergeStore, df: pd.DataFrame, snapshot: str) -> dict:
+    """정제된 스냅샷 DataFrame 하나를 현재 테이블에 반영. 반환: 변경 통계"""
+    return merge_chunks(store, [df], snapshot)
+
+
+def merge_snapshot(src: str | Path, store: MergeStore | None = None, snapshot: Optional[str] = None,
+                   chunksize: int = 50_000) -> dict:
+    """raw 스냅샷 파일 하나를 청크 단위로 병합. snapshot 이름 기본값은 상위 디렉터리(YYYYMMDD)"""
+    src = Path(src)
+    store = store or MergeStore()
+    snapshot = snapshot or src.parent.name
+    stats = merge_chunks(store, clean_chunks(raw_store.iter_chunks(src, chunksize)), snapshot)
+    store._record(snapshot, stats)
+    return stats
+
+
+def merge_pending(raw_dir: str | Path = raw_store.RAW_DIR, store: MergeStore | None = None,
+                  chunksize: int = 50_000) -> List[dict]:
+    """아직 반영하지 않은, 마지막 반영분보다 새로운 스냅샷을 오래된 순으로 모두 병합"""
+    store = store or MergeStore()
+    applied = store.applied()
+    last = max(applied) if applied else ""
+    out = []
+    for src in raw_store.list_snapshots(raw_dir):
+        snapshot = src.parent.name
+        if snapshot <= last:
+            continue
+        stats = merge_snapshot(src, store, snapshot, chunksize)
+        print(f"[merge] {snapshot}: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+        out.append({"snapshot": snapshot, **stats})
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="raw 스냅샷을 누적 POI 테이블에 증분 병합")
+    ap.add_argument("--src", default=None, help="병합할 raw 스냅샷 파일 (기본: 밀린 스냅샷 전부)")
+    ap.add_argument("--state", default=str(MERGE_DIR))
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    args = ap.parse_args()
+    store = MergeStore(args.state)
+    if args.src:
+        stats = merge_snapshot(args.src, store, chunksize=args.chunksize)
+        print(f"[merge] {Path(args.src).parent.name}: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+    else:
+        merge_pending(store=store, chunksize=args.chunksize)
+    metrics.export_from_env()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+# scripts/parse_intent.py — 규칙 파서만 쓰므로 pandas/pydantic 을 import 하지 않는다
 import argparse, json
 from app.chat.intent_parser import rule_parse
 
@@ -1,18 +1,39 @@
 # scripts/refine_pois.py
 from pathlib import Path
 import pandas as pd
+from app import metrics
+from app.facet_catalog import FACETS_PATH, LEVEL_COLS, FacetCatalog
+from app.graph import GRAPH_PATH, GraphBuilder, RelatedGraph
+from app.query_snapshot import QUERY_SNAPSHOT_PATH, QuerySnapshot
+from app.reco_cube import CUBE_PATH, RecoCube
+from app.recommender import (
+    CATEGORY_COLS, RECO_COLUMNS, RecommenderIndex, arrow_path, data_version, load_data, write_arrow_batches,
+)
 
 SRC = Path("data/processed/clean_pois.parquet")
 DST_DIR = Path("data/processed")
 DST = DST_DIR / "final_pois.parquet"
 PREVIEW = Path("notebooks/output/final_preview.csv")
 
-def refine(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    print("[refine] input rows:", len(df))
+# 5) 에서 지우는 API 코드 컬럼
+DROP_CODE_COLS = [
+    "tAtsCd", "rlteTatsCd", "rlteRegnCd", "rlteSignguCd",
+    "rlteCtgryLclsCd", "rlteCtgryMclsCd", "rlteCtgrySclsCd"
+]
+# 6) 중복 제거 키
+DEDUP_KEYS = ["areaNm", "signguNm", "rlteTatsNm"]
+# 7) 컬럼 순서
+PREFERRED = [
+    "baseYm","baseYm_dt","areaNm","signguNm",
+    "tAtsNm","rlteTatsNm",
+    "rlteCtgryLclsNm","rlteCtgryMclsNm","rlteCtgrySclsNm",
+    "rlteRank","rlteRank_num"
+]
 
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """1)~3) 텍스트 정규화 + baseYm_dt/랭크 보강 (행 단위 변환이라 청크별로 적용 가능)"""
     # 1) 텍스트 정규화
-    for c in df.select_dtypes(include="object").columns:
+    for c in df.select_dtypes(include=["object", "string"]).columns:
         df[c] = (
             df[c].astype(str)
                  .str.replace("\u3000"," ", regex=False)
@@ -28,6 +49,30 @@ def refine(df: pd.DataFrame) -> pd.DataFrame:
     # 3) 랭크 숫자화
     if "rlteRank_num" not in df.columns and "rlteRank" in df.columns:
         df["rlteRank_num"] = pd.to_numeric(df["rlteRank"], errors="coerce")
+    return df
+
+def rank_upper(q95) -> int:
+    """합리적 범위 추정: [1, max(20, 상위 95%값)]"""
+    return max(20, (int(q95) if pd.notna(q95) else 20))
+
+def order_columns(df: pd.DataFrame) -> pd.DataFrame:
+    cols = [c for c in PREFERRED if c in df.columns] + [c for c in df.columns if c not in PREFERRED]
+    return df[cols]
+
+def encode_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """저카디널리티 문자열 컬럼을 category로 — Parquet에는 dictionary 인코딩으로 저장된다"""
+    for c in CATEGORY_COLS:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    return df
+
+def refine(df: pd.DataFrame, graph: GraphBuilder | None = None) -> pd.DataFrame:
+    """graph를 주면 코드 컬럼 제거/중복 제거 전의 간선(출발지→연관지, 순위)을 모은다"""
+    df = df.copy()
+    print("[refine] input rows:", len(df))
+
+    with metrics.span("refine.normalize"):
+        df = normalize(df)
 
     # 4) 랭크 범위 필터(유연화)
     if "rlteRank_num" in df.columns:
@@ -35,43 +80,38 @@ def refine(df: pd.DataFrame) -> pd.DataFrame:
         # 유효값이 아예 없으면 필터를 건너지 않음
         nonnull = df["rlteRank_num"].notna().sum()
         if nonnull > 0:
-            # 합리적 범위 추정: [1, max(20, 상위 95%값)]
-            q95 = pd.to_numeric(df["rlteRank_num"], errors="coerce").quantile(0.95)
-            upper = max(20, (int(q95) if pd.notna(q95) else 20))
-            df = df[df["rlteRank_num"].between(1, upper, inclusive="both")]
+            with metrics.span("refine.rank_filter"):
+                q95 = pd.to_numeric(df["rlteRank_num"], errors="coerce").quantile(0.95)
+                upper = rank_upper(q95)
+                df = df[df["rlteRank_num"].between(1, upper, inclusive="both")]
             print(f"[refine] rank filter: {before} -> {len(df)} (upper={upper})")
         else:
             print("[refine] rank filter skipped (no valid rlteRank_num)")
     else:
         print("[refine] rank column missing, skip range filter")
 
+    if graph is not None:
+        with metrics.span("refine.graph_edges"):
+            graph.add(df)
+
     # 5) 불필요 코드 컬럼 제거(있을 때만)
-    drop_candidates = [
-        "tAtsCd", "rlteTatsCd", "rlteRegnCd", "rlteSignguCd",
-        "rlteCtgryLclsCd", "rlteCtgryMclsCd", "rlteCtgrySclsCd"
-    ]
-    drop_cols = [c for c in drop_candidates if c in df.columns]
+    drop_cols = [c for c in DROP_CODE_COLS if c in df.columns]
     if drop_cols:
         df = df.drop(columns=drop_cols, errors="ignore")
 
     # 6) 중복 제거 (너무 강하면 완화)
-    key_cols = [c for c in ["areaNm", "signguNm", "rlteTatsNm"] if c in df.columns]
+    key_cols = [c for c in DEDUP_KEYS if c in df.columns]
     if key_cols:
         before = len(df)
-        df = df.sort_values(["rlteRank_num"], na_position="last").drop_duplicates(subset=key_cols, keep="first")
+        with metrics.span("refine.dedup"):
+            df = df.sort_values(["rlteRank_num"], na_position="last").drop_duplicates(subset=key_cols, keep="first")
         print(f"[refine] dedup by {key_cols}: {before} -> {len(df)}")
     else:
         print("[refine] dedup skipped (key cols missing)")
 
-    # 7) 컬럼 순서
-    preferred = [
-        "baseYm","baseYm_dt","areaNm","signguNm",
-        "tAtsNm","rlteTatsNm",
-        "rlteCtgryLclsNm","rlteCtgryMclsNm","rlteCtgrySclsNm",
-        "rlteRank","rlteRank_num"
-    ]
-    cols = [c for c in preferred if c in df.columns] + [c for c in df.columns if c not in preferred]
-    df = df[cols]
+    # 7) 컬럼 순서 + 8) dictionary 인코딩
+    with metrics.span("refine.encode"):
+        df = encode_categories(order_columns(df))
 
     if len(df) == 0:
         # 바로 실패하지 말고 원본 일부라도 살려서 문제를 보고할 수 있게 CSV 미리보기 떨굼
@@ -79,11 +119,79 @@ def refine(df: pd.DataFrame) -> pd.DataFrame:
         print("[refine][WARN] result empty — rank filter or dedup may be too strict.")
     return df
 
+def _dataset(path: Path):
+    """final_pois(파일 또는 파티션 디렉터리) — pd.read_parquet 과 같은 파티션 해석·파일 순서"""
+    import pyarrow.dataset as ds
+
+    part = ds.HivePartitioning.discover(infer_dictionary=True) if Path(path).is_dir() else None
+    return ds.dataset(str(path), format="parquet", partitioning=part)
+
+def iter_batches(dataset, columns: list[str] | None = None, batch_size: int = 65_536):
+    """파일(fragment) 순서대로 레코드 배치 — 행 순서가 load_data(mmap=False)와 같다"""
+    for frag in dataset.get_fragments():
+        yield from frag.to_batches(schema=dataset.schema, columns=columns, batch_size=batch_size)
+
+def _dictionary_values(dataset) -> dict:
+    """dictionary 컬럼별 전체 사전(배치 사전을 나온 순서대로 이어 붙임 — pyarrow 의 사전 통합과 같은 순서)"""
+    import pyarrow as pa
+
+    cols = [f.name for f in dataset.schema if pa.types.is_dictionary(f.type)]
+    seen = {c: {} for c in cols}
+    for batch in iter_batches(dataset, cols):
+        for c in cols:
+            seen[c].update(dict.fromkeys(batch.column(c).dictionary.to_pylist()))
+    return {c: pa.array(list(v), type=dataset.schema.field(c).type.value_type) for c, v in seen.items()}
+
+def _unify(batch, values: dict):
+    """배치의 dictionary 컬럼을 전체 사전 기준 인덱스로 다시 매긴다(IPC 파일은 배치마다 같은 사전이어야 함)"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    cols = []
+    for name, col in zip(batch.schema.names, batch.columns):
+        if name in values:
+            idx = pc.index_in(col.dictionary_decode(), value_set=values[name]).cast(pa.int32())
+            col = pa.DictionaryArray.from_arrays(idx, values[name])
+        cols.append(col)
+    return pa.RecordBatch.from_arrays(cols, names=batch.schema.names)
+
+def publish_sidecars(path: Path = DST, graph: RelatedGraph | None = None, batch_size: int = 65_536) -> None:
+    """
+    final_pois 옆에 조회용 사이드카 생성(데이터 버전을 함께 기록해 어긋나면 로더가 무시).
+    arrow/facets 는 레코드 배치를 흘려 보내며 만든다(메모리는 배치 하나 + 사전/조합 수).
+    query.snap/cube 는 전역 순위가 필요해 전체 행을 보지만 추천 컬럼(RECO_COLUMNS)만 읽는다.
+    """
+    version = data_version(path)
+    dataset = _dataset(path)
+    with metrics.span("refine.arrow"):
+        values = _dictionary_values(dataset)
+        batches = (_unify(b, values) for b in iter_batches(dataset, batch_size=batch_size))
+        side = write_arrow_batches(batches, dataset.schema, arrow_path(path), version)
+    print(f"      arrow  -> {side} (mmap snapshot)")
+    with metrics.span("refine.facets"):
+        level_cols = [c for c in LEVEL_COLS if c in dataset.schema.names]
+        catalog = FacetCatalog.build_chunks((b.to_pandas() for b in iter_batches(dataset, level_cols, batch_size)),
+                                         version)
+    side = catalog.save(Path(path).parent / FACETS_PATH.name)
+    print(f"      facets -> {side}")
+    index = RecommenderIndex(load_data(path, columns=RECO_COLUMNS, mmap=False))
+    with metrics.span("refine.query_snapshot"):
+        side = QuerySnapshot.write(index, Path(path).parent / QUERY_SNAPSHOT_PATH.name, version)
+    print(f"      query  -> {side} (CLI fast path)")
+    with metrics.span("refine.cube"):
+        cube = RecoCube.build(index, version)
+    side = cube.save(Path(path).parent / CUBE_PATH.name)
+    print(f"      cube   -> {side} (cells={cube.n_cells}, {cube.nbytes / 2**20:.1f} MiB)")
+    if graph is not None:
+        side = graph.save(Path(path).parent / GRAPH_PATH.name, version)
+        print(f"      graph  -> {side} (nodes={graph.n_nodes}, edges={graph.n_edges})")
+
 def main():
     if not SRC.exists():
         raise SystemExit(f"입력 파일이 없습니다: {SRC}")
     df = pd.read_parquet(SRC)
-    out = refine(df)
+    graph = GraphBuilder()
+    out = refine(df, graph=graph)
 
     # 결과가 비어도 파일은 남겨서 UI/디버깅 가능하게 함
     DST_DIR.mkdir(parents=True, exist_ok=True)
@@ -94,11 +202,18 @@ def main():
         print("[refine] saved input sample to notebooks/output/refine_input_sample.csv")
         raise SystemExit("정제 후 결과가 비었습니다. notebooks/output/refine_input_sample.csv를 참고하여 필터 조건을 조정하세요.")
 
-    out.to_parquet(DST, index=False)
+    with metrics.span("refine.write"):
+        out.to_parquet(DST, index=False)
+    with metrics.span("refine.graph_build"):
+        g = graph.build()
+    publish_sidecars(DST, graph=g)
     (Path("notebooks/output")).mkdir(parents=True, exist_ok=True)
     out.head(50).to_csv("notebooks/output/final_preview.csv", index=False, encoding="utf-8-sig")
     print(f"[OK] saved -> {DST} (rows={len(out)})")
     print("      preview -> notebooks/output/final_preview.csv")
+    exported = metrics.export_from_env()
+    if exported:
+        print(f"      metrics -> {exported}")
 
 if __name__ == "__main__":
     main()
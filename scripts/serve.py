@@ -0,0 +1,24 @@
+# scripts/serve.py
+"""
+추천 HTTP 서비스 실행.
+  PYTHONPATH=. python scripts/serve.py --port 8000 --workers 4
+Streamlit 앱은 RECO_SERVICE_URL=http://127.0.0.1:8000 으로 이 서비스를 쓴다.
+"""
+import argparse
+
+from app.service import serve
+
+
+def main():
+    ap = argparse.ArgumentParser(description="추천 HTTP 서비스 (/recommend, /facets, /parse)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=1, help="워커 프로세스 수(POSIX fork)")
+    ap.add_argument("--data", default=None, help="final_pois 경로 (기본: app.recommender.DATA_PATH)")
+    ap.add_argument("--refresh", type=float, default=30.0, help="데이터 갱신 확인 주기(초), 0이면 끔")
+    args = ap.parse_args()
+    serve(args.host, args.port, args.workers, args.data, args.refresh)
+
+
+if __name__ == "__main__":
+    main()
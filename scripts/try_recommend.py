@@ -1,6 +1,11 @@
 # scripts/try_recommend.py
+"""
+추천 CLI. refine 이 남긴 query.snap(압축 질의 스냅샷)이 최신이면 pandas 없이 바로 답하고,
+없거나 오래됐거나 --div 이면 app.recommender 로 폴백한다.
+"""
 import argparse
-from app.recommender import recommend
+
+COLS = ["rlteTatsNm", "areaNm", "signguNm", "rlteCtgryLclsNm", "rlteRank_num"]
 
 def parse():
     p = argparse.ArgumentParser(description="Final POIs 추천 CLI")
@@ -11,14 +16,47 @@ def parse():
     p.add_argument("--cat_s", default=None, help="소분류")
     p.add_argument("--top", type=int, default=10, help="추천 개수")
     p.add_argument("--div", action="store_true", help="시군구 다양성 우선")
+    p.add_argument("--no-snapshot", action="store_true", help="query.snap 을 쓰지 않고 항상 pandas 경로")
     return p.parse_args()
 
+def _fmt(v) -> str:
+    if isinstance(v, float):
+        return "NaN" if v != v else f"{v:.1f}"
+    return "NaN" if v is None else str(v)
+
+def print_table(rows, cols):
+    """DataFrame.to_string(index=False) 와 같은 모양(오른쪽 정렬)으로 출력"""
+    cells = [[_fmt(r.get(c)) for c in cols] for r in rows]
+    # 숫자 컬럼은 pandas 처럼 부호 자리 한 칸을 더 둔다
+    pad = [int(isinstance(rows[0].get(c), (int, float))) for c in cols]
+    widths = [max([len(c)] + [len(row[i]) for row in cells]) + pad[i] for i, c in enumerate(cols)]
+    print(" ".join(c.rjust(w) for c, w in zip(cols, widths)))
+    for row in cells:
+        print(" ".join(v.rjust(w) for v, w in zip(row, widths)))
+
+def fast_query(a):
+    """최신 query.snap 이 있으면 레코드 목록, 아니면 None"""
+    if a.div or a.no_snapshot:
+        return None
+    from app.query_snapshot import load_fresh
+    snap = load_fresh()
+    if snap is None:
+        return None
+    return snap.query(a.top, area=a.area, signgu=a.signgu, cat_l=a.cat_l, cat_m=a.cat_m, cat_s=a.cat_s)
+
 if __name__ == "__main__":
     a = parse()
-    df = recommend(area=a.area, signgu=a.signgu, cat_l=a.cat_l, cat_m=a.cat_m, cat_s=a.cat_s,
-                   top_n=a.top, diversify=a.div)
-    if df.empty:
+    rows = fast_query(a)
+    if rows is None:
+        from app.recommender import recommend
+        df = recommend(area=a.area, signgu=a.signgu, cat_l=a.cat_l, cat_m=a.cat_m, cat_s=a.cat_s,
+                       top_n=a.top, diversify=a.div)
+        if df.empty:
+            print("조건에 맞는 결과가 없습니다.")
+        else:
+            cols = [c for c in COLS if c in df.columns]
+            print(df[cols].to_string(index=False))
+    elif not rows:
         print("조건에 맞는 결과가 없습니다.")
     else:
-        cols = [c for c in ["rlteTatsNm","areaNm","signguNm","rlteCtgryLclsNm","rlteRank_num"] if c in df.columns]
-        print(df[cols].to_string(index=False))
+        print_table(rows, [c for c in COLS if c in rows[0]])
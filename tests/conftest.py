@@ -0,0 +1,65 @@
+# tests/conftest.py
+import random
+import pytest
+
+AREAS = {
+    "서울특별시": ["강남구", "종로구", "마포구", "중구"],
+    "경기도": ["수원시", "성남시분당구", "가평군"],
+    "인천광역시": ["연수구", "중구"],
+}
+CATS = [
+    ("관광지", "문화관광", "전시시설"),
+    ("관광지", "자연관광", "공원"),
+    ("음식", "음식", "카페"),
+    ("음식", "음식", "한식"),
+    ("쇼핑", "쇼핑", "시장"),
+    ("체험", "레포츠", "수상레포츠"),
+]
+
+
+def make_pois(n: int = 300, seed: int = 7):
+    """final_pois.parquet 스키마를 흉내 낸 작은 합성 데이터"""
+    import pandas as pd
+
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        area = rnd.choice(list(AREAS))
+        sig = rnd.choice(AREAS[area])
+        l, m, s = rnd.choice(CATS)
+        rank = rnd.choice([None] + list(range(1, 31)))
+        rows.append({
+            "baseYm": "202504",
+            "areaNm": area,
+            "signguNm": sig,
+            "tAtsNm": f"출발지{i % 17}",
+            "rlteTatsNm": f"관광지{i}",
+            "rlteCtgryLclsNm": l,
+            "rlteCtgryMclsNm": m,
+            "rlteCtgrySclsNm": s,
+            "rlteRank_num": rank,
+        })
+    df = pd.DataFrame(rows)
+    df["rlteRank_num"] = pd.to_numeric(df["rlteRank_num"], errors="coerce")
+    return df
+
+
+@pytest.fixture
+def pois_df():
+    return make_pois()
+
+
+@pytest.fixture
+def data_file(request, tmp_path):
+    """
+    make_pois(n) 를 tmp_path/final_pois.parquet 로 저장하고, 스냅샷 캐시를 앞뒤로 비운다.
+    n 은 기본 300 — 다르게 하려면 테스트(또는 모듈 pytestmark)에 @pytest.mark.data_rows(n)
+    """
+    from app import recommender
+
+    marker = request.node.get_closest_marker("data_rows")
+    recommender.clear_snapshots()
+    path = tmp_path / "final_pois.parquet"
+    make_pois(marker.args[0] if marker else 300).to_parquet(path, index=False)
+    yield path
+    recommender.clear_snapshots()
@@ -0,0 +1,30 @@
+# tests/test_benchmarks.py
+import json
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+
+def test_synthetic_raw_schema():
+    from benchmarks.synth import make_raw
+
+    raw = make_raw(500, related=20)
+    assert {"tAtsCd", "tAtsNm", "areaNm", "signguNm", "rlteTatsCd", "rlteTatsNm",
+            "rlteCtgryLclsNm", "rlteCtgryMclsNm", "rlteCtgrySclsNm", "rlteRank"} <= set(raw.columns)
+    ranks = {int(r) for r in raw["rlteRank"] if r}
+    assert min(ranks) == 1 and max(ranks) == 20
+
+
+def test_suite_runs_and_compares(tmp_path):
+    from benchmarks.run import compare, run
+
+    res = run([1_000], repeat=1)
+    row = res["results"][0]
+    for key in ("clean_ms", "refine_ms", "load_data_ms", "facets_build_ms", "rule_parse_us_per_msg"):
+        assert row[key] >= 0
+    assert any(k.startswith("recommend[") for k in row)
+    path = tmp_path / "bench.json"
+    path.write_text(json.dumps(res, ensure_ascii=False), encoding="utf-8")
+    assert all(ratio == 1.0 for *_, ratio in compare(path, path))
@@ -0,0 +1,95 @@
+# tests/test_build_pois.py
+import random
+from urllib.parse import unquote
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from app import raw_store  # noqa: E402
+
+
+def _raw_items(n=400, seed=3):
+    rnd = random.Random(seed)
+    items = []
+    for i in range(n):
+        area = rnd.choice(["서울특별시", "경기도"])
+        items.append({
+            "baseYm": "202504",
+            "tAtsCd": f"s{i % 23}", "tAtsNm": f"출발 {i % 23}",
+            "areaNm": area, "signguNm": rnd.choice(["중구", "수원시"]),
+            "rlteTatsCd": f"r{i % 90}", "rlteTatsNm": f"관광지　 {i % 90}",
+            "rlteCtgryLclsNm": rnd.choice(["관광지", "음식"]),
+            "rlteCtgryMclsNm": "문화관광", "rlteCtgrySclsNm": "전시시설",
+            "rlteRank": rnd.choice(["", "0"] + [str(r) for r in range(1, 60)]),
+        })
+    return items
+
+
+@pytest.mark.parametrize("chunksize,buckets", [(7, 1), (64, 1), (10_000, 1), (7, 4), (64, 3)])
+def test_build_matches_clean_refine(tmp_path, chunksize, buckets):
+    from scripts.build_pois import build
+    from scripts.clean_pois import clean
+    from scripts.refine_pois import refine
+
+    items = _raw_items()
+    src = tmp_path / raw_store.POIS_JSONL
+    for start in range(0, len(items), 50):
+        raw_store.append_page(src, items[start:start + 50])
+
+    expected = refine(clean(pd.read_json(src, lines=True)))
+    out = build(src, tmp_path / "final_pois", chunksize=chunksize, buckets=buckets)
+    got = pd.read_parquet(out)
+    assert not (tmp_path / "final_pois.spill").exists()
+
+    keys = ["areaNm", "signguNm", "rlteTatsNm"]
+    norm = lambda d: (d[keys + ["rlteRank_num"]].astype({k: str for k in keys})
+                      .sort_values(keys).reset_index(drop=True))
+    pd.testing.assert_frame_equal(norm(got), norm(expected), check_dtype=False)
+    assert sorted(unquote(p.name) for p in out.iterdir()) == ["areaNm=경기도", "areaNm=서울특별시"]
+
+
+def test_rank_histogram_matches_pandas_quantile():
+    import numpy as np
+    from scripts.build_pois import RankHistogram
+
+    values = np.array([1, 5, 5, 2, np.nan, 40, 3, 3, 3, 17, 9], dtype=float)
+    hist = RankHistogram()
+    hist.update(values[:4])
+    hist.update(values[4:])
+    for q in (0.0, 0.5, 0.95, 1.0):
+        assert hist.quantile(q) == pytest.approx(pd.Series(values).quantile(q))
+
+
+def test_build_collects_same_graph_as_refine(tmp_path):
+    from app.graph import GraphBuilder
+    from scripts.build_pois import build
+    from scripts.clean_pois import clean
+    from scripts.refine_pois import refine
+
+    src = tmp_path / raw_store.POIS_JSONL
+    raw_store.append_page(src, _raw_items())
+    expected, got = GraphBuilder(), GraphBuilder()
+    refine(clean(pd.read_json(src, lines=True)), graph=expected)
+    build(src, tmp_path / "final_pois", chunksize=37, graph=got)
+    g1, g2 = expected.build(), got.build()
+    assert g1.n_edges == g2.n_edges > 0
+    assert set(zip(g1.codes[g1._src].tolist(), g1.codes[g1.indices].tolist())) == \
+        set(zip(g2.codes[g2._src].tolist(), g2.codes[g2.indices].tolist()))
+
+
+def test_sidecars_stream_in_batches(tmp_path):
+    from app.facet_catalog import FacetCatalog
+    from app.recommender import load_data
+    from scripts.build_pois import build
+    from scripts.refine_pois import publish_sidecars
+
+    src = tmp_path / raw_store.POIS_JSONL
+    raw_store.append_page(src, _raw_items())
+    out = build(src, tmp_path / "final_pois", chunksize=50, buckets=3)
+    # 배치마다 사전이 다른 dictionary 컬럼도 한 사전으로 맞춰 쓴다 — Parquet 로드와 같은 프레임
+    publish_sidecars(out, batch_size=16)
+    parquet = load_data(out, mmap=False)
+    pd.testing.assert_frame_equal(load_data(out), parquet)
+    assert FacetCatalog.load(tmp_path / "facets.json").tree == FacetCatalog.build(parquet).tree
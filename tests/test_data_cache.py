@@ -0,0 +1,136 @@
+# tests/test_data_cache.py
+import os
+
+import pandas as pd
+import pytest
+
+from tests.conftest import make_pois
+
+pytestmark = pytest.mark.data_rows(120)
+
+
+def test_snapshot_cached_until_file_changes(data_file, monkeypatch):
+    from app import recommender
+
+    calls = []
+    real = recommender.load_data
+    monkeypatch.setattr(recommender, "load_data", lambda p, **kw: calls.append(p) or real(p, **kw))
+
+    s1 = recommender.get_snapshot(data_file)
+    s2 = recommender.get_snapshot(data_file)
+    assert s1 is s2 and len(calls) == 1
+    assert s1.index is s2.index
+
+    make_pois(80, seed=1).to_parquet(data_file, index=False)
+    st = data_file.stat()
+    os.utime(data_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    s3 = recommender.get_snapshot(data_file)
+    assert s3 is not s1 and len(s3.df) == 80 and len(calls) == 2
+
+
+def test_recommend_uses_snapshot_index(data_file, monkeypatch):
+    from app import recommender
+    monkeypatch.setattr(recommender, "DATA_PATH", data_file)
+
+    df = recommender.get_data(data_file)
+    expected = recommender.recommend(df=df.copy(), area="서울특별시", top_n=7)
+    got = recommender.recommend(area="서울특별시", top_n=7)
+    pd.testing.assert_frame_equal(got, expected)
+    assert recommender._snapshot_index(df) is recommender.get_snapshot(data_file).index
+
+
+def test_reco_cache_hits_smaller_top_n_and_invalidates(data_file, monkeypatch):
+    from app import recommender
+    monkeypatch.setattr(recommender, "DATA_PATH", data_file)
+
+    df = recommender.get_data(data_file)
+    first = recommender.recommend(area=" 서울특별시", cat_l="관광지", top_n=3)
+    again = recommender.recommend(area="서울특별시", cat_l="관광지", cat_m="", top_n=5)
+    stats = recommender.reco_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    expected = recommender.recommend(df=df.copy(), area="서울특별시", cat_l="관광지", top_n=5)
+    pd.testing.assert_frame_equal(again, expected)
+    pd.testing.assert_frame_equal(first, expected.head(3))
+
+    again["score"] = 0.0                            # 호출부가 고쳐도 캐시는 그대로
+    assert recommender.recommend(area="서울특별시", cat_l="관광지", top_n=1)["score"].iloc[0] > 0
+
+    make_pois(90, seed=5).to_parquet(data_file, index=False)
+    st = data_file.stat()
+    os.utime(data_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    fresh = recommender.recommend(area="서울특별시", cat_l="관광지", top_n=3)
+    pd.testing.assert_frame_equal(fresh, recommender.recommend(
+        df=recommender.get_data(data_file).copy(), area="서울특별시", cat_l="관광지", top_n=3))
+    stats = recommender.reco_cache_stats()
+    assert stats["invalidations"] == 1 and stats["entries"] == 1
+
+
+def test_reco_cache_lru_and_memory_cap():
+    from app.recommender import RecoCache
+
+    frame = pd.DataFrame({"a": range(10)})
+    cache = RecoCache(max_entries=2, max_bytes=10**6)
+    for i in range(3):
+        cache.put((("p", "v"), i), frame, 20)
+    assert cache.get((("p", "v"), 0), 5) is None and cache.stats()["evictions"] == 1
+    assert len(cache.get((("p", "v"), 2), 5)) == 5
+    assert cache.get((("p", "v"), 2), 11) is not None      # 후보가 10개뿐(K=20 미만)이면 더 큰 요청도 적중
+
+    small = RecoCache(max_bytes=int(frame.memory_usage(deep=True).sum()) * 2)
+    for i in range(3):
+        small.put((("p", "v"), i), frame, 20)
+    assert small.stats()["entries"] == 2 and small.bytes <= small.max_bytes
+
+
+def test_reco_cache_invalidates_per_path():
+    from app.recommender import RecoCache
+
+    frame = pd.DataFrame({"a": range(10)})
+    cache = RecoCache()
+    # 두 경로를 번갈아 써도 서로의 항목을 지우지 않는다
+    for _ in range(3):
+        cache.put((("a", "v1"), 0), frame, 20)
+        cache.put((("b", "v1"), 0), frame, 20)
+    assert cache.stats()["invalidations"] == 0 and cache.stats()["entries"] == 2
+    # a 의 버전이 바뀌면 a 의 이전 버전 항목만 비운다
+    cache.put((("a", "v2"), 0), frame, 20)
+    assert cache.get((("a", "v1"), 0), 5) is None and cache.get((("b", "v1"), 0), 5) is not None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_load_data_mmaps_arrow_snapshot(data_file, monkeypatch):
+    from app import recommender
+
+    expected = recommender.load_data(data_file, mmap=False)
+    side = recommender.write_arrow(expected, recommender.arrow_path(data_file), recommender.data_version(data_file))
+    assert side == data_file.with_suffix(".arrow")
+
+    monkeypatch.setattr(pd, "read_parquet", lambda *a, **kw: pytest.fail("parquet read despite arrow snapshot"))
+    got = recommender.load_data(data_file)
+    pd.testing.assert_frame_equal(got, expected)
+    assert isinstance(got["areaNm"].dtype, pd.CategoricalDtype)
+    assert list(recommender.load_data(data_file, columns=["areaNm", "nope"]).columns) == ["areaNm"]
+
+
+def test_stale_arrow_snapshot_falls_back_to_parquet(data_file):
+    from app import recommender
+
+    recommender.write_arrow(make_pois(10), recommender.arrow_path(data_file), recommender.data_version(data_file))
+    make_pois(80, seed=1).to_parquet(data_file, index=False)
+    st = data_file.stat()
+    os.utime(data_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert len(recommender.load_data(data_file)) == 80
+    assert len(recommender.get_snapshot(data_file).df) == 80
+
+
+def test_reco_cache_key_separates_topk_paths(data_file, monkeypatch):
+    from app import recommender
+    monkeypatch.setattr(recommender, "DATA_PATH", data_file)
+
+    calls = []
+    real = recommender._topk_order
+    monkeypatch.setattr(recommender, "_topk_order", lambda *a: calls.append(a) or real(*a))
+    fast = recommender.recommend(area="경기도", top_n=5)
+    slow = recommender.recommend(area="경기도", top_n=5, topk=False)   # 캐시 적중 없이 sort_values 경로
+    pd.testing.assert_frame_equal(fast, slow)
+    assert len(calls) == 1 and recommender.reco_cache_stats()["misses"] == 2
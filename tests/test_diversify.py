@@ -0,0 +1,38 @@
+# tests/test_diversify.py
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from tests.conftest import make_pois  # noqa: E402
+
+
+def test_diversify_round_robin_over_signgu(pois_df):
+    from app.recommender import recommend
+
+    plain = recommend(area="서울특별시", top_n=8, df=pois_df)
+    div = recommend(area="서울특별시", top_n=8, df=pois_df, diversify=True)
+    assert len(div) == 8
+    counts = div["signguNm"].value_counts()
+    assert counts.max() - counts.min() <= 1          # 시군구 4곳에 2개씩
+    assert counts.size >= plain["signguNm"].nunique()
+    # 각 시군구 안에서는 점수순 유지, 첫 항목은 전체 1위
+    assert div["score"].iloc[0] == plain["score"].iloc[0]
+    for _, g in div.groupby("signguNm", observed=True):
+        assert g["score"].is_monotonic_decreasing
+
+
+def test_diversify_single_signgu_spreads_mcls():
+    from app.recommender import recommend
+
+    df = make_pois(600)
+    div = recommend(area="서울특별시", signgu="강남구", top_n=6, df=df, diversify=True)
+    assert div["rlteCtgryMclsNm"].nunique() == min(6, df["rlteCtgryMclsNm"].nunique())
+
+
+def test_diversify_small_pool_and_cli_args(pois_df):
+    from app.recommender import recommend
+
+    res = recommend(area="인천광역시", signgu="중구", cat_l="쇼핑", top_n=50, df=pois_df, diversify=True)
+    ref = recommend(area="인천광역시", signgu="중구", cat_l="쇼핑", top_n=50, df=pois_df)
+    assert sorted(res["rlteTatsNm"]) == sorted(ref["rlteTatsNm"])
+    assert recommend(area="없는곳", df=pois_df, diversify=True).empty
@@ -0,0 +1,54 @@
+# tests/test_facet_catalog.py
+import pytest
+
+from tests.conftest import make_pois
+
+
+def _uniq(s):
+    return sorted(v for v in s.dropna().astype(str).str.strip().unique().tolist() if v)
+
+
+@pytest.mark.parametrize("categorical", [False, True])
+def test_drilldown_matches_pandas_filter(categorical):
+    from app.facet_catalog import FacetCatalog
+    from app.recommender import CATEGORY_COLS
+
+    df = make_pois(400)
+    df.loc[::13, "signguNm"] = None
+    if categorical:
+        for c in CATEGORY_COLS:
+            if c in df.columns:
+                df[c] = df[c].astype("category")
+    cat = FacetCatalog.build(df)
+
+    for area in [None] + _uniq(df["areaNm"]):
+        sub = df if area is None else df[df["areaNm"] == area]
+        got = cat.query(area)
+        assert got["areas"] == _uniq(df["areaNm"])
+        assert got["signgus"] == _uniq(sub["signguNm"])
+        assert got["lcats"] == _uniq(sub["rlteCtgryLclsNm"])
+        assert got["scats"] == _uniq(sub["rlteCtgrySclsNm"])
+        assert got["count"] == len(sub)
+        for sg in _uniq(sub["signguNm"]):
+            leaf = sub[sub["signguNm"] == sg]
+            assert cat.query(area, sg)["mcats"] == _uniq(leaf["rlteCtgryMclsNm"])
+            assert cat.count(area, sg) == len(leaf)
+
+    assert cat.query("없는지역")["signgus"] == []
+
+
+@pytest.mark.data_rows(150)
+def test_sidecar_roundtrip_and_snapshot(data_file):
+    from app import recommender
+    from app.facet_catalog import FacetCatalog
+
+    version = recommender.data_version(data_file)
+    side = FacetCatalog.build(recommender.load_data(data_file), version).save(data_file.parent / "facets.json")
+
+    loaded = FacetCatalog.load(side)
+    assert loaded.version == version and loaded.tree == FacetCatalog.build(make_pois(150)).tree
+
+    snap = recommender.get_snapshot(data_file)
+    assert snap.catalog.version == version
+    f = recommender.facets(snap.df, area="서울특별시")
+    assert f["signgus"] == sorted(["강남구", "종로구", "마포구", "중구"])
@@ -0,0 +1,200 @@
+# tests/test_fetch_bulk.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+pytest.importorskip("requests")
+fetch_bulk = pytest.importorskip("scripts.fetch_bulk")
+from app import raw_store  # noqa: E402
+
+# 지역별 총 item 수 (stub 서버가 페이지 단위로 잘라서 응답)
+TOTALS = {"11680": 7, "11110": 3, "41135": 0, "28185": 5}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    calls = []
+    fail_pages = set()
+    key_name = None         # 정하면 이 키 이름만 인증 통과(나머지는 resultCode 30)
+
+    def do_GET(self):
+        qs = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        type(self).calls.append((time.monotonic(), qs))
+        sig = qs["sigunguCode"]
+        rows, page = int(qs["numOfRows"]), int(qs["pageNo"])
+        if type(self).key_name and type(self).key_name not in qs:
+            self._json({"response": {"header": {"resultCode": "30"}}})
+            return
+        if (sig, page) in type(self).fail_pages:
+            raw = b"<html>SERVICE ERROR</html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+            return
+        total = TOTALS.get(sig, 0)
+        start = (page - 1) * rows
+        items = [
+            {"tAtsNm": f"{sig}-src", "rlteTatsNm": f"{sig}-{i}", "rlteRank": str(i + 1)}
+            for i in range(start, min(total, start + rows))
+        ]
+        self._json({"response": {"header": {"resultCode": "0000"}, "body": {"items": {"item": items} if items else ""}}})
+
+    def _json(self, body):
+        raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api():
+    from app import http_client
+
+    _StubHandler.calls = []
+    _StubHandler.fail_pages = set()
+    _StubHandler.key_name = None
+    http_client.forget_winners()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    th = threading.Thread(target=srv.serve_forever, daemon=True)
+    th.start()
+    st = SimpleNamespace(
+        MOBILE_OS="ETC", MOBILE_APP="test", SERVICE_KEY="dummy",
+        BASE_URL=f"http://127.0.0.1:{srv.server_address[1]}/B551011/TarRlteTarService1", FALLBACK_URL="",
+    )
+    yield st, _StubHandler
+    srv.shutdown()
+    srv.server_close()
+
+
+def _regions():
+    return [{"areaCd": s[:2], "signguCd": s} for s in TOTALS]
+
+
+def _items(summary):
+    return list(raw_store.iter_records(summary["path"])) if summary["path"].exists() else []
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_fetch_regions_writes_unit_files_in_seed_order(stub_api, tmp_path, workers):
+    st, handler = stub_api
+    limiter = fetch_bulk.TokenBucket(rate=500, burst=4)
+    results = fetch_bulk.fetch_regions(st, _regions(), tmp_path, rows=2, max_pages=10,
+                                       workers=workers, limiter=limiter)
+    assert [r["items"] for r in results] == list(TOTALS.values())
+    for rec, res in zip(_regions(), results):
+        assert res["path"] == tmp_path / f"{rec['areaCd']}_{rec['signguCd']}.jsonl.gz"
+        names = [it["rlteTatsNm"] for it in _items(res)]
+        assert names == [f"{rec['signguCd']}-{i}" for i in range(TOTALS[rec["signguCd"]])]
+    # 7건/2 → 4페이지, 3건 → 2페이지, 0건 → 1페이지, 5건 → 3페이지
+    assert len(handler.calls) == 10
+
+
+def test_fetch_pages_are_traced(stub_api, tmp_path):
+    from app import metrics
+
+    st, handler = stub_api
+    metrics.reset()
+    fetch_bulk.fetch_regions(st, _regions(), tmp_path, rows=2, max_pages=10,
+                             limiter=fetch_bulk.TokenBucket(rate=500, burst=4))
+    assert metrics.snapshot()["fetch.page"]["count"] == len(handler.calls) == 10
+    metrics.reset()
+
+
+def test_key_name_fallback_remembers_winner(stub_api, tmp_path):
+    st, handler = stub_api
+    handler.key_name = "ServiceKey"             # serviceKey 는 거절 → 첫 페이지만 두 번 부르고 이후는 바로 ServiceKey
+    res = fetch_bulk.fetch_regions(st, [{"areaCd": "11", "signguCd": "11680"}], tmp_path, rows=2, max_pages=10)[0]
+    assert res["items"] == 7
+    keys = ["serviceKey" if "serviceKey" in qs else "ServiceKey" for _, qs in handler.calls]
+    assert keys == ["serviceKey", "ServiceKey", "ServiceKey", "ServiceKey", "ServiceKey"]
+
+
+def test_token_bucket_limits_global_rate():
+    bucket = fetch_bulk.TokenBucket(rate=50, burst=1)
+    t0 = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    # 첫 토큰은 즉시, 나머지 10개는 초당 50개 → 최소 0.2초
+    assert time.monotonic() - t0 >= 0.18
+
+
+def test_read_seed_accepts_sigungu_header(tmp_path):
+    seed = tmp_path / "regions.csv"
+    seed.write_text("areaCd,sigunguCd,areaNm,signguNm\n51,51130,강원특별자치도,원주시\n\n", encoding="utf-8")
+    assert fetch_bulk.read_seed(seed) == [
+        {"areaCd": "51", "sigunguCd": "51130", "areaNm": "강원특별자치도", "signguNm": "원주시", "signguCd": "51130"}
+    ]
+
+
+def test_rerun_skips_finished_regions(stub_api, tmp_path):
+    st, handler = stub_api
+    first = fetch_bulk.fetch_regions(st, _regions(), tmp_path, rows=2, max_pages=10)
+    handler.calls.clear()
+    second = fetch_bulk.fetch_regions(st, _regions(), tmp_path, rows=2, max_pages=10, workers=2)
+    assert [r["items"] for r in second] == [r["items"] for r in first]
+    assert handler.calls == []
+    man = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    ent = man["regions"]["11_11680"]
+    assert ent["done"] and ent["items"] == 7 and [p["count"] for p in ent["pages"]] == [2, 2, 2, 1]
+
+
+def test_resume_from_last_good_page(stub_api, tmp_path):
+    st, handler = stub_api
+    regions = [{"areaCd": "11", "signguCd": "11680"}]
+    handler.fail_pages = {("11680", 3)}          # 3페이지에서 비JSON 응답 → 중단
+    res = fetch_bulk.fetch_regions(st, regions, tmp_path, rows=2, max_pages=10)[0]
+    assert res["items"] == 4
+    with open(res["path"], "ab") as f:
+        f.write(b"\x1f\x8b partial page")     # 쓰다 만 페이지 흉내
+    assert not json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))["regions"]["11_11680"]["done"]
+
+    handler.fail_pages = set()
+    handler.calls.clear()
+    res = fetch_bulk.fetch_regions(st, regions, tmp_path, rows=2, max_pages=10)[0]
+    assert [it["rlteTatsNm"] for it in _items(res)] == [f"11680-{i}" for i in range(7)]
+    assert [int(qs["pageNo"]) for _, qs in handler.calls] == [3, 4]
+
+
+def test_skip_unchanged_reuses_previous_snapshot(stub_api, tmp_path):
+    st, handler = stub_api
+    day1, day2 = tmp_path / "20250101", tmp_path / "20250102"
+    day1.mkdir()
+    day2.mkdir()
+    first = fetch_bulk.fetch_regions(st, _regions(), day1, rows=2, max_pages=10)
+    handler.calls.clear()
+    second = fetch_bulk.fetch_regions(st, _regions(), day2, rows=2, max_pages=10, skip_unchanged=True)
+    assert [_items(r) for r in second] == [_items(r) for r in first]
+    assert len(handler.calls) == len(TOTALS)     # 지역당 1페이지만 확인
+    man = json.loads((day2 / "manifest.json").read_text(encoding="utf-8"))
+    assert man["regions"]["11_11680"]["reused_from"] == "20250101"
+
+
+def test_combined_jsonl_and_legacy_json(stub_api, tmp_path):
+    st, _ = stub_api
+    results = fetch_bulk.fetch_regions(st, _regions(), tmp_path, rows=2, max_pages=10)
+    combined = raw_store.concat_files([r["path"] for r in results], tmp_path / raw_store.POIS_JSONL)
+    expected = [it for r in results for it in _items(r)]
+    assert list(raw_store.iter_records(combined)) == expected
+
+    legacy = tmp_path / raw_store.POIS_JSON
+    assert fetch_bulk.write_legacy_json(combined, legacy) == len(expected)
+    assert json.loads(legacy.read_text(encoding="utf-8")) == expected
+
+    pd = pytest.importorskip("pandas")
+    chunks = list(raw_store.iter_chunks(combined, chunksize=4))
+    assert [len(c) for c in chunks] == [4, 4, 4, 3]
+    assert pd.concat(chunks)["rlteTatsNm"].tolist() == [it["rlteTatsNm"] for it in expected]
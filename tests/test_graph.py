@@ -0,0 +1,75 @@
+# tests/test_graph.py
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+
+def _edges():
+    # A→B(1) A→C(2) B→D(1) C→D(3) D→E(1), E→A(1) ; 'X'는 코드 없이 이름만
+    rows = [
+        ("A", "가", "B", "나", 1, "관광지"), ("A", "가", "C", "다", 2, "음식"),
+        ("B", "나", "D", "라", 1, "관광지"), ("C", "다", "D", "라", 3, "관광지"),
+        ("D", "라", "E", "마", 1, "쇼핑"), ("E", "마", "A", "가", 1, "관광지"),
+        ("A", "가", "B", "나", 4, "관광지"),      # 다른 baseYm 의 같은 간선(더 나쁜 순위)
+        ("", "엑스", "A", "가", 1, "관광지"), ("A", "가", "Z", "제트", None, "음식"),
+    ]
+    return pd.DataFrame([{
+        "tAtsCd": s, "tAtsNm": sn, "rlteTatsCd": d, "rlteTatsNm": dn, "rlteRank_num": r,
+        "areaNm": "서울특별시", "signguNm": "중구", "rlteRegnNm": "서울특별시", "rlteSignguNm": "중구",
+        "rlteCtgryLclsNm": l,
+    } for s, sn, d, dn, r, l in rows])
+
+
+def test_csr_and_similar():
+    from app.graph import build_graph
+
+    g = build_graph(_edges())
+    assert g.n_edges == 7                       # 중복 간선 1개 병합, 랭크 없는 간선 제외
+    a = int(g.resolve("A")[0])
+    nb, w = g.neighbors(a)
+    assert dict(zip(g.codes[nb].tolist(), w.tolist())) == {"B": 1.0, "C": 0.5}
+    assert g.resolve("엑스").tolist() == g.resolve("엑스 ").tolist() != []
+
+    res = g.similar("가", top_n=3)
+    assert res["rlteTatsCd"].tolist() == ["B", "C", "D"]
+    assert res["hops"].tolist() == [1, 1, 2]
+    assert g.similar("가", top_n=5, cat_l="음식")["rlteTatsCd"].tolist() == ["C"]
+    assert g.similar("없음").empty
+
+
+def test_ppr_multi_seed_and_sidecar(tmp_path):
+    from app.graph import RelatedGraph, build_graph, recommend_from
+
+    g = build_graph(_edges())
+    res = g.ppr(["A", "C"], top_n=10)
+    assert "A" not in res["rlteTatsCd"].tolist() and "C" not in res["rlteTatsCd"].tolist()
+    assert res["rlteTatsCd"].iloc[0] == "D"     # 두 시드 모두에서 닿는 곳
+    assert np.all(np.diff(res["score"].to_numpy()) <= 0)
+
+    path = g.save(tmp_path / "graph.npz", version="v1")
+    g2 = RelatedGraph.load(path)
+    assert g2.version == "v1" and g2.n_edges == g.n_edges
+    pd.testing.assert_frame_equal(recommend_from(["A", "C"], path=path), res)
+
+
+@pytest.mark.parametrize("top_n", [0, -3])
+def test_non_positive_top_n_is_empty(top_n):
+    from app.graph import build_graph
+
+    g = build_graph(_edges())
+    full = g.similar("가", top_n=3)
+    for res in (g.similar("가", top_n=top_n), g.ppr(["A"], top_n=top_n)):
+        assert res.empty and list(res.columns) == list(full.columns)
+
+
+def test_refine_collects_edges_before_dedup():
+    from app.graph import GraphBuilder
+    from scripts.refine_pois import refine
+
+    df = _edges()
+    df["rlteRank"] = df["rlteRank_num"]
+    builder = GraphBuilder()
+    out = refine(df, graph=builder)
+    assert "tAtsCd" not in out.columns
+    assert builder.build().n_edges == 7 > len(out)
@@ -0,0 +1,71 @@
+# tests/test_http_client.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+pytest.importorskip("requests")
+from app import http_client  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    seen = []
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        qs = parse_qs(u.query)
+        type(self).seen.append((u.path, sorted(qs), self.client_address[1]))
+        if u.path.startswith("/good") and "ServiceKey" in qs:
+            body = json.dumps({"response": {"header": {"resultCode": "0000"}, "body": {"items": {"item": [{"a": 1}]}}}})
+            ctype = "application/json"
+        else:
+            body, ctype = "<html>SERVICE ERROR</html>", "text/html"
+        raw = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.seen = []
+    http_client.forget_winners()
+    http_client.configure()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+    http_client.forget_winners()
+
+
+def test_session_reuses_connection(server):
+    for _ in range(3):
+        r = http_client.get(f"{server}/good/op", {"x": 1}, "ServiceKey", "k")
+        assert r.json()["response"]["header"]["resultCode"] == "0000"
+    ports = {port for _, _, port in _Handler.seen}
+    assert len(ports) == 1
+
+
+def test_call_api_remembers_winner(server, tmp_path, monkeypatch):
+    from app import collector
+    monkeypatch.chdir(tmp_path)
+    st = SimpleNamespace(BASE_URL=f"{server}/bad", FALLBACK_URL=f"{server}/good", SERVICE_KEY="k")
+
+    data, used = collector.call_api(st, {"_type": "json"})
+    assert used.endswith("[ServiceKey]") and "/good/" in used
+    assert len(_Handler.seen) == 4          # bad×2 → good[serviceKey] → good[ServiceKey]
+
+    _Handler.seen.clear()
+    data, used = collector.call_api(st, {"_type": "json"})
+    assert len(_Handler.seen) == 1          # 바로 winner로
+    assert http_client.attempt_order([st.BASE_URL, st.FALLBACK_URL])[0] == (st.FALLBACK_URL, "ServiceKey")
@@ -0,0 +1,70 @@
+# tests/test_intent_parser.py
+import pytest
+
+pytest.importorskip("pydantic")
+
+
+@pytest.mark.parametrize("msg, expected", [
+    ("서울 야간 전시 3곳만, 대중교통", dict(area="서울특별시", time_of_day="야간", cat_l="관광지", transport="대중교통", top_n=3)),
+    ("인천 가기 전에 서울 들를래", dict(area="서울특별시")),                      # 사전 순서 우선
+    ("아침엔 브런치, 밤엔 야경", dict(time_of_day="아침")),                     # if/elif 순서
+    ("지하철 말고 드라이브로", dict(transport="자가용")),                       # 뒤 규칙이 덮어씀
+    ("박물관 보고 시장 구경하고 체험도", dict(cat_l="체험")),
+    ("서울시장 근처 12 곳", dict(area="서울특별시", cat_l="음식", top_n=12)),   # 겹치는 키워드
+    ("아무 데나", dict(top_n=10)),
+])
+def test_rule_parse_keeps_precedence(msg, expected):
+    from app.chat.intent_parser import build_matcher, rule_parse
+
+    got = rule_parse(msg, build_matcher())
+    for key in ("area", "signgu", "time_of_day", "transport", "cat_l", "top_n"):
+        assert got[key] == expected.get(key, None if key != "top_n" else 10), key
+
+
+def test_signgu_from_catalog_and_parse_many(tmp_path, monkeypatch):
+    from app import facet_catalog
+    from app.chat import intent_parser
+    from tests.conftest import make_pois
+
+    side = facet_catalog.FacetCatalog.build(make_pois()).save(tmp_path / "facets.json")
+    monkeypatch.setattr(facet_catalog, "FACETS_PATH", side)
+    monkeypatch.setattr(intent_parser, "_MATCHER", None)
+
+    got = intent_parser.parse_many(["경기 성남시분당구 카페 2곳", "강남 전시", "서울 중구 아니고 마포구"])
+    assert [g["signgu"] for g in got] == ["성남시분당구", "강남구", "중구"]
+    assert got[0]["area"] == "경기도" and got[0]["top_n"] == 2
+    assert got[1]["area"] == "서울특별시"          # 한 시도에만 있는 시군구는 시도를 채운다
+    assert intent_parser.get_matcher() is intent_parser.get_matcher()
+
+
+def test_ambiguous_signgu_needs_area(tmp_path, monkeypatch):
+    from app import facet_catalog
+    from app.chat import intent_parser
+    from tests.conftest import make_pois
+
+    # '중구'는 서울·인천 둘 다에 있다
+    side = facet_catalog.FacetCatalog.build(make_pois()).save(tmp_path / "facets.json")
+    monkeypatch.setattr(facet_catalog, "FACETS_PATH", side)
+    monkeypatch.setattr(intent_parser, "_MATCHER", None)
+
+    got = intent_parser.parse_many(["인천 중구 맛집", "중구 맛집", "경기 중구 맛집"])
+    assert [(g["area"], g["signgu"]) for g in got] == [("인천광역시", "중구"), (None, None), ("경기도", None)]
+    assert intent_parser.rule_parse("중구 맛집")["signgu"] is None
+
+
+def test_rule_parse_matches_schema_without_importing_it():
+    import subprocess
+    import sys
+
+    from app.chat.intent_parser import rule_parse
+    from app.chat.intent_schema import Intent
+
+    for msg in ["서울 야간 전시 3곳만, 대중교통", "경기 드라이브 자가용", "아무 말"]:
+        got = rule_parse(msg)
+        assert got == Intent(**got).model_dump() and list(got) == list(Intent.model_fields)
+
+    # 규칙 파싱 CLI 경로는 pydantic/pandas 를 끌어오지 않는다(시작 시간)
+    code = ("import sys; from app.chat.intent_parser import rule_parse; rule_parse('서울 카페');"
+            "print(sorted(m for m in ('pydantic', 'pandas', 'numpy', 'dotenv') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
@@ -0,0 +1,118 @@
+# tests/test_merge_pois.py
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from app import raw_store  # noqa: E402
+
+
+def _items(n=60, rank_shift=0):
+    return [{
+        "baseYm": 202504, "tAtsCd": f"T{i % 6}", "tAtsNm": f"출발 {i % 6}",
+        "areaCd": 11 if i % 2 else 41, "areaNm": "서울특별시" if i % 2 else "경기도",
+        "signguCd": 11110 if i % 2 else 41110, "signguNm": "종로구" if i % 2 else "수원시",
+        "rlteTatsCd": f"R{i}", "rlteTatsNm": f"관광지 {i}",
+        "rlteCtgryLclsNm": "관광지", "rlteCtgryMclsNm": "문화관광", "rlteCtgrySclsNm": "전시시설",
+        "rlteRank": str(i % 10 + 1 + rank_shift),
+    } for i in range(n)]
+
+
+def _write(raw_dir, day, items):
+    path = raw_dir / day / raw_store.POIS_JSONL
+    path.parent.mkdir(parents=True)
+    raw_store.append_page(path, items)
+    return path
+
+
+def test_merge_applies_only_changes(tmp_path):
+    from scripts.merge_pois import MergeStore, merge_pending
+
+    raw, store = tmp_path / "raw", MergeStore(tmp_path / "merge")
+    base = _items()
+    _write(raw, "20250801", base)
+    first = merge_pending(raw, store)
+    assert first[0]["inserted"] == 60 and first[0]["partitions_written"] == 2
+
+    # 다음날: 1행 수정, 2행 삭제(경기도), 1행 추가, 나머지는 그대로
+    nxt = [dict(it) for it in base if it["rlteTatsCd"] not in ("R0", "R2")]
+    nxt[0]["rlteCtgrySclsNm"] = "공원"
+    nxt.append({**base[5], "rlteTatsCd": "R999", "rlteTatsNm": "새 관광지"})
+    _write(raw, "20250802", nxt)
+    (stats,) = merge_pending(raw, store)
+    assert (stats["inserted"], stats["updated"], stats["deleted"], stats["unchanged"]) == (1, 1, 2, 57)
+
+    cur = store.load_current()
+    assert len(cur) == 59 and "_key" not in cur.columns
+    assert set(cur["rlteTatsCd"]) == {it["rlteTatsCd"] for it in nxt}
+    assert cur.loc[cur["rlteTatsCd"] == nxt[0]["rlteTatsCd"], "rlteCtgrySclsNm"].item() == "공원"
+
+    hist = store.load_history()
+    assert sorted(hist["_op"]) == ["D", "D", "U"]
+    assert set(hist["_until"]) == {"20250802"} and set(hist["_since"]) == {"20250801"}
+
+    # 이미 반영한 스냅샷은 다시 적용하지 않는다
+    assert merge_pending(raw, store) == []
+    assert store.applied() == ["20250801", "20250802"]
+
+
+def test_partial_snapshot_does_not_delete_other_regions(tmp_path):
+    from scripts.merge_pois import MergeStore, merge_snapshot
+
+    raw, store = tmp_path / "raw", MergeStore(tmp_path / "merge")
+    merge_snapshot(_write(raw, "20250801", _items()), store)
+    # 서울만 다시 수집된 스냅샷 — 경기도 행은 그대로 남아야 한다
+    seoul = [it for it in _items() if it["areaCd"] == 11]
+    stats = merge_snapshot(_write(raw, "20250802", seoul), store)
+    assert stats["deleted"] == 0 and stats["partitions_written"] == 0
+    assert len(store.load_current()) == 60
+
+
+def test_chunked_merge_matches_whole_snapshot_and_feeds_build(tmp_path):
+    from scripts.build_pois import build
+    from scripts.merge_pois import MergeStore, merge_pending
+
+    raw = tmp_path / "raw"
+    base = _items()
+    _write(raw, "20250801", base)
+    # 청크 경계와 무관하게 통째 병합과 같은 결과(삭제는 스냅샷을 다 본 뒤에만 판단)
+    nxt = [dict(it) for it in base if it["rlteTatsCd"] not in ("R0", "R2")]
+    nxt[0]["rlteCtgrySclsNm"] = "공원"
+    nxt.append({**base[5], "rlteTatsCd": "R999", "rlteTatsNm": "새 관광지"})
+    _write(raw, "20250802", nxt)
+
+    whole, chunked = MergeStore(tmp_path / "whole"), MergeStore(tmp_path / "chunked")
+    expected = merge_pending(raw, whole)
+    got = merge_pending(raw, chunked, chunksize=7)
+    assert got == expected
+    key = ["rlteTatsCd"]
+    pd.testing.assert_frame_equal(
+        chunked.load_current().sort_values(key).reset_index(drop=True),
+        whole.load_current().sort_values(key).reset_index(drop=True),
+    )
+    assert sorted(chunked.load_history()["_op"]) == ["D", "D", "U"]
+
+    # build_pois --merge 는 현재 테이블 디렉터리를 입력으로 읽는다
+    assert sum(len(c) for c in chunked.iter_current(10)) == 59
+    out = build(chunked.current_dir, tmp_path / "final_pois", chunksize=16)
+    assert set(pd.read_parquet(out)["rlteTatsNm"]) <= {it["rlteTatsNm"] for it in nxt}
+
+
+def test_newer_month_supersedes_prior_month_rows(tmp_path):
+    from scripts.merge_pois import MergeStore, merge_pending
+
+    raw, store = tmp_path / "raw", MergeStore(tmp_path / "merge")
+    _write(raw, "20250801", _items())
+    merge_pending(raw, store)
+    # 다음 달 데이터가 서울(11110)만 왔다 — 서울 4월 행은 닫히고, 경기도 4월 행은 그대로
+    may = [{**it, "baseYm": 202505} for it in _items() if it["areaCd"] == 11]
+    _write(raw, "20250901", may)
+    (stats,) = merge_pending(raw, store)
+    assert stats["inserted"] == 30 and stats["superseded"] == 30 and stats["deleted"] == 0
+
+    cur = store.load_current()
+    assert len(cur) == 60
+    assert set(cur.loc[cur["areaCd"] == "11", "baseYm"]) == {"202505"}
+    assert set(cur.loc[cur["areaCd"] == "41", "baseYm"]) == {"202504"}
+    hist = store.load_history()
+    assert list(hist["_op"].unique()) == ["S"] and len(hist) == 30
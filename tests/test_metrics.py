@@ -0,0 +1,71 @@
+# tests/test_metrics.py
+import json
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    from app import metrics
+    metrics.reset()
+    metrics.enable(True)
+    yield metrics
+    metrics.reset()
+    metrics.enable(True)
+
+
+def test_span_histogram_and_exports(fresh_metrics, tmp_path):
+    metrics = fresh_metrics
+    for ms in range(1, 101):
+        metrics.observe("stage.a", ms / 1000)
+    with metrics.span("stage.b"):
+        pass
+
+    snap = metrics.snapshot()
+    assert snap["stage.a"]["count"] == 100 and snap["stage.b"]["count"] == 1
+    assert snap["stage.a"]["p50_ms"] == pytest.approx(50.5)
+    assert snap["stage.a"]["p99_ms"] == pytest.approx(99.01)
+
+    text = metrics.to_prometheus()
+    assert 'smart_travel_stage_duration_seconds_bucket{stage="stage.a",le="0.05"} 50' in text
+    assert 'smart_travel_stage_duration_seconds_count{stage="stage.a"} 100' in text
+    assert json.loads(metrics.write_json(tmp_path / "m.json").read_text(encoding="utf-8")) == snap
+
+
+def test_scrape_copies_stages_under_lock(fresh_metrics):
+    import threading
+
+    metrics = fresh_metrics
+    metrics.observe("a", 0.001)
+    # observe() 가 새 단계를 넣을 때 잡는 잠금을 스크레이프도 잡는다(순회 중 dict 크기 변경 방지)
+    for scrape in (metrics.snapshot, metrics.to_prometheus):
+        with metrics._LOCK:
+            th = threading.Thread(target=scrape)
+            th.start()
+            th.join(0.1)
+            assert th.is_alive()
+        th.join(5)
+        assert not th.is_alive()
+
+
+def test_disabled_is_noop(fresh_metrics):
+    metrics = fresh_metrics
+    metrics.enable(False)
+    with metrics.span("x"):
+        pass
+    metrics.timed("y")(lambda: None)()
+    assert metrics.snapshot() == {}
+
+
+def test_refine_steps_are_traced(fresh_metrics, pois_df, monkeypatch, tmp_path):
+    from scripts.refine_pois import refine
+
+    df = pois_df.assign(rlteRank=pois_df["rlteRank_num"])
+    refine(df)
+    stages = set(fresh_metrics.snapshot())
+    assert {"refine.normalize", "refine.rank_filter", "refine.dedup", "refine.encode"} <= stages
+
+    monkeypatch.setenv("METRICS_EXPORT", str(tmp_path / "refine.prom"))
+    assert fresh_metrics.export_from_env().read_text(encoding="utf-8").startswith("# HELP")
@@ -0,0 +1,98 @@
+# tests/test_nlg.py
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from tests.conftest import make_pois  # noqa: E402
+
+
+def _baseline_summary(intent, res):
+    """벡터화 이전(iterrows) summarize_recos — 출력이 바이트 단위로 같아야 한다"""
+    area = intent.get("area") or "전체"
+    cat = intent.get("cat_l") or "전체"
+    topn = intent.get("top_n") or len(res)
+    if res.empty:
+        return f"지금 조건(지역: {area}, 대분류: {cat})으로는 추천이 없어요. 범위를 조금 넓혀볼까요?"
+    lines = [f"다음 추천을 골라봤어요 (지역: **{area}**, 분류: **{cat}**, {topn}곳):"]
+    for _, row in res.head(topn).iterrows():
+        name = row.get("rlteTatsNm") or row.get("tAtsNm") or ""
+        lines.append(f"- **{name}** ({row.get('areaNm') or ''} {row.get('signguNm') or ''}) · "
+                     f"{row.get('rlteCtgryLclsNm') or ''}")
+    return "\n".join(lines)
+
+
+def _res():
+    return pd.DataFrame({
+        "rlteTatsNm": ["경복궁", "", "광장시장"],
+        "tAtsNm": ["", "수원화성", ""],
+        "areaNm": ["서울특별시", "경기도", "서울특별시"],
+        "signguNm": ["종로구", "수원시", None],
+        "rlteCtgryLclsNm": ["관광지", "관광지", "음식"],
+    })
+
+
+def test_summary_lines_vectorized():
+    from app.chat.nlg import summary_lines
+
+    lines = summary_lines(_res())
+    assert lines[0] == "**경복궁** (서울특별시 종로구) · 관광지"
+    assert lines[1].startswith("**수원화성** (경기도 수원시)")   # 이름이 비면 tAtsNm
+    assert lines[2] == "**광장시장** (서울특별시 ) · 음식"
+    assert summary_lines(_res(), 2) == lines[:2]
+
+
+@pytest.mark.parametrize("intent", [
+    {"area": "서울특별시", "top_n": 2}, {"cat_l": "음식", "top_n": 50}, {}, {"top_n": 0},
+])
+def test_summarize_recos_byte_identical_to_baseline(intent):
+    from app.chat.nlg import summarize_recos
+
+    pois = make_pois(40)
+    full = _res().fillna("서울")
+    for res in [full, pois, pois.astype({"areaNm": "category"}), _res().iloc[0:0]]:
+        assert summarize_recos(intent, res) == _baseline_summary(intent, res)
+
+
+def test_missing_values_render_empty_not_nan():
+    from app.chat.nlg import summary_lines
+
+    # 예전 iterrows 경로는 행 dtype 추론에 따라 결측을 "nan" 으로 찍기도 했다 — 항상 빈 문자열
+    res = make_pois(5).astype({"signguNm": "category"})
+    res.loc[0, "signguNm"] = None
+    res.loc[1, "rlteTatsNm"] = None
+    lines = summary_lines(res)
+    assert "nan" not in "".join(lines)
+    assert lines[0].endswith(f"({res.loc[0, 'areaNm']} ) · {res.loc[0, 'rlteCtgryLclsNm']}")
+    assert lines[1].startswith(f"**{res.loc[1, 'tAtsNm']}**")
+
+
+def test_stream_summary_header_first():
+    from app.chat.nlg import stream_followups, stream_summary, summarize_recos
+
+    intent = {"area": "서울특별시", "top_n": 2}
+    chunks = list(stream_summary(intent, _res()))
+    assert chunks[0].startswith("다음 추천을 골라봤어요") and "2곳" in chunks[0]
+    assert len(chunks) == 3 and chunks[1].startswith("\n- **경복궁**")
+    assert "".join(chunks) == summarize_recos(intent, _res())
+
+    empty = list(stream_summary({"area": "인천광역시"}, _res().iloc[0:0]))
+    assert len(empty) == 1 and "추천이 없어요" in empty[0]
+    assert all(q.startswith("- ") and q.endswith("\n") for q in stream_followups({}, False))
+
+
+def test_stream_summary_builds_lines_lazily(monkeypatch):
+    from app.chat import nlg
+
+    built = []
+    real = nlg.summary_lines
+    monkeypatch.setattr(nlg, "summary_lines", lambda res, topn=None: built.append(len(res)) or real(res, topn))
+    monkeypatch.setattr(nlg, "STREAM_CHUNK", 3)
+    intent = {"top_n": 7}
+    res = make_pois(20)
+    chunks = nlg.stream_summary(intent, res)
+    next(chunks)
+    assert built == []                                   # 머리말까지는 항목 문장을 만들지 않는다
+    next(chunks)
+    assert built == [3]                                  # 첫 조각만
+    assert len(list(chunks)) == 6 and built == [3, 3, 1]
+    assert nlg.summarize_recos(intent, res) == _baseline_summary(intent, res)
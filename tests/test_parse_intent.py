@@ -0,0 +1,78 @@
+# tests/test_parse_intent.py
+import time
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    from app.chat.intent_cache import IntentCache
+    c = IntentCache(tmp_path / "intent.sqlite")
+    yield c
+    c.close()
+
+
+def test_llm_slots_merge_with_rules_and_validate(cache):
+    from app.chat.intent_parser import parse_intent
+    from app.chat.llm_client import FakeBackend
+
+    fake = FakeBackend({"서울 야간 전시 3곳": {"cat_l": "체험", "area": "부산광역시", "top_n": "5"}})
+    got = parse_intent("서울 야간 전시 3곳", backend=fake, timeout=1, cache=cache)
+    assert got["cat_l"] == "체험" and got["top_n"] == 5          # LLM 우선
+    assert got["area"] == "서울특별시" and got["time_of_day"] == "야간"   # 잘못된 슬롯은 규칙 값
+
+    # 표기만 다른 같은 질문은 캐시 적중(모델 호출 없음), 재시작해도 유지
+    again = parse_intent("  서울   야간 전시 3곳!! ", backend=fake, timeout=1, cache=cache)
+    assert again == got and fake.calls == 1
+    from app.chat.intent_cache import IntentCache
+    from app.chat.intent_parser import cache_namespace
+    assert IntentCache(cache.path).get("서울 야간 전시 3곳", cache_namespace(fake)) == got
+
+
+def test_timeout_falls_back_and_caches_late_answer(cache):
+    from app.chat.intent_parser import parse_intent, rule_parse
+    from app.chat.llm_client import FakeBackend
+
+    slow = FakeBackend(lambda m: {"transport": "자가용"}, latency=0.3)
+    t0 = time.perf_counter()
+    got = parse_intent("경기 카페 버스로", backend=slow, timeout=0.05, cache=cache)
+    assert time.perf_counter() - t0 < 0.25
+    assert got == rule_parse("경기 카페 버스로") and got["transport"] == "대중교통"
+
+    deadline = time.time() + 2
+    from app.chat.intent_parser import cache_namespace
+    while cache.get("경기 카페 버스로", cache_namespace(slow)) is None and time.time() < deadline:
+        time.sleep(0.02)
+    late = parse_intent("경기 카페 버스로", backend=slow, timeout=0.05, cache=cache)
+    assert late["transport"] == "자가용" and slow.calls == 1
+
+
+def test_backend_failure_and_null_backend(cache):
+    from app.chat.intent_parser import parse_intent, rule_parse
+    from app.chat.llm_client import FakeBackend, NullBackend
+
+    assert parse_intent("인천 맛집", backend=FakeBackend(fail=True), timeout=1, cache=cache) == rule_parse("인천 맛집")
+    assert len(cache) == 0
+    assert parse_intent("인천 맛집", backend=NullBackend(), cache=cache) == rule_parse("인천 맛집")
+
+
+def test_cache_is_namespaced_by_model_and_catalog_version(cache, tmp_path, monkeypatch):
+    from app import facet_catalog
+    from app.chat import intent_parser
+    from app.chat.llm_client import FakeBackend
+    from tests.conftest import make_pois
+
+    monkeypatch.setattr(facet_catalog, "FACETS_PATH", tmp_path / "facets.json")
+    monkeypatch.setattr(intent_parser, "_MATCHER", None)
+    a, b = FakeBackend({"서울 카페": {"top_n": 3}}), FakeBackend({"서울 카페": {"top_n": 7}})
+    b.model = "v2"
+    assert intent_parser.parse_intent("서울 카페", backend=a, timeout=1, cache=cache)["top_n"] == 3
+    assert intent_parser.parse_intent("서울 카페", backend=b, timeout=1, cache=cache)["top_n"] == 7
+
+    # 카탈로그가 새 데이터 버전으로 바뀌면 같은 백엔드도 다시 묻는다
+    facet_catalog.FacetCatalog.build(make_pois(), "v-new").save(tmp_path / "facets.json")
+    assert intent_parser.cache_namespace(a) == "fake@v-new"
+    intent_parser.parse_intent("서울 카페", backend=a, timeout=1, cache=cache)
+    assert a.calls == 2 and b.calls == 1 and len(cache) == 3
@@ -0,0 +1,66 @@
+# tests/test_planner.py
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from tests.conftest import make_pois  # noqa: E402
+
+
+def _hm(s):
+    h, m = s.split(":")
+    return int(h) * 60 + int(m)
+
+
+def test_centroid_table_covers_capital_region():
+    from app.planner import load_centroids
+
+    table = load_centroids()
+    for key in [("서울특별시", "강남구"), ("경기도", "성남시분당구"), ("인천광역시", "연수구"), ("경기도", "")]:
+        assert key in table
+    lat, lon = table[("서울특별시", "종로구")]
+    assert 37 < lat < 38 and 126 < lon < 128
+
+
+def test_travel_matrix_and_two_opt():
+    from app.planner import haversine_matrix, travel_minutes, two_opt
+
+    coords = np.array([[37.5665, 126.9780], [37.4563, 126.7052], [37.5665, 126.9780]])
+    km = haversine_matrix(coords)
+    assert km[0, 1] == pytest.approx(27.3, abs=1.0) and km[0, 2] == 0 and np.allclose(km, km.T)
+    car, bus = travel_minutes(coords, "자가용"), travel_minutes(coords, "대중교통")
+    assert (np.diag(car) == 0).all() and car[0, 1] < bus[0, 1]
+
+    # 직선 위 점들: 뒤섞인 순서를 2-opt 가 되돌린다
+    line = np.abs(np.subtract.outer(np.arange(6.0), np.arange(6.0)))
+    assert two_opt([3, 1, 2, 5, 4], line, 0) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("tod,transport", [(None, None), ("저녁", "자가용"), ("오전", "대중교통"), ("야간", None)])
+def test_plan_respects_blocks_and_budget(tod, transport):
+    from app.planner import TIME_ALIASES, TIME_BLOCKS, plan_itinerary
+    from app.recommender import recommend
+
+    cands = recommend(df=make_pois(2000), top_n=30, diversify=True, cache=False)
+    t0 = time.perf_counter()
+    plan = plan_itinerary(cands, tod, transport)
+    assert time.perf_counter() - t0 < 0.5
+    assert len(plan) > 0 and plan["rlteTatsNm"].is_unique
+    assert plan["order"].tolist() == list(range(1, len(plan) + 1))
+    blocks = [TIME_ALIASES.get(tod, tod)] if tod else ["아침", "점심", "저녁"]
+    assert set(plan["block"]) <= set(blocks)
+    for block, part in plan.groupby("block"):
+        begin, budget = TIME_BLOCKS[block]
+        arrive, depart = part["arrive"].map(_hm), part["depart"].map(_hm)
+        assert arrive.min() >= begin and depart.max() <= begin + budget + 1
+        assert (arrive.iloc[1:].to_numpy() >= depart.iloc[:-1].to_numpy()).all()
+
+
+def test_recommend_itinerary_and_empty():
+    from app.planner import plan_itinerary, recommend_itinerary
+
+    plan = recommend_itinerary(area="서울특별시", time_of_day="점심", transport="대중교통", df=make_pois(500))
+    assert set(plan["areaNm"]) == {"서울특별시"} and set(plan["block"]) == {"점심"}
+    assert plan_itinerary(plan.iloc[0:0]).empty
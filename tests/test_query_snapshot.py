@@ -0,0 +1,61 @@
+# tests/test_query_snapshot.py
+import os
+import subprocess
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from tests.conftest import make_pois  # noqa: E402
+
+QUERIES = [
+    ({}, 10),
+    ({"area": "서울특별시"}, 5),
+    ({"area": "경기도", "cat_l": "음식"}, 30),
+    ({"area": "인천광역시", "signgu": "중구", "cat_s": "공원"}, 3),
+    ({"cat_m": "문화관광", "signgu": " 강남구 "}, 50),
+    ({"area": "부산광역시"}, 5),
+]
+
+
+def test_query_snapshot_matches_recommend(tmp_path):
+    from app.query_snapshot import QuerySnapshot
+    from app.recommender import RecommenderIndex, recommend
+
+    df = make_pois(600)
+    path = QuerySnapshot.write(RecommenderIndex(df), tmp_path / "query.snap", "v1")
+    snap = QuerySnapshot.load(path)
+    assert snap.version == "v1" and snap.n_rows == 600
+    for filters, top_n in QUERIES:
+        expected = recommend(df=df, top_n=top_n, cache=False, **filters)
+        got = pd.DataFrame(snap.query(top_n, **filters), columns=expected.columns)
+        pd.testing.assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True),
+                                      check_dtype=False)
+
+
+@pytest.mark.parametrize("int_rank", [False, True])
+def test_try_recommend_fast_path_skips_pandas(tmp_path, int_rank):
+    from scripts.refine_pois import publish_sidecars
+
+    data = tmp_path / "data" / "processed"
+    data.mkdir(parents=True)
+    df = make_pois(300)
+    if int_rank:
+        # 실데이터처럼 랭크가 전부 정수면 pandas 경로는 "2" 로 찍는다 — 빠른 경로도 같아야 한다
+        df["rlteRank_num"] = df["rlteRank_num"].fillna(31).astype("int64")
+    df.to_parquet(data / "final_pois.parquet", index=False)
+    publish_sidecars(data / "final_pois.parquet")
+
+    script = os.path.join(os.getcwd(), "scripts", "try_recommend.py")
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    args = [sys.executable, "-X", "importtime", script, "--area", "경기도", "--top", "3"]
+    fast = subprocess.run(args, cwd=tmp_path, capture_output=True, text=True, env=env, check=True)
+    slow = subprocess.run(args + ["--no-snapshot"], cwd=tmp_path, capture_output=True, text=True, env=env, check=True)
+    assert fast.stdout == slow.stdout and len(fast.stdout.splitlines()) == 4
+    assert "| pandas" not in fast.stderr and "| pandas" in slow.stderr
+
+    # 데이터가 바뀌어 스냅샷이 오래되면 pandas 경로로 폴백
+    make_pois(50, seed=2).to_parquet(data / "final_pois.parquet", index=False)
+    stale = subprocess.run(args, cwd=tmp_path, capture_output=True, text=True, env=env, check=True)
+    assert "| pandas" in stale.stderr
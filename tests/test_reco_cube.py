@@ -0,0 +1,67 @@
+# tests/test_reco_cube.py
+import itertools
+
+import pandas as pd
+import pytest
+
+pytestmark = pytest.mark.data_rows(1500)
+
+
+def _publish(path, **kw):
+    from app.recommender import RecommenderIndex, data_version, load_data
+    from app.reco_cube import CUBE_PATH, RecoCube
+
+    cube = RecoCube.build(RecommenderIndex(load_data(path)), data_version(path), **kw)
+    cube.save(path.parent / CUBE_PATH.name)
+    return cube
+
+
+def test_cube_answers_match_live_recommend(data_file, monkeypatch):
+    from app import recommender
+
+    cube = _publish(data_file, top_k=20, min_rows=30)
+    monkeypatch.setattr(recommender, "DATA_PATH", data_file)
+    snap = recommender.get_snapshot(data_file)
+    assert snap.cube is not None and ("", "", "") in cube.keys
+    assert ("서울특별시", "강남구", "음식") in cube.keys and ("", "중구", "") in cube.keys
+
+    lookups = 0
+    areas = [None, "서울특별시", "인천광역시"]
+    signgus = [None, "중구", "강남구"]
+    cats = [None, "관광지", "체험"]
+    for area, signgu, cat_l in itertools.product(areas, signgus, cats):
+        for top_n, tod, tr in [(5, None, None), (20, "저녁", "대중교통"), (40, None, "자가용")]:
+            kw = dict(area=area, signgu=signgu, cat_l=cat_l, top_n=top_n, time_of_day=tod, transport=tr)
+            got = recommender.recommend(**kw)
+            expected = recommender.recommend(df=snap.df.copy(), **kw)
+            pd.testing.assert_frame_equal(got, expected)
+            lookups += cube.lookup(top_n, area, signgu, cat_l) is not None
+    # 큐브에 답이 있던 조합은 RecoCache 를 거치지 않는다
+    stats = recommender.reco_cache_stats()
+    assert 0 < lookups < 27 * 3 and stats["hits"] + stats["misses"] == 27 * 3 - lookups
+
+
+def test_cube_size_budget_skips_sparse_cells(data_file):
+    from app.reco_cube import RecoCube
+
+    full = _publish(data_file, top_k=20, min_rows=1)
+    sparse = _publish(data_file, top_k=20, min_rows=100)
+    tiny = _publish(data_file, top_k=20, min_rows=1, max_bytes=200)
+    assert sparse.n_cells < full.n_cells and tiny.nbytes < full.nbytes
+    assert tiny.n_cells >= 1 and ("", "", "") in tiny.keys      # 가장 큰 칸부터 채택
+    # 희소 칸은 없으니 None(→ 라이브 계산), 저장된 칸도 K 를 넘는 top_n 은 None
+    missing = next(k for k in full.keys if k not in sparse.keys)
+    assert sparse.lookup(5, *missing) is None
+    assert full.lookup(21, "", "", "") is None and len(full.lookup(20, "", "", "")) == 20
+
+    loaded = RecoCube.load(data_file.parent / "cube.npz")
+    assert loaded.keys == tiny.keys and loaded.version == tiny.version
+
+
+def test_stale_cube_is_ignored(data_file):
+    from app import recommender
+    from app.reco_cube import CUBE_PATH, RecoCube
+
+    cube = _publish(data_file, top_k=20, min_rows=30)
+    RecoCube(cube.keys, cube.indptr, cube.rows, cube.top_k, "old").save(data_file.parent / CUBE_PATH.name)
+    assert recommender.get_snapshot(data_file).cube is None
@@ -0,0 +1,84 @@
+# tests/test_recommender_index.py
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+QUERIES = [
+    {},
+    {"area": "서울특별시"},
+    {"area": "인천광역시", "signgu": "중구"},
+    {"signgu": "중구"},
+    {"area": "경기도", "cat_l": "음식", "cat_s": "카페"},
+    {"cat_m": "문화관광", "time_of_day": "저녁", "transport": "대중교통"},
+    {"area": "없는지역"},
+]
+
+
+@pytest.mark.parametrize("q", QUERIES)
+def test_index_matches_mask_filter(pois_df, q):
+    from app.recommender import RecommenderIndex, recommend
+    idx = RecommenderIndex(pois_df)
+    expected = recommend(df=pois_df, top_n=15, **q)
+    got = recommend(index=idx, top_n=15, **q)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_index_rows_sorted_and_exact(pois_df):
+    from app.recommender import RecommenderIndex
+    idx = RecommenderIndex(pois_df)
+    rows = idx.rows(area="서울특별시", cat_l="관광지")
+    mask = (pois_df["areaNm"] == "서울특별시") & (pois_df["rlteCtgryLclsNm"] == "관광지")
+    assert rows.tolist() == list(mask[mask].index)
+    # 필터가 없으면 행 배열/복사 없이 원본 프레임 그대로
+    assert idx.rows(area="", signgu=None) is None and idx.query() is pois_df
+
+
+@pytest.mark.parametrize("top_n", [0, 1, 5, 29, 30, 1000])
+@pytest.mark.parametrize("q", QUERIES)
+def test_topk_matches_full_sort(pois_df, q, top_n):
+    from app.recommender import recommend
+    expected = recommend(df=pois_df, top_n=top_n, topk=False, **q)
+    got = recommend(df=pois_df, top_n=top_n, topk=True, **q)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_load_data_categorical_and_columns(pois_df, tmp_path):
+    from app.recommender import RECO_COLUMNS, RecommenderIndex, load_data, recommend
+    path = tmp_path / "final_pois.parquet"
+    pois_df.to_parquet(path, index=False)
+
+    df = load_data(path)
+    assert isinstance(df["areaNm"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["rlteCtgryLclsNm"].dtype, pd.CategoricalDtype)
+    assert load_data(path, columns=RECO_COLUMNS + ["없는컬럼"]).columns.tolist() == RECO_COLUMNS
+
+    q = dict(area="경기도", cat_l="음식", top_n=10)
+    expected = recommend(df=pois_df, **q)
+    for got in (recommend(df=df, **q), recommend(index=RecommenderIndex(df), **q)):
+        pd.testing.assert_frame_equal(got.astype(expected.dtypes.to_dict()), expected)
+
+
+def test_recommend_many_matches_single_calls(pois_df):
+    from app.chat.intent_schema import Intent
+    from app.recommender import RecommenderIndex, recommend, recommend_many
+
+    intents = [
+        {"area": "서울특별시", "top_n": 5},
+        {"area": "서울특별시", "top_n": 12, "time_of_day": "저녁", "transport": "대중교통"},
+        {"area": "경기도", "cat_l": "음식", "top_n": 3},
+        {"area": "인천광역시", "signgu": "없는구"},
+        Intent(area="경기도", cat_l="관광지", top_n=4),
+        {},
+    ]
+    index = RecommenderIndex(pois_df)
+    for diversify in (False, True):
+        batch = recommend_many(intents, index=index, diversify=diversify)
+        assert len(batch) == len(intents)
+        for intent, got in zip(intents, batch):
+            it = intent.model_dump() if hasattr(intent, "model_dump") else intent
+            expected = recommend(
+                area=it.get("area"), signgu=it.get("signgu"), cat_l=it.get("cat_l"),
+                top_n=it.get("top_n") or 10, time_of_day=it.get("time_of_day"),
+                transport=it.get("transport"), index=index, diversify=diversify,
+            )
+            pd.testing.assert_frame_equal(got, expected)
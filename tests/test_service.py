@@ -0,0 +1,173 @@
+# tests/test_service.py
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from tests.conftest import make_pois
+
+pytestmark = pytest.mark.data_rows(200)
+
+
+@pytest.fixture
+def server(data_file):
+    """127.0.0.1 임시 포트에 서비스를 띄운다(스레드 안의 이벤트 루프)"""
+    from app.service import RecoService, bind, serve_socket
+
+    path = data_file
+    svc = RecoService(path, refresh_interval=0.05)
+    sock = bind("127.0.0.1", 0)
+    ready = threading.Event()
+    loop = asyncio.new_event_loop()
+    task = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        task["t"] = loop.create_task(serve_socket(svc, sock, ready))
+        try:
+            loop.run_until_complete(task["t"])
+        except asyncio.CancelledError:
+            pass
+
+    th = threading.Thread(target=run, daemon=True)
+    th.start()
+    assert ready.wait(10)
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}", svc, path
+    loop.call_soon_threadsafe(task["t"].cancel)
+    th.join(5)
+
+
+def _get(base, path, **params):
+    url = f"{base}{path}?{urllib.parse.urlencode(params)}"
+    with urllib.request.urlopen(url, timeout=5) as r:
+        return json.loads(r.read())
+
+
+def _post(base, path, body):
+    req = urllib.request.Request(f"{base}{path}", data=json.dumps(body).encode(), method="POST",
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=5) as r:
+        return json.loads(r.read())
+
+
+def test_recommend_matches_local(server):
+    from app.recommender import recommend
+
+    base, svc, path = server
+    df = make_pois(200)
+    for params in [{}, {"area": "서울특별시", "top_n": 5}, {"area": "경기도", "cat_l": "음식", "time_of_day": "저녁"}]:
+        body = _get(base, "/recommend", **params)
+        local = recommend(df=df, **{k: v for k, v in params.items()})
+        assert [r["rlteTatsNm"] for r in body["items"]] == local["rlteTatsNm"].tolist()
+        assert body["version"] == svc.snapshot.version
+
+    many = _post(base, "/recommend", {"intents": [{"area": "서울특별시", "top_n": 3}, {"cat_l": "쇼핑"}]})
+    assert len(many["results"]) == 2 and len(many["results"][0]) == 3
+
+
+def test_facets_parse_and_errors(server):
+    from app.chat.intent_parser import rule_parse
+    from app.recommender import facets
+
+    base, _, _ = server
+    assert _get(base, "/facets", area="경기도")["signgus"] == facets(make_pois(200), area="경기도")["signgus"]
+    msg = "서울 강남구 카페 3곳"
+    assert _get(base, "/parse", msg=msg, llm=0)["intent"] == rule_parse(msg)
+    assert _get(base, "/healthz")["rows"] == 200
+
+    for path, params, code in [("/nope", {}, 404), ("/recommend", {"top_n": "x"}, 400), ("/parse", {}, 400)]:
+        with pytest.raises(urllib.error.HTTPError) as e:
+            _get(base, path, **params)
+        assert e.value.code == code
+
+
+def test_hot_swap_on_file_change(server):
+    base, svc, path = server
+    old = svc.snapshot
+    make_pois(90, seed=3).to_parquet(path, index=False)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    deadline = time.time() + 10
+    while svc.snapshot is old and time.time() < deadline:
+        time.sleep(0.05)
+    assert svc.snapshot is not old
+    assert _get(base, "/healthz")["rows"] == 90
+
+
+def test_service_client_fails_fast_without_retries():
+    requests = pytest.importorskip("requests")
+    from app.service import bind
+    from app.service_client import ServiceClient, get_session
+
+    assert get_session().get_adapter("http://x").max_retries.total == 0
+    sock = bind("127.0.0.1", 0)
+    port = sock.getsockname()[1]
+    sock.close()
+    t0 = time.perf_counter()
+    with pytest.raises(requests.ConnectionError):
+        ServiceClient(f"http://127.0.0.1:{port}").health()
+    assert time.perf_counter() - t0 < 1.0    # 수집기 세션이면 백오프로 수 초
+
+
+def test_batch_intents_validated_and_run_off_loop(server, monkeypatch):
+    from app import recommender
+
+    base, _, _ = server
+    for intents in [["서울"], [{"top_n": 1000}], [{"area": 3}], {"area": "경기도"}]:
+        req = urllib.request.Request(f"{base}/recommend", data=json.dumps({"intents": intents}).encode(),
+                                     method="POST", headers={"Content-Type": "application/json"})
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(req, timeout=5)
+        assert e.value.code == 400
+
+    # 느린 일괄 추천이 도는 동안에도 /healthz 는 바로 응답한다
+    real = recommender.recommend_many
+    monkeypatch.setattr(recommender, "recommend_many", lambda *a, **kw: time.sleep(1.0) or real(*a, **kw))
+    th = threading.Thread(target=_post, args=(base, "/recommend", {"intents": [{"area": "경기도"}]}))
+    th.start()
+    time.sleep(0.2)
+    t0 = time.perf_counter()
+    assert _get(base, "/healthz")["status"] == "ok"
+    assert time.perf_counter() - t0 < 0.5
+    th.join(5)
+
+
+def _raw(base, data: bytes, half_close: bool = False) -> bytes:
+    """소켓으로 원시 요청을 보내고 서버가 닫을 때까지 받은 바이트"""
+    import socket
+
+    host, port = urllib.parse.urlsplit(base).netloc.split(":")
+    with socket.create_connection((host, int(port)), timeout=5) as s:
+        s.sendall(data)
+        if half_close:
+            s.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = s.recv(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_bad_content_length_is_400_and_closes(server, length):
+    base, _, _ = server
+    got = _raw(base, b"POST /recommend HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}")
+    assert got.startswith(b"HTTP/1.1 400 ") and b"connection: close" in got
+    assert b"invalid Content-Length" in got
+
+
+def test_truncated_body_closes_cleanly(server, caplog):
+    base, _, _ = server
+    # 본문을 다 보내기 전에 끊으면(IncompleteReadError) 응답 없이 닫고, 서버는 계속 돈다
+    got = _raw(base, b"POST /recommend HTTP/1.1\r\nContent-Length: 100\r\n\r\n{\"area\":", half_close=True)
+    assert got == b""
+    assert _get(base, "/healthz")["status"] == "ok"
+    assert not [r for r in caplog.records if r.levelname == "ERROR"]     # 처리 안 된 예외 로그 없음
@@ -1,21 +1,17 @@
 # web/app.py
 import streamlit as st
 import pandas as pd
-from app.recommender import facets, recommend, load_data
+from app.service_client import get_client
 
 st.set_page_config(page_title="수도권 여행지 추천 (초안)", layout="wide")
 
 st.title("수도권 여행지 추천 — TarRlteTarService1 기반")
 
-# 로드 & 캐싱
-@st.cache_data
-def get_facets():
-    return facets()
+# 로드 & 캐싱 (RECO_SERVICE_URL 이 있으면 추천 서비스, 없으면 app.recommender 프로세스 공용 캐시)
+client = get_client()
 
-@st.cache_data
-def get_data_sample(n=50):
-    df = load_data()
-    return df.head(n)
+def get_facets(area=None):
+    return client.facets(area=area)
 
 f = get_facets()
 
@@ -23,12 +19,8 @@ col1, col2, col3, col4 = st.columns([1,1,1,1])
 with col1:
     area = st.selectbox("시·도 선택", [""] + f["areas"])
 with col2:
-    # area 선택 시 그에 맞는 signgu 필터링
-    df_all = get_data_sample(10000)  # 충분히 큰 샘플
-    if area:
-        signgu_opts = sorted(df_all[df_all["areaNm"]==area]["signguNm"].dropna().unique().tolist())
-    else:
-        signgu_opts = f["signgus"]
+    # area 선택 시 그에 맞는 signgu 필터링 (facet 카탈로그 드릴다운)
+    signgu_opts = get_facets(area)["signgus"] if area else f["signgus"]
     signgu = st.selectbox("시·군·구 선택 (선택)", [""] + signgu_opts)
 with col3:
     cat_l = st.selectbox("대분류", [""] + f["lcats"])
@@ -38,7 +30,7 @@ with col4:
 div = st.toggle("시군구 다양성 우선(실험적)", value=False)
 
 if st.button("추천 실행", type="primary"):
-    res = recommend(
+    res = client.recommend(
         area=area or None,
         signgu=signgu or None,
         cat_l=cat_l or None,